@@ -0,0 +1,225 @@
+"""
+Throughput benchmark of the maps_reviews spider against the fixture server.
+
+Runs one crawl per place size against synthetic pages (scraper/fixture_server.py)
+and reports reviews per second, peak RSS of the crawl (Scrapy plus the
+Playwright driver and browser processes) and the number of Chrome DevTools
+Protocol calls, counted from Playwright's pw:protocol debug log:
+
+    python -m scraper.benchmark
+    python -m scraper.benchmark --sizes 100,1000 --latency-ms 50 -a extraction_source=agent
+    python -m scraper.benchmark --report benchmark.json
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from scrapy.utils.conf import closest_scrapy_cfg
+from scrapy.utils.project import get_project_settings
+
+from scraper.fixture_server import FixtureConfig, make_server
+
+
+DEFAULT_SIZES = (100, 1000, 10000, 50000)
+
+# Lines of Playwright's protocol log for messages sent to the browser
+CDP_SEND_RE = re.compile(r'pw:protocol SEND ► .*?"method":"([^"]+)"')
+
+
+def process_tree_rss(root_pid):
+    """Resident memory in bytes of a process and all its descendants (Linux /proc)"""
+    children = {}
+    rss = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        pid = int(entry)
+        children.setdefault(int(fields[1]), []).append(pid)
+        # Field 24 of /proc/<pid>/stat (rss, in pages)
+        rss[pid] = int(fields[21]) * os.sysconf('SC_PAGE_SIZE')
+
+    total = 0
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        total += rss.get(pid, 0)
+        pending.extend(children.get(pid, ()))
+    return total
+
+
+class RssSampler(threading.Thread):
+    """Samples the RSS of a process tree and keeps the peak"""
+
+    def __init__(self, pid, interval=0.2):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self.stopped = threading.Event()
+
+    def run(self):
+        if not os.path.isdir('/proc'):
+            return
+        while not self.stopped.wait(self.interval):
+            self.peak = max(self.peak, process_tree_rss(self.pid))
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def crawl_settings(metrics_file):
+    """Command line settings of a benchmark crawl"""
+    settings = get_project_settings()
+    # The fixture host is not one of the spider's allowed_domains
+    downloader_middlewares = dict(settings.getdict('DOWNLOADER_MIDDLEWARES'))
+    downloader_middlewares['scrapy.downloadermiddlewares.offsite.OffsiteMiddleware'] = None
+    return {
+        'DOWNLOAD_DELAY': '0',
+        'AUTOTHROTTLE_ENABLED': '0',
+        'LOG_LEVEL': 'INFO',
+        'TELNETCONSOLE_ENABLED': '0',
+        'MAPS_SELECTOR_CACHE_FILE': 'off',
+        'MAPS_METRICS_JSON_FILE': metrics_file,
+        'DOWNLOADER_MIDDLEWARES': json.dumps(downloader_middlewares),
+    }
+
+
+def run_crawl(place_url, spider_args, timeout):
+    """Run one maps_reviews crawl in a subprocess and measure it"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        metrics_file = os.path.join(work_dir, 'metrics.json')
+        items_file = os.path.join(work_dir, 'items.jsonl')
+
+        command = [sys.executable, '-m', 'scrapy', 'crawl', 'maps_reviews', '-a', f'url={place_url}',
+                   '-O', f'{items_file}:jsonlines']
+        for arg in spider_args:
+            command += ['-a', arg]
+        for name, value in crawl_settings(metrics_file).items():
+            command += ['-s', f'{name}={value}']
+
+        env = dict(os.environ, DEBUG='pw:protocol')
+        project_dir = os.path.dirname(closest_scrapy_cfg())
+
+        cdp_calls = Counter()
+        errors = []
+        started = time.monotonic()
+        process = subprocess.Popen(command, cwd=project_dir, env=env, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.PIPE, text=True, encoding='utf-8', errors='replace')
+        sampler = RssSampler(process.pid)
+        sampler.start()
+        timer = threading.Timer(timeout, process.kill)
+        timer.start()
+        try:
+            for line in process.stderr:
+                match = CDP_SEND_RE.search(line)
+                if match:
+                    cdp_calls[match.group(1)] += 1
+                elif '] ERROR:' in line:
+                    errors.append(line.strip())
+            process.wait()
+        finally:
+            timer.cancel()
+            sampler.stop()
+        wall_seconds = time.monotonic() - started
+
+        reviews = owner_responses = reviews_with_photos = 0
+        if os.path.exists(items_file):
+            with open(items_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    item = json.loads(line)
+                    reviews += 1
+                    owner_responses += bool(item.get('response_from_owner'))
+                    reviews_with_photos += bool(item.get('number_of_photos'))
+
+        stats = {}
+        if os.path.exists(metrics_file):
+            with open(metrics_file, 'r', encoding='utf-8') as f:
+                stats = json.load(f).get('stats', {})
+
+    place_seconds = stats.get('maps/place_seconds_total') or wall_seconds
+    return {
+        'reviews': reviews,
+        'exit_code': process.returncode,
+        'wall_seconds': round(wall_seconds, 2),
+        'place_seconds': round(place_seconds, 2),
+        'reviews_per_second': round(reviews / place_seconds, 2) if place_seconds else 0.0,
+        'peak_rss_mb': round(sampler.peak / 2 ** 20, 1),
+        'scrapy_rss_mb': round(stats.get('memusage/max', 0) / 2 ** 20, 1),
+        'cdp_calls': sum(cdp_calls.values()),
+        'cdp_calls_per_review': round(sum(cdp_calls.values()) / reviews, 2) if reviews else None,
+        'cdp_top_methods': dict(cdp_calls.most_common(8)),
+        # Captured in the same extraction pass, so they must not raise cdp_calls_per_review
+        'owner_responses': owner_responses,
+        'reviews_with_photos': reviews_with_photos,
+        'errors': errors[:5],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the maps_reviews spider on synthetic places')
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help='Comma separated reviews per place')
+    parser.add_argument('--latency-ms', type=int, default=100, help='Delay of every lazy-loaded reviews page')
+    parser.add_argument('--jitter-ms', type=int, default=20)
+    parser.add_argument('--languages', default='id=0.7,en=0.2,fr=0.05,de=0.05')
+    parser.add_argument('--hl', default='id', help='Interface language of the fixture pages')
+    parser.add_argument('-a', dest='spider_args', action='append', default=[], metavar='NAME=VALUE',
+                        help='Extra spider argument, may be repeated')
+    parser.add_argument('--timeout', type=float, default=3600, help='Seconds before a crawl is killed')
+    parser.add_argument('--report', help='Write the results as JSON to this file')
+    args = parser.parse_args()
+
+    config = FixtureConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        languages=FixtureConfig.parse_languages(args.languages),
+    )
+    server = make_server(port=0, config=config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_port}/maps/place'
+
+    results = []
+    try:
+        for size in (int(size) for size in args.sizes.split(',')):
+            place_url = f'{base_url}/Benchmark+Place+{size}?n={size}&hl={args.hl}'
+            print(f"Crawling {size} reviews ...", flush=True)
+            result = dict(size=size, **run_crawl(place_url, args.spider_args, args.timeout))
+            results.append(result)
+            print(
+                f"  {result['reviews']}/{size} reviews, {result['reviews_per_second']:.1f} reviews/sec "
+                f"({result['place_seconds']:.1f}s scraping, {result['wall_seconds']:.1f}s total), "
+                f"peak RSS {result['peak_rss_mb']:.0f} MB, {result['cdp_calls']} CDP calls "
+                f"({result['cdp_calls_per_review'] or 0:.2f}/review), "
+                f"{result['owner_responses']} owner responses, {result['reviews_with_photos']} with photos",
+                flush=True,
+            )
+            for error in result['errors']:
+                print(f"  {error}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({'latency_ms': args.latency_ms, 'spider_args': args.spider_args, 'results': results}, f, indent=2)
+        print(f"Report written to {args.report}")
+
+
+if __name__ == '__main__':
+    main()
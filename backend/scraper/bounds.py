@@ -0,0 +1,127 @@
+"""
+Per-place bounds of a scrape job and the cursor of a place that hit one.
+
+-a max_reviews=N, -a since=YYYY-MM-DD and -a deadline_seconds=S (or
+MAPS_PLACE_DEADLINE_SECONDS) cap how many reviews a place emits, how old they
+may be and how long the place may take. A place stopped by a bound ends with
+partial results and a cursor: an opaque token with the place, the last
+emitted review and the number of reviews emitted so far. Passing it back with
+-a cursor=<token> continues the place after that review (the browser spider
+fast-scrolls past it, the HTTP spider resumes from the continuation token).
+"""
+
+import base64
+import json
+import time
+from datetime import datetime, timedelta
+
+from scraper.state import DATE_PREFIX_RE
+
+
+BOUND_REASONS = ('max_reviews', 'since', 'deadline')
+
+CURSOR_VERSION = 1
+
+
+def parse_since(value):
+    """Normalize a since argument to YYYY-MM-DD, None when empty"""
+    if not value:
+        return None
+    match = DATE_PREFIX_RE.match(str(value))
+    if not match:
+        raise ValueError(f"since must start with YYYY-MM-DD, got '{value}'")
+    return match.group(1)
+
+
+def review_day(review_date):
+    match = DATE_PREFIX_RE.match(str(review_date or ''))
+    return match.group(1) if match else None
+
+
+def encode_cursor(data):
+    raw = json.dumps(dict(data, v=CURSOR_VERSION), separators=(',', ':'), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        data = json.loads(raw.decode('utf-8'))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor '{token}': {e}")
+    if not isinstance(data, dict) or data.get('v') != CURSOR_VERSION or not data.get('place'):
+        raise ValueError(f"Invalid cursor '{token}'")
+    return data
+
+
+class PlaceBounds:
+    """
+    Bounds of one place. The deadline clock starts when the object is created.
+
+    since only stops the stream when it is newest-first (stop_at_since); a
+    review dated before since is never emitted, but the stream only stops
+    once a review is more than slack_days older, because relative dates such
+    as "setahun lalu" are approximate.
+    """
+
+    def __init__(self, max_reviews=None, since=None, deadline_seconds=None, slack_days=0):
+        self.max_reviews = max_reviews if max_reviews and max_reviews > 0 else None
+        self.since = since
+        self.deadline_seconds = deadline_seconds if deadline_seconds and deadline_seconds > 0 else None
+        self.since_cutoff = None
+        if since:
+            cutoff = datetime.strptime(since, '%Y-%m-%d') - timedelta(days=slack_days)
+            self.since_cutoff = cutoff.strftime('%Y-%m-%d')
+        self.stop_at_since = True
+        self.started = time.monotonic()
+        self.reason = None
+
+    @property
+    def active(self):
+        return bool(self.max_reviews or self.since or self.deadline_seconds)
+
+    @property
+    def remaining_seconds(self):
+        """Seconds left before the deadline, None without one"""
+        if self.deadline_seconds is None:
+            return None
+        return max(0.0, self.deadline_seconds - (time.monotonic() - self.started))
+
+    def stop(self, reason):
+        if self.reason is None:
+            self.reason = reason
+        return True
+
+    def expired(self):
+        """Whether the deadline has passed (and records it as the stop reason)"""
+        if self.deadline_seconds is not None and self.remaining_seconds <= 0:
+            return self.stop('deadline')
+        return False
+
+    def too_old(self, review_date):
+        """Whether a review is dated before since and must not be emitted"""
+        day = review_day(review_date)
+        return bool(self.since and day and day < self.since)
+
+    def beyond_since(self, review_date):
+        """Whether a newest-first stream has passed since by more than the slack"""
+        day = review_day(review_date)
+        if self.stop_at_since and self.since_cutoff and day and day < self.since_cutoff:
+            return self.stop('since')
+        return False
+
+    def full(self, emitted):
+        """Whether max_reviews reviews were emitted"""
+        if self.max_reviews is not None and emitted >= self.max_reviews:
+            return self.stop('max_reviews')
+        return False
+
+    def describe(self):
+        parts = []
+        if self.max_reviews:
+            parts.append(f"max_reviews={self.max_reviews}")
+        if self.since:
+            parts.append(f"since={self.since}")
+        if self.deadline_seconds:
+            parts.append(f"deadline={self.deadline_seconds:g}s")
+        return ', '.join(parts)
@@ -0,0 +1,169 @@
+"""
+Checkpoints of long place scrapes, so a crash only costs the last few reviews.
+
+A CheckpointStore is a SQLite file with the keys of the reviews emitted per
+place and a progress row per place. Keys are written every
+MAPS_CHECKPOINT_EVERY reviews and whenever a place ends; only the keys not
+written yet are held in memory, the rest is read from the file. A restarted crawl
+treats the stored keys as already seen, fast-scrolls the reviews pane past
+them without extracting them again, and skips places that were completed.
+Delivery is at-least-once: reviews emitted after the last write are emitted
+again after a restart, so append to the feed (-o) rather than overwrite it.
+"""
+
+import os
+import sqlite3
+from datetime import datetime
+
+from scrapy import signals
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS places (
+    place_key TEXT PRIMARY KEY,
+    reviews_emitted INTEGER NOT NULL DEFAULT 0,
+    last_review_key TEXT,
+    resumes INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS emitted (
+    place_key TEXT NOT NULL,
+    review_key TEXT NOT NULL,
+    PRIMARY KEY (place_key, review_key)
+) WITHOUT ROWID;
+'''
+
+
+class PlaceCheckpoint:
+    """Emitted review keys and progress of one place"""
+
+    def __init__(self, store, place_key):
+        self.store = store
+        self.place_key = place_key
+        connection = store.connection
+        row = connection.execute(
+            'SELECT reviews_emitted, resumes, completed FROM places WHERE place_key = ?', (place_key,)
+        ).fetchone()
+        self.resumed = connection.execute(
+            'SELECT COUNT(*) FROM emitted WHERE place_key = ?', (place_key,)
+        ).fetchone()[0]
+        self.reviews_emitted = row[0] if row else 0
+        self.completed = bool(row[2]) if row else False
+        self.pending = []
+        self.last_review_key = None
+
+        if row is None:
+            # Registered up front, so a place that fails before its first review stays incomplete
+            self.flush()
+        elif self.resumed:
+            connection.execute('UPDATE places SET resumes = resumes + 1 WHERE place_key = ?', (place_key,))
+            connection.commit()
+            store.inc_stat('checkpoint/places_resumed')
+            store.inc_stat('checkpoint/reviews_resumed', self.resumed)
+
+    def __contains__(self, review_key):
+        """Whether a review key was recorded, answered by the file for keys already written"""
+        if review_key in self.pending:
+            return True
+        return self.store.connection.execute(
+            'SELECT 1 FROM emitted WHERE place_key = ? AND review_key = ?', (self.place_key, review_key)
+        ).fetchone() is not None
+
+    def emitted_keys(self):
+        """Stream the review keys written for the place from the file"""
+        rows = self.store.connection.execute('SELECT review_key FROM emitted WHERE place_key = ?', (self.place_key,))
+        for (review_key,) in rows:
+            yield review_key
+
+    def add(self, review_key):
+        """Record an emitted review, writing the pending keys every flush_every reviews"""
+        self.pending.append(review_key)
+        self.last_review_key = review_key
+        self.reviews_emitted += 1
+        if len(self.pending) >= self.store.flush_every:
+            self.flush()
+
+    def flush(self, completed=False):
+        connection = self.store.connection
+        with connection:
+            connection.executemany(
+                'INSERT OR IGNORE INTO emitted (place_key, review_key) VALUES (?, ?)',
+                [(self.place_key, review_key) for review_key in self.pending],
+            )
+            connection.execute(
+                'INSERT INTO places (place_key, reviews_emitted, last_review_key, completed, updated_at) '
+                'VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT(place_key) DO UPDATE SET reviews_emitted = excluded.reviews_emitted, '
+                'last_review_key = COALESCE(excluded.last_review_key, places.last_review_key), '
+                'completed = excluded.completed, updated_at = excluded.updated_at',
+                (self.place_key, self.reviews_emitted, self.last_review_key, int(completed),
+                 datetime.now().isoformat()),
+            )
+        self.store.inc_stat('checkpoint/writes')
+        self.pending = []
+
+    def complete(self):
+        """The place was scraped to the end; its keys are no longer needed"""
+        self.flush(completed=True)
+        with self.store.connection as connection:
+            connection.execute('DELETE FROM emitted WHERE place_key = ?', (self.place_key,))
+        self.completed = True
+
+
+class CheckpointStore:
+    """
+    SQLite checkpoint file of one crawl.
+
+    Stats:
+        checkpoint/places_resumed, checkpoint/reviews_resumed,
+        checkpoint/places_skipped, checkpoint/reviews_fast_forwarded, checkpoint/writes
+    """
+
+    def __init__(self, path, crawler=None, flush_every=50):
+        self.path = path
+        self.crawler = crawler
+        self.flush_every = max(1, flush_every)
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        # WAL keeps every checkpoint write cheap and the file readable after a crash
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+
+    @classmethod
+    def from_crawler(cls, crawler, path):
+        store = cls(path, crawler, flush_every=crawler.settings.getint('MAPS_CHECKPOINT_EVERY', 50))
+        crawler.signals.connect(store.spider_closed, signal=signals.spider_closed)
+        return store
+
+    def inc_stat(self, key, count=1):
+        if self.crawler:
+            self.crawler.stats.inc_value(key, count)
+
+    def place(self, place_key):
+        return PlaceCheckpoint(self, place_key)
+
+    def is_completed(self, place_key):
+        row = self.connection.execute('SELECT completed FROM places WHERE place_key = ?', (place_key,)).fetchone()
+        return bool(row and row[0])
+
+    def incomplete_places(self):
+        return [key for (key,) in self.connection.execute('SELECT place_key FROM places WHERE completed = 0')]
+
+    def close(self, finished=False):
+        """Close the store; a crawl that finished every place removes its checkpoint"""
+        remove = finished and not self.incomplete_places()
+        self.connection.close()
+        if remove:
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(self.path + suffix):
+                    os.remove(self.path + suffix)
+        return remove
+
+    def spider_closed(self, spider, reason):
+        if self.close(finished=reason == 'finished'):
+            spider.logger.info(f"Every place completed, removed checkpoint {self.path}")
+        else:
+            spider.logger.info(f"Checkpoint kept at {self.path}, rerun with the same checkpoint to resume")
@@ -0,0 +1,281 @@
+"""
+Relative review dates ("6 hari lalu", "2 months ago", "hace un año") to dates.
+
+Every supported locale gets one precompiled pattern built from its vocabulary,
+anchored at the start of the string. Unit words only match as whole tokens
+('an' is a French year, never a piece of "an hour"); text after the date
+("3 minggu lalu di Google", "Diedit 2 hari lalu ·") is ignored. Results are memoized per string and all
+dates are computed from one reference clock taken when the parser is created,
+so every review of a crawl is dated against the same "now".
+
+    python -m scraper.dates --benchmark
+"""
+
+import argparse
+import re
+import time
+from datetime import datetime, timedelta
+
+
+# Days per unit; months and years are approximations (30 / 365 days)
+UNIT_DAYS = {
+    'second': 0,
+    'minute': 0,
+    'hour': 0,
+    'day': 1,
+    'week': 7,
+    'month': 30,
+    'year': 365,
+}
+
+# Vocabulary of the relative dates shown by Google Maps, per locale.
+#   edited:   prefixes of edited reviews ("Diedit 2 bulan lalu")
+#   before:   words before the amount ("hace", "il y a", "vor")
+#   after:    words after the unit ("lalu", "ago", "fa")
+#   one:      words meaning "one" ("a", "un", "einem"); "se" is glued in Indonesian
+#   units:    {unit: words}
+#   now:      phrases meaning "just now"
+DATE_LOCALES = {
+    'id': {
+        'edited': ('diedit',),
+        'before': (),
+        'after': ('yang lalu', 'lalu'),
+        'one': ('se', 'satu'),
+        'units': {
+            'second': ('detik',),
+            'minute': ('menit',),
+            'hour': ('jam',),
+            'day': ('hari',),
+            'week': ('minggu', 'pekan'),
+            'month': ('bulan',),
+            'year': ('tahun',),
+        },
+        'now': ('baru saja',),
+    },
+    'en': {
+        'edited': ('edited',),
+        'before': (),
+        'after': ('ago',),
+        'one': ('a', 'an', 'one'),
+        'units': {
+            'second': ('second', 'seconds'),
+            'minute': ('minute', 'minutes'),
+            'hour': ('hour', 'hours'),
+            'day': ('day', 'days'),
+            'week': ('week', 'weeks'),
+            'month': ('month', 'months'),
+            'year': ('year', 'years'),
+        },
+        'now': ('just now', 'a moment ago'),
+    },
+    'es': {
+        'edited': ('editado', 'editada'),
+        'before': ('hace',),
+        'after': (),
+        'one': ('un', 'una'),
+        'units': {
+            'second': ('segundo', 'segundos'),
+            'minute': ('minuto', 'minutos'),
+            'hour': ('hora', 'horas'),
+            'day': ('día', 'días', 'dia', 'dias'),
+            'week': ('semana', 'semanas'),
+            'month': ('mes', 'meses'),
+            'year': ('año', 'años'),
+        },
+        'now': ('justo ahora', 'hace un momento'),
+    },
+    'fr': {
+        'edited': ('modifié', 'modifiée'),
+        'before': ('il y a',),
+        'after': (),
+        'one': ('un', 'une'),
+        'units': {
+            'second': ('seconde', 'secondes'),
+            'minute': ('minute', 'minutes'),
+            'hour': ('heure', 'heures'),
+            'day': ('jour', 'jours'),
+            'week': ('semaine', 'semaines'),
+            'month': ('mois',),
+            'year': ('an', 'ans', 'année', 'années'),
+        },
+        'now': ("à l'instant",),
+    },
+    'de': {
+        'edited': ('bearbeitet',),
+        'before': ('vor',),
+        'after': (),
+        'one': ('einem', 'einer', 'ein', 'eine'),
+        'units': {
+            'second': ('sekunde', 'sekunden'),
+            'minute': ('minute', 'minuten'),
+            'hour': ('stunde', 'stunden'),
+            'day': ('tag', 'tagen', 'tage'),
+            'week': ('woche', 'wochen'),
+            'month': ('monat', 'monaten', 'monate'),
+            'year': ('jahr', 'jahren', 'jahre'),
+        },
+        'now': ('gerade eben',),
+    },
+    'it': {
+        'edited': ('modificato', 'modificata'),
+        'before': (),
+        'after': ('fa',),
+        'one': ('un', 'una', 'uno'),
+        'units': {
+            'second': ('secondo', 'secondi'),
+            'minute': ('minuto', 'minuti'),
+            'hour': ('ora', 'ore'),
+            'day': ('giorno', 'giorni'),
+            'week': ('settimana', 'settimane'),
+            'month': ('mese', 'mesi'),
+            'year': ('anno', 'anni'),
+        },
+        'now': ('proprio ora', 'adesso'),
+    },
+}
+
+DEFAULT_LOCALE_ORDER = ('id', 'en', 'es', 'fr', 'de', 'it')
+
+# Sample strings per locale, used by the benchmark
+BENCHMARK_SAMPLES = {
+    'id': ('6 hari lalu', 'sebulan lalu', 'setahun lalu', 'Diedit 2 minggu lalu', '3 tahun lalu'),
+    'en': ('2 months ago', 'a year ago', 'Edited 3 weeks ago', 'an hour ago', '5 days ago'),
+    'es': ('hace 2 meses', 'hace un año', 'Editado hace una semana', 'hace 4 días', 'hace 3 años'),
+    'fr': ('il y a 2 mois', 'il y a un an', 'Modifié il y a une semaine', 'il y a 4 jours', 'il y a 3 ans'),
+    'de': ('vor 2 Monaten', 'vor einem Jahr', 'Bearbeitet: vor einer Woche', 'vor 4 Tagen', 'vor 3 Jahren'),
+    'it': ('2 mesi fa', 'un anno fa', 'Modificato una settimana fa', '4 giorni fa', '3 anni fa'),
+}
+
+
+def _alternation(words):
+    # Longest first, so 'années' wins over 'an'
+    return '|'.join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+
+def compile_locale_pattern(vocab):
+    """Build the single start-anchored pattern of one locale"""
+    unit_groups = '|'.join(
+        f'(?P<{unit}>{_alternation(words)})'
+        for unit, words in vocab['units'].items()
+    )
+    # Indonesian glues "se" to the unit ("setahun"), every other word needs a space
+    one_separator = r'\s*' if 'se' in vocab['one'] else r'\s+'
+
+    parts = [r'^(?:(?:' + _alternation(vocab['edited']) + r')\b[\s:·.-]*)?']
+    if vocab['now']:
+        parts.append(r'(?:(?P<now>' + _alternation(vocab['now']) + r')(?!\w)|')
+    if vocab['before']:
+        parts.append(r'(?:' + _alternation(vocab['before']) + r')\s+')
+    parts.append(
+        r'(?:(?P<number>\d+)\s*|(?:' + _alternation(vocab['one']) + r')' + one_separator + r')?'
+        r'(?:' + unit_groups + r')\b'
+    )
+    if vocab['after']:
+        parts.append(r'\s+(?:' + _alternation(vocab['after']) + r')')
+    if vocab['now']:
+        parts.append(r')')
+    # The date ends at a word boundary, whatever follows it is ignored
+    parts.append(r'(?!\w)')
+    return re.compile(''.join(parts), re.IGNORECASE)
+
+
+LOCALE_PATTERNS = {locale: compile_locale_pattern(vocab) for locale, vocab in DATE_LOCALES.items()}
+
+
+class RelativeDateParser:
+    """
+    Parses relative review dates against a fixed reference clock.
+
+    parse() returns a 'YYYY-MM-DD' string or None; results are cached per
+    input string. The preferred locale is tried first, then the others.
+    """
+
+    def __init__(self, now=None, locale=None):
+        self.now = now or datetime.now()
+        self.locales = (locale,) + tuple(l for l in DEFAULT_LOCALE_ORDER if l != locale) \
+            if locale in LOCALE_PATTERNS else DEFAULT_LOCALE_ORDER
+        self.cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, text):
+        if not text:
+            return None
+        try:
+            result = self.cache[text]
+            self.hits += 1
+            return result
+        except KeyError:
+            self.misses += 1
+
+        result = self._parse(' '.join(text.split()))
+        self.cache[text] = result
+        return result
+
+    def parse_many(self, texts):
+        """Normalize a list of relative dates in one call (None for unparseable entries)"""
+        parse = self.parse
+        return [parse(text) for text in texts]
+
+    def _parse(self, text):
+        for locale in self.locales:
+            match = LOCALE_PATTERNS[locale].match(text)
+            if not match:
+                continue
+            if match.group('now'):
+                days = 0
+            else:
+                unit = next(unit for unit in UNIT_DAYS if match.groupdict().get(unit))
+                number = int(match.group('number')) if match.group('number') else 1
+                days = number * UNIT_DAYS[unit]
+            return (self.now - timedelta(days=days)).strftime('%Y-%m-%d')
+        return None
+
+
+def benchmark(rounds=20000):
+    """Time cold (uncached) and warm (cached) parsing for every locale"""
+    results = {}
+    for locale, samples in BENCHMARK_SAMPLES.items():
+        parser = RelativeDateParser(locale=locale)
+        unparsed = [sample for sample in samples if parser.parse(sample) is None]
+
+        started = time.perf_counter()
+        for _ in range(rounds // len(samples)):
+            for sample in samples:
+                parser._parse(sample)
+        cold = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(rounds // len(samples)):
+            parser.parse_many(samples)
+        warm = time.perf_counter() - started
+
+        calls = (rounds // len(samples)) * len(samples)
+        results[locale] = {
+            'cold_us_per_date': round(cold / calls * 1e6, 3),
+            'cached_us_per_date': round(warm / calls * 1e6, 3),
+            'unparsed': unparsed,
+        }
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Parse relative review dates')
+    arg_parser.add_argument('dates', nargs='*', help='relative dates to parse')
+    arg_parser.add_argument('--locale', default=None)
+    arg_parser.add_argument('--benchmark', action='store_true', help='run the per-locale micro-benchmark')
+    arg_parser.add_argument('--rounds', type=int, default=20000)
+    args = arg_parser.parse_args()
+
+    if args.benchmark:
+        for locale, result in benchmark(args.rounds).items():
+            print(f"{locale}: {result['cold_us_per_date']:.3f} us/date uncached, "
+                  f"{result['cached_us_per_date']:.3f} us/date cached, unparsed: {result['unparsed'] or '-'}")
+
+    parser = RelativeDateParser(locale=args.locale)
+    for text, date in zip(args.dates, parser.parse_many(args.dates)):
+        print(f"{text!r} -> {date}")
+
+
+if __name__ == '__main__':
+    main()
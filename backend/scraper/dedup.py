@@ -0,0 +1,175 @@
+"""
+Review deduplication shared by the Google Maps spiders.
+
+Keys are kept as 64-bit blake2b digests instead of strings, either exactly
+(a set of ints) or in a fixed-size Bloom filter for very large places
+(MAPS_DEDUP_MODE = 'bloom', or -a dedup=bloom).
+"""
+
+import hashlib
+import math
+import sys
+
+
+DEDUP_MODES = ('exact', 'bloom')
+
+
+def review_key(review_data):
+    """
+    Build the deduplication key for a review dict.
+
+    Uses the internal '_review_id' tracking field when present, otherwise the
+    reviewer name and review date. Returns None when neither is available.
+    """
+    review_id = review_data.get('_review_id')
+    reviewer_name = review_data.get('reviewer_name')
+    review_date = review_data.get('review_date')
+
+    if review_id:
+        return review_id_key(review_id)
+    if reviewer_name and review_date:
+        return f"name_date:{reviewer_name}:{review_date}"
+    return None
+
+
+def review_id_key(review_id):
+    """Deduplication key of a review id, the same as review_key() builds"""
+    return f"id:{review_id}"
+
+
+def synthetic_review_id(identity):
+    """
+    Review id of a node without a data-review-id, from its REVIEW_IDENTITY
+    string (author, rating, start of the text). The "fp:" prefix keeps it
+    apart from Google's ids, so it is never published as data_review_id.
+    """
+    return f"fp:{stable_digest(identity):016x}"
+
+
+def review_identity(reviewer_name, rating, review_text):
+    """
+    REVIEW_IDENTITY of a built review dict: author, star rating and the start
+    of the whitespace-normalized text. None when there is neither author nor text.
+    """
+    name = (reviewer_name or '').strip()
+    text = ' '.join((review_text or '').split())[:60]
+    if not name and not text:
+        return None
+    rating = f"{rating:g}" if isinstance(rating, (int, float)) else ''
+    return '\x1f'.join([name, rating, text])
+
+
+def stable_digest(value):
+    """
+    64-bit blake2b digest of a key as an unsigned int. Unlike hash() it is not
+    salted per process, so digests can be compared across runs.
+    """
+    if isinstance(value, int):
+        value = str(value)
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over 64-bit digests (double hashing)"""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = max(64, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, digest):
+        h1 = digest & 0xFFFFFFFF
+        h2 = (digest >> 32) | 1
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hashes)]
+
+    def __contains__(self, digest):
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self.positions(digest))
+
+    def add(self, digest):
+        bits = self.bits
+        for position in self.positions(digest):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def false_positive_rate(self):
+        """Expected false positive rate at the current fill"""
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+
+    def memory_bytes(self):
+        return len(self.bits)
+
+
+class ReviewDeduplicator:
+    """
+    Set of review keys stored as 64-bit digests.
+
+    Modes:
+        'exact': a set of ints; memory grows with the place, false positives
+                 only through digest collisions (birthday bound, ~1e-9 at 200k keys)
+        'bloom': a Bloom filter of fixed size; memory stays constant and the
+                 false positive rate rises towards error_rate at capacity
+    """
+
+    def __init__(self, mode='exact', capacity=100000, error_rate=0.001):
+        if mode not in DEDUP_MODES:
+            raise ValueError(f"dedup mode must be one of {DEDUP_MODES}, got '{mode}'")
+        self.mode = mode
+        self.keys = set() if mode == 'exact' else BloomFilter(capacity, error_rate)
+        self.added = 0
+        self.duplicates = 0
+
+    @classmethod
+    def from_settings(cls, settings, mode=None):
+        return cls(
+            mode=mode or settings.get('MAPS_DEDUP_MODE', 'exact'),
+            capacity=settings.getint('MAPS_DEDUP_BLOOM_CAPACITY', 100000),
+            error_rate=settings.getfloat('MAPS_DEDUP_BLOOM_ERROR_RATE', 0.001),
+        )
+
+    def __contains__(self, key):
+        return stable_digest(key) in self.keys
+
+    def __len__(self):
+        return self.added
+
+    def add(self, key):
+        """Add a key; returns False (and counts a duplicate) when it was already seen"""
+        digest = stable_digest(key)
+        if digest in self.keys:
+            self.duplicates += 1
+            return False
+        self.keys.add(digest)
+        self.added += 1
+        return True
+
+    def update(self, keys):
+        for key in keys:
+            self.add(key)
+
+    def false_positive_rate(self):
+        if self.mode == 'bloom':
+            return self.keys.false_positive_rate()
+        # Probability that any two of the stored digests collide
+        return self.added * (self.added - 1) / 2 / 2 ** 64
+
+    def memory_bytes(self):
+        if self.mode == 'bloom':
+            return self.keys.memory_bytes()
+        return sys.getsizeof(self.keys) + self.added * sys.getsizeof(2 ** 63)
+
+    def summary(self):
+        return (
+            f"{self.added} keys, {self.duplicates} duplicates, {self.memory_bytes() / 1024:.0f} KiB "
+            f"({self.mode}), estimated false positive rate {self.false_positive_rate():.2g}"
+        )
+
+    def finish(self, stats):
+        stats.inc_value('dedup/keys', self.added)
+        stats.inc_value('dedup/duplicates', self.duplicates)
+        stats.max_value('dedup/memory_bytes_max', self.memory_bytes())
+        stats.max_value('dedup/false_positive_rate_max', self.false_positive_rate())
@@ -0,0 +1,524 @@
+"""
+Synthetic Google Maps place pages for offline runs and benchmarks.
+
+Serves generated place pages with the markup the maps_reviews spider reads
+(div[data-review-id], div.d4r55, span.wiI7pd, span.rsqaWe, rating images,
+"More" and translation buttons) and a reviews pane that lazy-loads pages of
+10 reviews when it is scrolled to the bottom, like the real one:
+
+    python -m scraper.fixture_server --port 8766 --reviews 1000 --latency-ms 150
+    python -m scrapy crawl maps_reviews -a url=http://127.0.0.1:8766/maps/place/Fixture+Cafe
+
+Reviews are generated deterministically from the place name and index, so
+every run sees the same data. The n= query parameter overrides the number of
+reviews of one place, hl= selects the interface language ('id' or 'en').
+The pane is fed by a fixture endpoint, not the real reviews RPC, so
+extraction_source=network falls back to DOM extraction here.
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import random
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote_plus, urlparse
+
+
+PAGE_SIZE = 10
+
+# Interface texts of the fixture pages
+INTERFACE_TEXTS = {
+    'id': {
+        'overview': 'Ringkasan',
+        'reviews': 'Ulasan',
+        'about': 'Tentang',
+        'reviews_label': 'Ulasan untuk {name}',
+        'review_count': '{count} ulasan',
+        'category': 'Kafe',
+        'owner_label': 'Tanggapan dari pemilik',
+        'sort': 'Urutkan',
+        'sort_label': 'Urutkan ulasan',
+        'sort_options': ('Paling relevan', 'Terbaru', 'Rating tertinggi', 'Rating terendah'),
+        'stars': '{rating} bintang',
+        'more': 'Lainnya',
+        'see_translation': 'Lihat terjemahan',
+        'see_original': 'Lihat versi asli',
+        'translated_prefix': '(Diterjemahkan oleh Google) ',
+        'date': '{amount} {unit} lalu',
+        'date_one': {'day': 'sehari lalu', 'week': 'seminggu lalu', 'month': 'sebulan lalu', 'year': 'setahun lalu'},
+        'units': {'day': 'hari', 'week': 'minggu', 'month': 'bulan', 'year': 'tahun'},
+    },
+    'en': {
+        'overview': 'Overview',
+        'reviews': 'Reviews',
+        'about': 'About',
+        'reviews_label': 'Reviews for {name}',
+        'review_count': '{count} reviews',
+        'category': 'Cafe',
+        'owner_label': 'Response from the owner',
+        'sort': 'Sort',
+        'sort_label': 'Sort reviews',
+        'sort_options': ('Most relevant', 'Newest', 'Highest rating', 'Lowest rating'),
+        'stars': '{rating} stars',
+        'more': 'More',
+        'see_translation': 'See translation',
+        'see_original': 'See original',
+        'translated_prefix': '(Translated by Google) ',
+        'date': '{amount} {unit}s ago',
+        'date_one': {'day': 'a day ago', 'week': 'a week ago', 'month': 'a month ago', 'year': 'a year ago'},
+        'units': {'day': 'day', 'week': 'week', 'month': 'month', 'year': 'year'},
+    },
+}
+
+# Words of the generated review texts, per review language
+REVIEW_WORDS = {
+    'id': ('tempatnya', 'nyaman', 'makanan', 'enak', 'pelayanan', 'ramah', 'harga', 'terjangkau', 'bersih',
+           'parkir', 'luas', 'suasana', 'tenang', 'kopi', 'mantap', 'antri', 'lama', 'recommended', 'banget'),
+    'en': ('great', 'place', 'friendly', 'staff', 'food', 'was', 'delicious', 'prices', 'fair', 'clean',
+           'parking', 'easy', 'quiet', 'coffee', 'excellent', 'service', 'slow', 'would', 'return'),
+    'es': ('lugar', 'agradable', 'comida', 'deliciosa', 'servicio', 'amable', 'precio', 'justo', 'limpio',
+           'tranquilo', 'café', 'excelente', 'volveré', 'recomendado'),
+    'fr': ('endroit', 'agréable', 'cuisine', 'délicieuse', 'service', 'aimable', 'prix', 'correct', 'propre',
+           'calme', 'café', 'excellent', 'reviendrai', 'recommandé'),
+    'de': ('schöner', 'Ort', 'Essen', 'lecker', 'Service', 'freundlich', 'Preise', 'fair', 'sauber',
+           'ruhig', 'Kaffee', 'ausgezeichnet', 'gerne', 'wieder'),
+    'it': ('posto', 'piacevole', 'cibo', 'delizioso', 'servizio', 'gentile', 'prezzi', 'onesti', 'pulito',
+           'tranquillo', 'caffè', 'ottimo', 'tornerò', 'consigliato'),
+}
+
+FIRST_NAMES = ('Andi', 'Budi', 'Citra', 'Dewi', 'Eko', 'Fitri', 'Gita', 'Hadi', 'Intan', 'Joko',
+               'Kevin', 'Laura', 'Maria', 'Nadia', 'Oscar', 'Putri', 'Rina', 'Sari', 'Tono', 'Wulan')
+LAST_NAMES = ('Pratama', 'Santoso', 'Wijaya', 'Lestari', 'Saputra', 'Hidayat', 'Smith', 'Garcia',
+              'Martin', 'Müller', 'Rossi', 'Kurniawan', 'Nugroho', 'Halim')
+
+SORT_ORDERS = ('relevant', 'newest', 'highest', 'lowest')
+
+# Reviews longer than this are truncated behind a "More" button
+TRUNCATE_AT = 160
+
+# Share of reviews with an owner response, and with photos
+OWNER_RESPONSE_RATIO = 0.2
+PHOTO_RATIO = 0.15
+
+
+class FixtureConfig:
+    """Generation and serving parameters of the fixture server"""
+
+    def __init__(self, reviews=1000, latency_ms=150, jitter_ms=50, languages=None, long_ratio=0.3,
+                 max_age_days=1500, seed=0):
+        self.reviews = reviews
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        # {review language: weight}; reviews in another language than hl get a translation button
+        self.languages = languages or {'id': 0.7, 'en': 0.2, 'fr': 0.05, 'de': 0.05}
+        self.long_ratio = long_ratio
+        self.max_age_days = max_age_days
+        self.seed = seed
+
+    @staticmethod
+    def parse_languages(value):
+        """'id=0.7,en=0.3' -> {'id': 0.7, 'en': 0.3}"""
+        languages = {}
+        for part in value.split(','):
+            language, _, weight = part.partition('=')
+            if language.strip() not in REVIEW_WORDS:
+                raise ValueError(f"Unsupported review language '{language}', choose from {tuple(REVIEW_WORDS)}")
+            languages[language.strip()] = float(weight or 1)
+        return languages
+
+    def key(self):
+        return (self.seed, self.long_ratio, self.max_age_days, tuple(sorted(self.languages.items())))
+
+
+def relative_date(days, texts):
+    """Relative date text as Google Maps shows it ('3 minggu lalu', 'a year ago')"""
+    for unit, unit_days in (('year', 365), ('month', 30), ('week', 7), ('day', 1)):
+        if days >= unit_days or unit == 'day':
+            amount = max(1, days // unit_days)
+            if amount == 1:
+                return texts['date_one'][unit]
+            return texts['date'].format(amount=amount, unit=texts['units'][unit])
+
+
+def sentence(rng, language, words):
+    text = ' '.join(rng.choice(REVIEW_WORDS[language]) for _ in range(words))
+    return text[0].upper() + text[1:] + '.'
+
+
+@lru_cache(maxsize=16)
+def generate_reviews(place, count, hl, config_key):
+    """
+    All reviews of a place, newest first. Index i is i * max_age / count days
+    old, so the newest sort order is simply the index order.
+    """
+    seed, long_ratio, max_age_days, languages = config_key
+    names, weights = zip(*languages)
+    texts = INTERFACE_TEXTS[hl]
+    place_seed = hashlib.blake2b(f'{seed}:{place}'.encode('utf-8'), digest_size=8).hexdigest()
+
+    reviews = []
+    for index in range(count):
+        rng = random.Random(f'{place_seed}:{index}')
+        language = rng.choices(names, weights)[0]
+        words = rng.randint(40, 90) if rng.random() < long_ratio else rng.randint(5, 20)
+        text = ' '.join(sentence(rng, language, rng.randint(5, 12)) for _ in range(max(1, words // 8)))
+        translated = None
+        if language != hl:
+            translated = texts['translated_prefix'] + ' '.join(
+                sentence(rng, hl, rng.randint(5, 12)) for _ in range(max(1, words // 8))
+            )
+        days = index * max_age_days // max(count, 1)
+        owner_response = sentence(rng, hl, rng.randint(6, 14)) if rng.random() < OWNER_RESPONSE_RATIO else None
+        photos = rng.choice((1, 2, 3, 5, 8)) if rng.random() < PHOTO_RATIO else 0
+        reviews.append({
+            'id': 'ChZDSUhNMG9nS0VJQ0FnSUR' + hashlib.blake2b(
+                f'{place_seed}:{index}'.encode('utf-8'), digest_size=9).hexdigest(),
+            'name': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+            'rating': rng.choices((1, 2, 3, 4, 5), (5, 5, 10, 30, 50))[0],
+            'date': relative_date(days, texts),
+            'language': language,
+            'text': text,
+            'translated': translated,
+            'owner_response': owner_response,
+            'photos': photos,
+        })
+    return reviews
+
+
+@lru_cache(maxsize=32)
+def review_order(place, count, hl, config_key, sort):
+    """Review indexes in the order of a sort option"""
+    if sort == 'newest':
+        return list(range(count))
+    reviews = generate_reviews(place, count, hl, config_key)
+    if sort == 'highest':
+        return sorted(range(count), key=lambda index: (-reviews[index]['rating'], index))
+    if sort == 'lowest':
+        return sorted(range(count), key=lambda index: (reviews[index]['rating'], index))
+    # 'relevant': a fixed shuffle, so it is clearly not newest-first
+    order = list(range(count))
+    random.Random(place).shuffle(order)
+    return order
+
+
+def render_review(review, texts):
+    """One review node with the class names of the real reviews pane"""
+    # Translated reviews are shown in their original language first, like with hl matching the reviewer
+    text = review['text']
+    shown = text if len(text) <= TRUNCATE_AT else text[:TRUNCATE_AT].rsplit(' ', 1)[0] + '…'
+    stars = texts['stars'].format(rating=review['rating'])
+    parts = [
+        f'<div class="jftiEf fontBodyMedium" data-review-id="{review["id"]}" aria-label="{html.escape(review["name"])}">',
+        # Like on Maps, the review body is a nested node with the same data-review-id
+        f'<div class="jJc9Ad" data-review-id="{review["id"]}"><button class="al6Kxe" data-review-id="{review["id"]}">'
+        f'<div class="d4r55 fontTitleMedium">{html.escape(review["name"])}</div></button>',
+        '<div class="DU9Pgb">',
+        f'<span class="kvMYJc" role="img" aria-label="{stars}">{"★" * review["rating"]}</span>',
+        f'<span class="rsqaWe">{html.escape(review["date"])}</span>',
+        '</div>',
+        f'<div class="MyEned" lang="{review["language"]}"><span class="wiI7pd">{html.escape(shown)}</span>',
+    ]
+    if shown != text:
+        parts.append(f'<button class="w8nwRe" aria-label="See more" aria-expanded="false">{texts["more"]}</button>')
+    parts.append('</div>')
+    if review['translated']:
+        parts.append(
+            f'<button class="kyuRq fontTitleSmall" aria-label="{texts["see_translation"]}">'
+            f'{texts["see_translation"]}</button>'
+        )
+    if review['photos']:
+        # Three thumbnails at most, the last one carries the "+N" of the hidden photos
+        shown_photos = min(review['photos'], 3)
+        parts.append('<div class="KtCyie">')
+        for photo in range(shown_photos):
+            hidden = review['photos'] - shown_photos if photo == shown_photos - 1 else 0
+            parts.append(f'<button class="Tya61d" aria-label="Photo">{f"+{hidden}" if hidden else ""}</button>')
+        parts.append('</div>')
+    if review['owner_response']:
+        parts.append(
+            f'<div class="CDe7pd"><span class="nM6d2c">{texts["owner_label"]}</span>'
+            f'<div class="wiI7pd">{html.escape(review["owner_response"])}</div></div>'
+        )
+    parts.append('</div></div>')
+    return ''.join(parts)
+
+
+PAGE_TEMPLATE = '''<!DOCTYPE html>
+<html lang="{hl}">
+<head>
+<meta charset="utf-8">
+<title>{name} - Google Maps</title>
+<style>
+  body {{ margin: 0; font-family: sans-serif; }}
+  div[role="main"] {{ width: 420px; height: 100vh; display: flex; flex-direction: column; }}
+  .m6QErb.DxyBCb {{ flex: 1; overflow-y: auto; }}
+  .jftiEf {{ padding: 12px; border-bottom: 1px solid #ddd; }}
+  div[role="menu"] {{ position: absolute; background: #fff; border: 1px solid #ccc; }}
+</style>
+</head>
+<body>
+<div role="main" aria-label="{name}">
+  <div class="TIHn2">
+    <h1 class="DUwDvf lfPIob">{name}</h1>
+    <div class="F7nice"><span aria-hidden="true">{average}</span>
+      <span role="img" aria-label="{average_label}"></span>
+      <span aria-label="{count_label}">({count})</span></div>
+    <button class="DkEaL" jsaction="pane.rating.category">{category}</button>
+  </div>
+  <div role="tablist" class="RWPxGd">
+    <button role="tab" class="hh2c6 G7m0Af" aria-selected="true">{overview}</button>
+    <button role="tab" class="hh2c6" aria-label="{reviews_label}">{reviews}</button>
+    <button role="tab" class="hh2c6">{about}</button>
+  </div>
+  <div id="overview" class="m6QErb">
+    <button data-item-id="address" class="CsEnBe">Jl. Fixture No. 1</button>
+  </div>
+</div>
+<script>
+(() => {{
+  const config = {config};
+  const texts = new Map();
+  let sort = 'relevant';
+  let offset = 0;
+  let loading = false;
+  let generation = 0;
+  let pane = null;
+  let list = null;
+
+  const load = async () => {{
+    if (loading || offset >= config.count) return;
+    loading = true;
+    const current = generation;
+    const params = new URLSearchParams({{place: config.place, n: config.count, hl: config.hl, sort, offset}});
+    try {{
+      const response = await fetch('/fixture/reviews?' + params);
+      const data = await response.json();
+      if (current !== generation) return;
+      for (const review of data.reviews) texts.set(review.id, review);
+      list.insertAdjacentHTML('beforeend', data.reviews.map((review) => review.html).join(''));
+      offset += data.reviews.length;
+    }} finally {{
+      loading = false;
+    }}
+    // A tall viewport may already show the bottom of the list
+    if (pane.scrollTop + pane.clientHeight >= pane.scrollHeight - 200) load();
+  }};
+
+  const resetList = () => {{
+    generation += 1;
+    loading = false;
+    offset = 0;
+    list.innerHTML = '';
+    pane.scrollTop = 0;
+    load();
+  }};
+
+  const openReviews = () => {{
+    if (pane) return;
+    document.getElementById('overview').remove();
+    const main = document.querySelector('div[role="main"]');
+    pane = document.createElement('div');
+    pane.className = 'm6QErb DxyBCb kA9KIf dS8AEf XiKgde';
+    pane.tabIndex = -1;
+    pane.innerHTML = '<div class="m6QErb Pf6ghf"><button class="g88MCb S9kvJb" data-value="Sort" ' +
+      'aria-label="' + config.texts.sort_label + '">' + config.texts.sort + '</button></div>' +
+      '<div class="m6QErb reviews-list"></div>';
+    main.appendChild(pane);
+    list = pane.querySelector('.reviews-list');
+    pane.addEventListener('scroll', () => {{
+      if (pane.scrollTop + pane.clientHeight >= pane.scrollHeight - 200) load();
+    }});
+    load();
+  }};
+
+  const openSortMenu = (button) => {{
+    if (document.querySelector('div[role="menu"]')) return;
+    const menu = document.createElement('div');
+    menu.setAttribute('role', 'menu');
+    menu.innerHTML = config.texts.sort_options.map((label, index) =>
+      '<div role="menuitemradio" class="fxNQSd" data-index="' + index + '">' + label + '</div>').join('');
+    menu.addEventListener('click', (event) => {{
+      const item = event.target.closest('[data-index]');
+      if (!item) return;
+      sort = config.sortOrders[Number(item.getAttribute('data-index'))];
+      menu.remove();
+      resetList();
+    }});
+    button.after(menu);
+  }};
+
+  const toggleTranslation = (button) => {{
+    const node = button.closest('div[data-review-id]');
+    const review = texts.get(node.getAttribute('data-review-id'));
+    const translated = button.getAttribute('aria-label') === config.texts.see_translation;
+    // The real page swaps the text asynchronously after a short fetch
+    setTimeout(() => {{
+      node.querySelector('span.wiI7pd').textContent = translated ? review.translated : review.text;
+      const more = node.querySelector('button.w8nwRe');
+      if (more) more.remove();
+      const label = translated ? config.texts.see_original : config.texts.see_translation;
+      button.setAttribute('aria-label', label);
+      button.textContent = label;
+    }}, config.toggleDelay);
+  }};
+
+  document.addEventListener('click', (event) => {{
+    const target = event.target.closest('button');
+    if (!target) return;
+    if (target.getAttribute('role') === 'tab' && target.getAttribute('aria-label')) {{
+      openReviews();
+    }} else if (target.getAttribute('data-value') === 'Sort') {{
+      openSortMenu(target);
+    }} else if (target.classList.contains('w8nwRe')) {{
+      const node = target.closest('div[data-review-id]');
+      node.querySelector('span.wiI7pd').textContent = texts.get(node.getAttribute('data-review-id')).text;
+      target.remove();
+    }} else if (target.classList.contains('kyuRq')) {{
+      toggleTranslation(target);
+    }}
+  }});
+}})();
+</script>
+</body>
+</html>
+'''
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    config = FixtureConfig()
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        if parsed.path.startswith('/maps/place/'):
+            self.place_page(parsed.path, query)
+        elif parsed.path == '/fixture/reviews':
+            self.reviews_page(query)
+        else:
+            self.send_error(404)
+
+    def interface_language(self, query):
+        hl = query.get('hl', ['id'])[0].split('-')[0].lower()
+        return hl if hl in INTERFACE_TEXTS else 'en'
+
+    def place_page(self, path, query):
+        place = unquote_plus(path[len('/maps/place/'):].split('/')[0]) or 'Fixture Place'
+        count = int(query.get('n', [self.config.reviews])[0])
+        hl = self.interface_language(query)
+        texts = INTERFACE_TEXTS[hl]
+
+        reviews = generate_reviews(place, count, hl, self.config.key())
+        average = sum(review['rating'] for review in reviews) / count if count else 0
+        average_text = f'{average:.1f}'.replace('.', ',') if hl == 'id' else f'{average:.1f}'
+        count_text = f'{count:,}'.replace(',', '.') if hl == 'id' else f'{count:,}'
+        page_config = {
+            'place': place,
+            'count': count,
+            'hl': hl,
+            'texts': texts,
+            'sortOrders': SORT_ORDERS,
+            'toggleDelay': max(10, self.config.latency_ms // 3),
+        }
+        body = PAGE_TEMPLATE.format(
+            hl=hl,
+            name=html.escape(place),
+            average=average_text,
+            average_label=html.escape(texts['stars'].format(rating=average_text)),
+            count=count_text,
+            count_label=html.escape(texts['review_count'].format(count=count_text)),
+            category=texts['category'],
+            overview=texts['overview'],
+            reviews=texts['reviews'],
+            reviews_label=html.escape(texts['reviews_label'].format(name=place)),
+            about=texts['about'],
+            # </script> can not appear in the generated texts, json.dumps is enough here
+            config=json.dumps(page_config, ensure_ascii=False),
+        )
+        self.send_body(body.encode('utf-8'), 'text/html; charset=utf-8')
+
+    def reviews_page(self, query):
+        place = query.get('place', ['Fixture Place'])[0]
+        count = int(query.get('n', [self.config.reviews])[0])
+        hl = self.interface_language(query)
+        sort = query.get('sort', ['relevant'])[0]
+        offset = int(query.get('offset', ['0'])[0])
+        if sort not in SORT_ORDERS:
+            self.send_error(400, f'sort must be one of {SORT_ORDERS}')
+            return
+
+        config_key = self.config.key()
+        reviews = generate_reviews(place, count, hl, config_key)
+        order = review_order(place, count, hl, config_key, sort)
+        texts = INTERFACE_TEXTS[hl]
+        page = [
+            {
+                'id': reviews[index]['id'],
+                'html': render_review(reviews[index], texts),
+                'text': reviews[index]['text'],
+                'translated': reviews[index]['translated'],
+            }
+            for index in order[offset:offset + PAGE_SIZE]
+        ]
+
+        latency = self.config.latency_ms + random.uniform(-self.config.jitter_ms, self.config.jitter_ms)
+        if latency > 0:
+            time.sleep(latency / 1000)
+
+        body = json.dumps({'reviews': page, 'total': count}, ensure_ascii=False).encode('utf-8')
+        self.send_body(body, 'application/json; charset=utf-8')
+
+    def send_body(self, body, content_type):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host='127.0.0.1', port=8766, config=None):
+    """Fixture server bound to host:port (port 0 picks a free port)"""
+    handler = type('ConfiguredFixtureHandler', (FixtureHandler,), {'config': config or FixtureConfig()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve synthetic Google Maps place pages')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--reviews', type=int, default=1000, help='Reviews per place (override per URL with ?n=)')
+    parser.add_argument('--latency-ms', type=int, default=150, help='Delay of every lazy-loaded reviews page')
+    parser.add_argument('--jitter-ms', type=int, default=50)
+    parser.add_argument('--languages', default='id=0.7,en=0.2,fr=0.05,de=0.05',
+                        help='Review language mix, e.g. id=0.7,en=0.3')
+    parser.add_argument('--long-ratio', type=float, default=0.3, help='Share of reviews behind a "More" button')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    config = FixtureConfig(
+        reviews=args.reviews,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        languages=FixtureConfig.parse_languages(args.languages),
+        long_ratio=args.long_ratio,
+        seed=args.seed,
+    )
+    server = make_server(args.host, args.port, config)
+    print(f"Serving synthetic places with {config.reviews} reviews on http://{args.host}:{server.server_port}/maps/place/<name>")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Record and replay place pages as HAR archives.
+
+With -a record_har=<dir> every place is scraped in its own browser context
+that records all network traffic to <dir>/<place>.har.zip. With
+-a replay_har=<dir> the pages are served from those archives through
+page.route_from_har() instead of the network; requests missing from the
+archive are aborted, so a replay never goes online. This gives repeatable,
+rate-limit free timing runs of extraction changes on real page structure.
+"""
+
+import hashlib
+import os
+import re
+
+from scraper.places import place_key
+
+
+HAR_MODES = ('record', 'replay')
+
+
+def har_file_name(place_url):
+    """File name of the archive of one place, derived from its place key"""
+    key = place_key(place_url)
+    safe = re.sub(r'[^\w.-]+', '_', key).strip('_')[:80]
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=4).hexdigest()
+    return f"{safe}-{digest}.har.zip"
+
+
+class HarArchive:
+    """
+    HAR recording or replay of the place pages of one crawl.
+
+    Stats:
+        har/recorded, har/replayed, har/missing
+    """
+
+    def __init__(self, crawler, directory, mode):
+        if mode not in HAR_MODES:
+            raise ValueError(f"HAR mode must be one of {HAR_MODES}, got '{mode}'")
+        self.crawler = crawler
+        self.directory = directory
+        self.mode = mode
+        if mode == 'record':
+            os.makedirs(directory, exist_ok=True)
+        elif not os.path.isdir(directory):
+            raise ValueError(f"HAR replay directory not found: {directory}")
+
+    def path(self, place_url):
+        return os.path.join(self.directory, har_file_name(place_url))
+
+    def context_kwargs(self, place_url):
+        """Browser context arguments of a place (recording only)"""
+        if self.mode != 'record':
+            return {}
+        self.crawler.stats.inc_value('har/recorded')
+        # The archive is written when the place's context is closed
+        return {
+            'record_har_path': self.path(place_url),
+            'record_har_mode': 'full',
+        }
+
+    async def attach(self, page, place_url):
+        """Serve a page from the recorded archive of its place (replay only)"""
+        if self.mode != 'replay':
+            return
+        path = self.path(place_url)
+        if not os.path.exists(path):
+            self.crawler.stats.inc_value('har/missing')
+            raise FileNotFoundError(f"No HAR recording of {place_url} at {path}")
+        await page.route_from_har(path, not_found='abort')
+        self.crawler.stats.inc_value('har/replayed')
@@ -0,0 +1,106 @@
+"""
+Playwright request interception for the Google Maps reviews pane.
+
+Place pages pull map tiles, avatars, review photos, fonts and analytics that
+the scraper never reads. A ResourceBlocker aborts those requests before they
+leave the browser and records what it blocked in the Scrapy stats.
+"""
+
+import re
+
+
+# Blocking profiles selectable with the block_resources spider argument.
+# 'resource_types' are Playwright resource types, 'url_patterns' map a stats
+# category to a regex matched against the request URL.
+BLOCK_PROFILES = {
+    'off': None,
+    'default': {
+        'resource_types': ('image', 'media', 'font'),
+        'url_patterns': {
+            'tile': r'/maps/vt[/?]|/kh/v=|khms\d*\.google|streetviewpixels|/maps/preview/photo',
+            'telemetry': (
+                r'/gen_204|/log204|/csi\?|/log\?|play\.google\.com/log|'
+                r'google-analytics\.com|googletagmanager\.com|doubleclick\.net'
+            ),
+        },
+    },
+}
+
+# Rough transfer size per blocked request, used for the bytes-saved estimate
+# (aborted requests never report their real size)
+DEFAULT_BYTES_ESTIMATE = {
+    'image': 20000,
+    'media': 250000,
+    'font': 40000,
+    'tile': 25000,
+    'telemetry': 500,
+}
+
+
+class ResourceBlocker:
+    """
+    Aborts unwanted requests of a page through page.route().
+
+    Stats:
+        interception/requests_blocked, interception/requests_blocked/<category>
+        interception/requests_allowed
+        interception/bytes_saved_estimate
+    """
+
+    def __init__(self, crawler, resource_types=(), url_patterns=None, bytes_estimate=None):
+        self.crawler = crawler
+        self.resource_types = frozenset(resource_types)
+        self.url_patterns = [
+            (category, re.compile(pattern))
+            for category, pattern in (url_patterns or {}).items()
+        ]
+        self.bytes_estimate = dict(DEFAULT_BYTES_ESTIMATE, **(bytes_estimate or {}))
+
+    @classmethod
+    def from_crawler(cls, crawler, profile):
+        """
+        Build a blocker for a profile name, or return None when blocking is off.
+        MAPS_BLOCK_RESOURCE_TYPES / MAPS_BLOCK_URL_PATTERNS override the profile.
+        """
+        settings = crawler.settings
+        if profile not in BLOCK_PROFILES:
+            raise ValueError(f"block_resources must be one of {tuple(BLOCK_PROFILES)}, got '{profile}'")
+
+        config = BLOCK_PROFILES[profile]
+        if config is None:
+            return None
+
+        return cls(
+            crawler,
+            resource_types=settings.getlist('MAPS_BLOCK_RESOURCE_TYPES') or config['resource_types'],
+            url_patterns=settings.getdict('MAPS_BLOCK_URL_PATTERNS') or config['url_patterns'],
+            bytes_estimate=settings.getdict('MAPS_BLOCKED_BYTES_ESTIMATE'),
+        )
+
+    def classify(self, resource_type, url):
+        """Return the stats category of a request to block, or None to let it through"""
+        for category, pattern in self.url_patterns:
+            if pattern.search(url):
+                return category
+        if resource_type in self.resource_types:
+            return resource_type
+        return None
+
+    async def attach(self, page):
+        await page.route('**/*', self.handle_route)
+
+    async def handle_route(self, route):
+        request = route.request
+        category = self.classify(request.resource_type, request.url)
+
+        stats = self.crawler.stats
+        if category is None:
+            stats.inc_value('interception/requests_allowed')
+            # Hand over to the next handler (scrapy-playwright's own route)
+            await route.fallback()
+            return
+
+        stats.inc_value('interception/requests_blocked')
+        stats.inc_value(f'interception/requests_blocked/{category}')
+        stats.inc_value('interception/bytes_saved_estimate', self.bytes_estimate.get(category, 0))
+        await route.abort('blockedbyclient')
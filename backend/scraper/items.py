@@ -26,7 +26,11 @@ class GoogleMapsReview(scrapy.Item):
     number_of_photos = scrapy.Field()
     
     # Metadata
+    review_id = scrapy.Field()
     scraped_at = scrapy.Field()
+    
+    # Delta output: 'new', 'edited' or 'unchanged' (ReviewDeltaPipeline)
+    change_status = scrapy.Field()
 
 
 class GoogleMapsPlace(scrapy.Item):
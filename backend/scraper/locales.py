@@ -0,0 +1,155 @@
+"""
+Locale profiles for the Google Maps interface languages the spiders handle.
+
+A profile bundles the selectors, aria-label phrases and relative-date
+vocabulary of one interface language (plus English, which Google Maps falls
+back to for some labels) and compiles every selector role into a single
+union selector, so each role costs one query instead of one per candidate.
+The profile is chosen from the hl= parameter of the place URL.
+"""
+
+import re
+from functools import lru_cache
+from urllib.parse import parse_qs, urlparse
+
+from scraper.dates import DATE_LOCALES
+
+
+# The sort button keeps this data-value in every interface language
+SORT_BUTTON_DATA_SELECTOR = 'button[data-value="Sort"]'
+
+# Last-resort translation button selector, only tried when no labelled button matches
+TRANSLATION_BUTTON_CLASS_SELECTOR = 'button.kyuRq.fontTitleSmall'
+
+LOCALE_VOCABULARY = {
+    'id': {
+        'reviews_button': ['button[aria-label*="Ulasan"]', 'button[aria-label*="ulasan"]',
+                           'div[role="tab"]:has-text("Ulasan")', 'button:has-text("Ulasan")'],
+        'sort_button': ['button[aria-label*="Urutkan"]', 'button:has-text("Urutkan")'],
+        'rating_phrases': ['bintang'],
+        'translation_labels': ['Lihat terjemahan', 'Lihat versi asli', 'Lihat asli', 'Diterjemahkan'],
+        'see_original_phrases': ['lihat asli', 'lihat versi asli'],
+        'translated_phrases': ['diterjemahkan'],
+        'original_language_prefixes': ['Asli dalam '],
+        'review_count_phrases': ['ulasan'],
+    },
+    'en': {
+        'reviews_button': ['button[aria-label*="Reviews"]', 'button[aria-label*="reviews"]',
+                           'div[role="tab"]:has-text("Reviews")', 'button:has-text("Reviews")'],
+        'sort_button': ['button[aria-label*="Sort"]', 'button:has-text("Sort")'],
+        'rating_phrases': ['star'],
+        'translation_labels': ['Translated', 'See original', 'See translation'],
+        'see_original_phrases': ['see original'],
+        'translated_phrases': ['translated'],
+        'original_language_prefixes': ['Original in '],
+        'review_count_phrases': ['reviews', 'review'],
+    },
+    'es': {
+        'reviews_button': ['button[aria-label*="Reseñas"]', 'div[role="tab"]:has-text("Reseñas")'],
+        'sort_button': ['button[aria-label*="Ordenar"]', 'button:has-text("Ordenar")'],
+        'rating_phrases': ['estrella'],
+        'translation_labels': ['Ver traducción', 'Ver original', 'Traducido'],
+        'see_original_phrases': ['ver original'],
+        'translated_phrases': ['traducido'],
+        'original_language_prefixes': [],
+        'review_count_phrases': ['reseñas', 'reseña'],
+    },
+    'fr': {
+        'reviews_button': ['button[aria-label*="Avis"]', 'div[role="tab"]:has-text("Avis")'],
+        'sort_button': ['button[aria-label*="Trier"]', 'button:has-text("Trier")'],
+        'rating_phrases': ['étoile'],
+        'translation_labels': ['Voir la traduction', "Voir l'original", 'Traduit'],
+        'see_original_phrases': ["voir l'original"],
+        'translated_phrases': ['traduit'],
+        'original_language_prefixes': [],
+        'review_count_phrases': ['avis'],
+    },
+    'de': {
+        'reviews_button': ['button[aria-label*="Rezensionen"]', 'button[aria-label*="Bewertungen"]',
+                           'div[role="tab"]:has-text("Rezensionen")'],
+        'sort_button': ['button[aria-label*="Sortieren"]', 'button:has-text("Sortieren")'],
+        'rating_phrases': ['Stern'],
+        'translation_labels': ['Übersetzung ansehen', 'Original ansehen', 'Übersetzt'],
+        'see_original_phrases': ['original ansehen'],
+        'translated_phrases': ['übersetzt'],
+        'original_language_prefixes': [],
+        'review_count_phrases': ['rezensionen', 'rezension', 'bewertungen'],
+    },
+    'it': {
+        'reviews_button': ['button[aria-label*="Recensioni"]', 'div[role="tab"]:has-text("Recensioni")'],
+        'sort_button': ['button[aria-label*="Ordina"]', 'button:has-text("Ordina")'],
+        'rating_phrases': ['stella', 'stelle'],
+        'translation_labels': ['Vedi traduzione', 'Vedi originale', 'Tradotto'],
+        'see_original_phrases': ['vedi originale'],
+        'translated_phrases': ['tradotto'],
+        'original_language_prefixes': [],
+        'review_count_phrases': ['recensioni', 'recensione'],
+    },
+}
+
+DEFAULT_LOCALE = 'id'
+
+
+def _attribute_value(text):
+    return text.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def _unique(values):
+    return list(dict.fromkeys(values))
+
+
+class LocaleProfile:
+    """Compiled selectors and phrases for one interface language"""
+
+    def __init__(self, locale, vocabulary_locales):
+        self.locale = locale
+        vocabularies = [LOCALE_VOCABULARY[name] for name in vocabulary_locales]
+
+        def merged(key):
+            return _unique([value for vocabulary in vocabularies for value in vocabulary.get(key, [])])
+
+        # The union tests for a reviews button in one query; the list gives the priority among matches
+        self.reviews_button_selectors = merged('reviews_button')
+        self.reviews_button_selector = ', '.join(self.reviews_button_selectors)
+        self.sort_button_selector = ', '.join([SORT_BUTTON_DATA_SELECTOR] + merged('sort_button'))
+
+        # One union per role; the JS extractors loop over these lists, so one query each
+        self.rating_selectors = [', '.join(
+            f'span[role="img"][aria-label*="{_attribute_value(phrase)}"]' for phrase in merged('rating_phrases')
+        )]
+        self.translation_selectors = [
+            ', '.join(f'button[aria-label*="{_attribute_value(label)}"]' for label in merged('translation_labels')),
+            TRANSLATION_BUTTON_CLASS_SELECTOR,
+        ]
+
+        self.see_original_phrases = merged('see_original_phrases')
+        self.translated_phrases = merged('translated_phrases')
+        prefixes = '|'.join(re.escape(prefix) for prefix in merged('original_language_prefixes'))
+        self.original_language_re = re.compile(rf'\((?:{prefixes})?([^)]+)\)')
+
+        # Lower-case words of the "1.234 ulasan" review count label of the place header
+        self.review_count_phrases = merged('review_count_phrases')
+
+        # Relative-date vocabulary, see scraper/dates.py
+        self.date_vocabulary = {name: DATE_LOCALES[name] for name in vocabulary_locales if name in DATE_LOCALES}
+
+    def __repr__(self):
+        return f"<LocaleProfile {self.locale}>"
+
+
+@lru_cache(maxsize=None)
+def get_locale_profile(hl):
+    """
+    Profile of an hl= value ('id', 'en-US', ...). Unknown languages get a
+    profile that combines every supported locale.
+    """
+    language = (hl or DEFAULT_LOCALE).split('-')[0].split('_')[0].lower()
+    if language in LOCALE_VOCABULARY:
+        return LocaleProfile(language, _unique([language, 'en']))
+    return LocaleProfile('all', list(LOCALE_VOCABULARY))
+
+
+@lru_cache(maxsize=1024)
+def profile_for_url(url):
+    """Profile of the hl= parameter of a place URL"""
+    return get_locale_profile(parse_qs(urlparse(url).query).get('hl', [None])[0])
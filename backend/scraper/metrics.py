@@ -0,0 +1,188 @@
+"""
+Per-phase timing of a crawl.
+
+The spider wraps every phase of a place (navigation, anti-popup injection,
+reviews tab, sort, scroll iterations, extraction batches, translation, page
+close) in MetricsRecorder.phase(). Durations go into the Scrapy stats and
+into histograms; at spider_closed the spider middleware exports everything
+as a Prometheus text file and a JSON summary (MAPS_METRICS_PROMETHEUS_FILE,
+MAPS_METRICS_JSON_FILE).
+"""
+
+import os
+import time
+from bisect import bisect_left
+from datetime import datetime
+
+from scraper.state import write_json_atomic
+
+
+METRIC_PREFIX = 'maps_scraper'
+
+# Upper bounds (seconds) of the phase duration buckets
+PHASE_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+HISTOGRAMS = {
+    'reviews_per_second': (
+        'Reviews scraped per second, one observation per place',
+        (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500),
+    ),
+    'extraction_batch_seconds': (
+        'Latency of one review extraction batch',
+        (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+    ),
+}
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            yield bound, total
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound if bound != float('inf') else self.max
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 4),
+            'mean': round(self.sum / self.count, 4) if self.count else None,
+            'max': round(self.max, 4),
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+        }
+
+
+class _PhaseTimer:
+    def __init__(self, recorder, name, place_url):
+        self.recorder = recorder
+        self.name = name
+        self.place_url = place_url
+
+    def __enter__(self):
+        self.started = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.recorder.record_phase(self.name, time.monotonic() - self.started, self.place_url)
+        return False
+
+
+class MetricsRecorder:
+    """
+    Collects phase durations and histograms of one crawl.
+
+    Stats:
+        phases/<name>/seconds, phases/<name>/count, phases/<name>/max_seconds
+    """
+
+    def __init__(self, crawler):
+        self.crawler = crawler
+        self.phases = {}
+        self.histograms = {name: Histogram(buckets) for name, (_, buckets) in HISTOGRAMS.items()}
+        self.places = {}
+
+    def phase(self, name, place_url=None):
+        """Context manager timing one phase: with self.metrics.phase('sort', place_url): ..."""
+        return _PhaseTimer(self, name, place_url)
+
+    def record_phase(self, name, seconds, place_url=None):
+        histogram = self.phases.get(name)
+        if histogram is None:
+            histogram = self.phases[name] = Histogram(PHASE_BUCKETS)
+        histogram.observe(seconds)
+
+        stats = self.crawler.stats
+        stats.set_value(f'phases/{name}/seconds', round(histogram.sum, 4))
+        stats.inc_value(f'phases/{name}/count')
+        stats.max_value(f'phases/{name}/max_seconds', round(seconds, 4))
+
+        if place_url:
+            place_phases = self.places.setdefault(place_url, {})
+            place_phases[name] = round(place_phases.get(name, 0) + seconds, 4)
+
+    def observe(self, name, value):
+        self.histograms[name].observe(value)
+
+    def to_prometheus(self):
+        lines = []
+
+        def histogram_lines(metric, histogram, labels=''):
+            separator = ',' if labels else ''
+            for bound, total in histogram.cumulative():
+                le = '+Inf' if bound == float('inf') else repr(float(bound))
+                lines.append(f'{metric}_bucket{{{labels}{separator}le="{le}"}} {total}')
+            braces = f'{{{labels}}}' if labels else ''
+            lines.append(f'{metric}_sum{braces} {histogram.sum:.6f}')
+            lines.append(f'{metric}_count{braces} {histogram.count}')
+
+        metric = f'{METRIC_PREFIX}_phase_seconds'
+        lines.append(f'# HELP {metric} Time spent per scrape phase')
+        lines.append(f'# TYPE {metric} histogram')
+        for name, histogram in sorted(self.phases.items()):
+            histogram_lines(metric, histogram, f'phase="{name}"')
+
+        for name, (help_text, _) in HISTOGRAMS.items():
+            metric = f'{METRIC_PREFIX}_{name}'
+            lines.append(f'# HELP {metric} {help_text}')
+            lines.append(f'# TYPE {metric} histogram')
+            histogram_lines(metric, self.histograms[name])
+
+        metric = f'{METRIC_PREFIX}_stat'
+        lines.append(f'# HELP {metric} Numeric Scrapy stats at the end of the crawl')
+        lines.append(f'# TYPE {metric} gauge')
+        for key, value in sorted(self.numeric_stats().items()):
+            lines.append(f'{metric}{{name="{key}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def to_summary(self, spider, reason):
+        return {
+            'spider': spider.name,
+            'reason': reason,
+            'finished_at': datetime.now().isoformat(),
+            'phases': {name: histogram.summary() for name, histogram in sorted(self.phases.items())},
+            'histograms': {name: histogram.summary() for name, histogram in self.histograms.items()},
+            'places': self.places,
+            'stats': self.numeric_stats(),
+        }
+
+    def numeric_stats(self):
+        return {
+            key: value for key, value in self.crawler.stats.get_stats().items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        }
+
+    def export(self, spider, reason, prometheus_path=None, json_path=None):
+        if prometheus_path:
+            directory = os.path.dirname(os.path.abspath(prometheus_path))
+            os.makedirs(directory, exist_ok=True)
+            # Written through a temporary file for node_exporter's textfile collector
+            with open(prometheus_path + '.tmp', 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            os.replace(prometheus_path + '.tmp', prometheus_path)
+        if json_path:
+            write_json_atomic(json_path, self.to_summary(spider, reason))
@@ -3,22 +3,30 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import time
+
 from scrapy import signals
 
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
 
+from scraper.metrics import MetricsRecorder
+
 
 class GooglemapsScraperSpiderMiddleware:
     # Not all methods need to be defined. If a method is not defined,
     # scrapy acts as if the spider middleware does not modify the
     # passed objects.
 
+    def __init__(self, crawler=None):
+        self.crawler = crawler
+
     @classmethod
     def from_crawler(cls, crawler):
         # This method is used by Scrapy to create your spiders.
-        s = cls()
+        s = cls(crawler)
         crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
         return s
 
     def process_spider_input(self, response, spider):
@@ -52,6 +60,26 @@ class GooglemapsScraperSpiderMiddleware:
 
     def spider_opened(self, spider):
         spider.logger.info("Spider opened: %s" % spider.name)
+        # Spiders without their own recorder still get download timings and the export
+        if getattr(spider, 'metrics', None) is None:
+            spider.metrics = MetricsRecorder(self.crawler)
+
+    def spider_closed(self, spider, reason):
+        # Export phase timings and histograms (see scraper/metrics.py)
+        metrics = getattr(spider, 'metrics', None)
+        if metrics is None:
+            return
+        settings = self.crawler.settings
+        prometheus_path = settings.get('MAPS_METRICS_PROMETHEUS_FILE')
+        json_path = settings.get('MAPS_METRICS_JSON_FILE')
+        try:
+            metrics.export(spider, reason, prometheus_path, json_path)
+        except OSError as e:
+            spider.logger.error(f"Could not export metrics: {e}")
+            return
+        for path in (prometheus_path, json_path):
+            if path:
+                spider.logger.info(f"Metrics written to {path}")
 
 
 class GooglemapsScraperDownloaderMiddleware:
@@ -76,6 +104,7 @@ class GooglemapsScraperDownloaderMiddleware:
         # - or return a Request object
         # - or raise IgnoreRequest: process_exception() methods of
         #   installed downloader middleware will be called
+        request.meta['download_started'] = time.monotonic()
         return None
 
     def process_response(self, request, response, spider):
@@ -85,6 +114,7 @@ class GooglemapsScraperDownloaderMiddleware:
         # - return a Response object
         # - return a Request object
         # - or raise IgnoreRequest
+        self.record_download(request, spider)
         return response
 
     def process_exception(self, request, exception, spider):
@@ -95,7 +125,20 @@ class GooglemapsScraperDownloaderMiddleware:
         # - return None: continue processing this exception
         # - return a Response object: stops process_exception() chain
         # - return a Request object: stops process_exception() chain
-        pass
+        self.record_download(request, spider, failed=True)
+        return None
+
+    def record_download(self, request, spider, failed=False):
+        # Playwright requests: the download is the page navigation
+        started = request.meta.pop('download_started', None)
+        metrics = getattr(spider, 'metrics', None)
+        if started is None or metrics is None:
+            return
+        phase = 'navigation' if request.meta.get('playwright') else 'download'
+        if failed:
+            phase += '_failed'
+        place_url = request.meta.get('place_url') or request.url
+        metrics.record_phase(phase, time.monotonic() - started, place_url)
 
     def spider_opened(self, spider):
         spider.logger.info("Spider opened: %s" % spider.name)
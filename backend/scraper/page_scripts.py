@@ -0,0 +1,711 @@
+"""
+In-page JavaScript snippets used by the Google Maps spiders.
+
+Each snippet is evaluated with ``page.evaluate`` so that work which would
+otherwise need one Playwright round trip per field happens inside the page.
+"""
+
+# Owner response and photo count of one review node. Thumbnails beyond the
+# visible ones are summarized by a "+N" overlay on the last thumbnail.
+# Argument: the review element
+# Returns {owner_response, photo_count}
+REVIEW_ATTACHMENTS = '''
+    (el) => {
+        const ownerElem = el.querySelector('div.CDe7pd div.wiI7pd, div.CDe7pd span.wiI7pd');
+        let photoCount = 0;
+        for (const button of el.querySelectorAll('button.Tya61d')) {
+            photoCount += 1;
+            const more = (button.innerText || '').match(/\\+\\s*(\\d+)/);
+            if (more) photoCount += parseInt(more[1], 10);
+        }
+        return {
+            owner_response: ownerElem ? ownerElem.innerText : null,
+            photo_count: photoCount,
+        };
+    }
+'''
+
+# Timestamp attributes, owner response and photo count of one review node: the
+# single evaluate per review of the element extraction mode.
+# Argument: the review element
+# Returns {sort_time, jslog, owner_response, photo_count}
+REVIEW_ELEMENT_FIELDS = '''
+    (el) => {
+        const readAttachments = ''' + REVIEW_ATTACHMENTS + ''';
+        return {
+            sort_time: el.getAttribute('data-sort-time'),
+            jslog: el.getAttribute('jslog'),
+            ...readAttachments(el),
+        };
+    }
+'''
+
+# Identity of a review node without a data-review-id, built only from fields that
+# stay the same between visits: author, star rating and the start of the text.
+# The relative date ("2 minggu lalu") and button labels are left out, so the
+# synthetic id derived from it (dedup.synthetic_review_id) is stable across runs.
+# Argument: the review element
+# Returns the identity string, or null when the node has neither author nor text
+REVIEW_IDENTITY = '''
+    (el) => {
+        const nameElem = el.querySelector('div.d4r55');
+        const textElem = el.querySelector('span.wiI7pd');
+        const ratingElem = el.querySelector('span.kvMYJc, span[role="img"][aria-label]');
+        const name = nameElem ? nameElem.innerText.trim() : '';
+        // Collapsed and expanded text share their start
+        const text = textElem ? textElem.innerText.replace(/\\s+/g, ' ').trim().slice(0, 60) : '';
+        if (!name && !text) return null;
+        const ratingLabel = (ratingElem && ratingElem.getAttribute('aria-label')) || '';
+        const rating = ratingLabel.match(/\\d+(?:[.,]\\d+)?/);
+        return [name, rating ? rating[0] : '', text].join('\\u001f');
+    }
+'''
+
+# Serialize every field of a batch of review nodes in a single evaluate call.
+# Argument: {elements, ratingSelectors, translationSelectors}
+# Returns one plain object per element, in the same order.
+EXTRACT_REVIEWS_BATCH = '''
+    ({ elements, ratingSelectors, translationSelectors }) => {
+        const readAttachments = ''' + REVIEW_ATTACHMENTS + ''';
+        const TIMESTAMP_RE = /^\\d{10,13}$/;
+
+        const findTimestamp = (el) => {
+            // Method 1: data-sort-time on the review node
+            const sortTime = el.getAttribute('data-sort-time');
+            if (sortTime) return sortTime;
+
+            // Method 2: timestamp embedded in jslog
+            const jslog = el.getAttribute('jslog');
+            if (jslog) {
+                const match = jslog.match(/(\\d{10,13})/);
+                if (match) return match[1];
+            }
+
+            // Method 3: attributes of the date element and its parents
+            const dateElem = el.querySelector('span.rsqaWe');
+            if (!dateElem) return null;
+            for (const attr of dateElem.attributes) {
+                if (attr.value && /^\\d+$/.test(attr.value) && attr.value.length >= 10) {
+                    return attr.value;
+                }
+            }
+            let current = dateElem;
+            for (let i = 0; i < 5; i++) {
+                if (!current.parentElement) break;
+                current = current.parentElement;
+                for (const attr of current.attributes) {
+                    if (attr.value && TIMESTAMP_RE.test(attr.value)) return attr.value;
+                }
+            }
+            return null;
+        };
+
+        return elements.map((el) => {
+            if (!el) return null;
+
+            const nameElem = el.querySelector('div.d4r55');
+            const textElem = el.querySelector('span.wiI7pd');
+            const dateElem = el.querySelector('span.rsqaWe');
+
+            // First labelled match for each rating selector, in priority order
+            const ratingLabels = [];
+            for (const selector of ratingSelectors) {
+                const node = el.querySelector(selector);
+                const label = node && node.getAttribute('aria-label');
+                if (label) ratingLabels.push(label);
+            }
+            const imgLabels = Array.from(el.querySelectorAll('span[role="img"]'))
+                .map((node) => node.getAttribute('aria-label'))
+                .filter(Boolean);
+
+            let translation = null;
+            for (const selector of translationSelectors) {
+                const button = el.querySelector(selector);
+                if (button) {
+                    translation = {
+                        label: button.getAttribute('aria-label'),
+                        text: button.innerText,
+                    };
+                    break;
+                }
+            }
+
+            return {
+                reviewer_name: nameElem ? nameElem.innerText : null,
+                rating_labels: ratingLabels,
+                img_labels: imgLabels,
+                review_text: textElem ? textElem.innerText : '',
+                translation: translation,
+                timestamp: findTimestamp(el),
+                date_text: dateElem ? dateElem.innerText : null,
+                ...readAttachments(el),
+            };
+        });
+    }
+'''
+
+# Claim review nodes that have not been consumed yet and expand only those.
+# Consumed nodes are tagged with data-sl-seen="<batchId>" so later scroll steps
+# never touch them again, keeping the cost per step flat as the list grows.
+# Argument: {containerSelectors, batchId, moreSelector}
+# Returns {container, reviews: [{id, identity}], expanded, scrollHeight}
+CLAIM_NEW_REVIEWS = '''
+    ({ containerSelectors, batchId, moreSelector }) => {
+        const reviewIdentity = ''' + REVIEW_IDENTITY + ''';
+        let container = null;
+        let containerSelector = null;
+        for (const selector of containerSelectors) {
+            container = document.querySelector(selector);
+            if (container) {
+                containerSelector = selector;
+                break;
+            }
+        }
+
+        const root = container || document;
+        const itemSelector = root.querySelector('div[data-review-id]') ? 'div[data-review-id]' : 'div.jftiEf';
+        const nodes = Array.from(root.querySelectorAll(itemSelector + ':not([data-sl-seen])'));
+
+        // Nested review nodes share buttons with their parent, click each one once
+        const clicked = new Set();
+        const reviews = nodes.map((node) => {
+            node.setAttribute('data-sl-seen', String(batchId));
+            node.querySelectorAll(moreSelector).forEach((btn) => {
+                if (clicked.has(btn)) return;
+                clicked.add(btn);
+                try { btn.click(); } catch (e) {}
+            });
+            const id = node.getAttribute('data-review-id');
+            // The identity is only needed as a fallback for nodes without an id
+            return { id: id, identity: id ? null : reviewIdentity(node) };
+        });
+
+        return {
+            container: containerSelector,
+            reviews: reviews,
+            expanded: clicked.size,
+            scrollHeight: (container || document.body).scrollHeight,
+        };
+    }
+'''
+
+# Scroll the first matching container to its bottom, without waiting (the
+# network capture waits for reviews RPC responses instead). With nudge the pane
+# is first scrolled up a little, like SCROLL_AND_WAIT.
+# Argument: {containerSelectors (in priority order), nudge}
+# Returns {container, atBottom, scrollHeight}; atBottom means the pane was still
+# scrolled to its bottom, so nothing was appended since the previous scroll
+SCROLL_CONTAINER = '''
+    async ({ containerSelectors, nudge }) => {
+        let container = null;
+        let containerSelector = null;
+        for (const selector of containerSelectors) {
+            container = document.querySelector(selector);
+            if (container) {
+                containerSelector = selector;
+                break;
+            }
+        }
+
+        const target = container || document.scrollingElement || document.body;
+        const atBottom = target.scrollTop + target.clientHeight >= target.scrollHeight - 2;
+        if (nudge) {
+            target.scrollTop = Math.max(0, target.scrollHeight - target.clientHeight * 2);
+            await new Promise((resolve) => requestAnimationFrame(resolve));
+        }
+        target.scrollTop = target.scrollHeight;
+        return { container: containerSelector, atBottom: atBottom, scrollHeight: target.scrollHeight };
+    }
+'''
+
+# Resolve the translations of a batch of reviews with at most two toggle rounds.
+# Every pending translation button is clicked at once, then a single
+# MutationObserver waits until all toggled reviews changed (or the timeout
+# expires). Reviews that switched to the translation are toggled back the same
+# way so the original text can be read.
+# Argument: {elements, translationSelectors, seeOriginalPhrases, timeout}
+# Returns {settled, reviews: [{label, before, after, label_after, final} | null]}
+RESOLVE_TRANSLATIONS = '''
+    async ({ elements, translationSelectors, seeOriginalPhrases, timeout }) => {
+        const textOf = (el) => {
+            const textElem = el.querySelector('span.wiI7pd');
+            return textElem ? textElem.innerText : '';
+        };
+        const findButton = (el) => {
+            for (const selector of translationSelectors) {
+                const button = el.querySelector(selector);
+                if (button) return button;
+            }
+            return null;
+        };
+        const labelOf = (entry) => {
+            // Google may re-render the button, always read it fresh
+            const button = findButton(entry.el);
+            return button ? button.getAttribute('aria-label') : null;
+        };
+
+        const toggle = (pending) => pending.forEach((entry) => {
+            entry.reference = textOf(entry.el);
+            entry.referenceLabel = labelOf(entry);
+            const button = findButton(entry.el);
+            if (!button) return;
+            try {
+                button.click();
+                button.blur();
+            } catch (e) {}
+        });
+
+        // One wait for the whole batch
+        const waitForChange = (pending) => new Promise((resolve) => {
+            const changed = () => pending.every(
+                (entry) => textOf(entry.el) !== entry.reference || labelOf(entry) !== entry.referenceLabel
+            );
+            if (!pending.length || changed()) return resolve(true);
+
+            let timer = null;
+            const observer = new MutationObserver(() => {
+                if (!changed()) return;
+                observer.disconnect();
+                clearTimeout(timer);
+                resolve(true);
+            });
+            timer = setTimeout(() => {
+                observer.disconnect();
+                resolve(false);
+            }, timeout);
+            pending.forEach((entry) => observer.observe(entry.el, {
+                subtree: true, childList: true, characterData: true, attributes: true,
+            }));
+        });
+
+        const entries = elements.map((el) => {
+            if (!el) return null;
+            const button = findButton(el);
+            if (!button) return null;
+            return { el, label: button.getAttribute('aria-label'), before: textOf(el), final: null };
+        });
+        const pending = entries.filter(Boolean);
+
+        toggle(pending);
+        const settled = await waitForChange(pending);
+        pending.forEach((entry) => {
+            entry.after = textOf(entry.el);
+            entry.labelAfter = labelOf(entry);
+        });
+
+        // Reviews now showing the translation are toggled back to the original
+        const showsTranslation = (label) => !!label && seeOriginalPhrases.some(
+            (phrase) => label.toLowerCase().includes(phrase)
+        );
+        const restore = pending.filter((entry) => showsTranslation(entry.labelAfter));
+        toggle(restore);
+        const restored = await waitForChange(restore);
+        restore.forEach((entry) => { entry.final = textOf(entry.el); });
+
+        return {
+            settled: settled && restored,
+            reviews: entries.map((entry) => entry && {
+                label: entry.label,
+                before: entry.before,
+                after: entry.after,
+                label_after: entry.labelAfter,
+                final: entry.final,
+            }),
+        };
+    }
+'''
+
+# Scroll the reviews pane to the bottom and wait in the page until new review
+# nodes are attached, or the timeout expires. With nudge the pane is first
+# scrolled up a little, which re-triggers lazy loading that stalled.
+# Argument: {containerSelectors, timeout, nudge}
+# Returns {container, foundNew, elapsed, atBottom, scrollHeight}
+SCROLL_AND_WAIT = '''
+    async ({ containerSelectors, timeout, nudge }) => {
+        let container = null;
+        let containerSelector = null;
+        for (const selector of containerSelectors) {
+            container = document.querySelector(selector);
+            if (container) {
+                containerSelector = selector;
+                break;
+            }
+        }
+
+        const target = container || document.scrollingElement || document.body;
+        const root = container || document.body;
+        const itemSelector = root.querySelector('div[data-review-id]') ? 'div[data-review-id]' : 'div.jftiEf';
+        const hasUnclaimed = () => !!root.querySelector(itemSelector + ':not([data-sl-seen])');
+        const state = (foundNew, started) => ({
+            container: containerSelector,
+            foundNew: foundNew,
+            elapsed: started === null ? 0 : performance.now() - started,
+            atBottom: target.scrollTop + target.clientHeight >= target.scrollHeight - 2,
+            scrollHeight: target.scrollHeight,
+        });
+
+        if (nudge) {
+            target.scrollTop = Math.max(0, target.scrollHeight - target.clientHeight * 2);
+            await new Promise((resolve) => requestAnimationFrame(resolve));
+        }
+        target.scrollTop = target.scrollHeight;
+        const started = performance.now();
+
+        // Nodes may already be waiting from the previous step
+        if (hasUnclaimed()) return state(true, null);
+
+        return await new Promise((resolve) => {
+            let timer = null;
+            const observer = new MutationObserver((mutations) => {
+                const added = mutations.some((mutation) => Array.from(mutation.addedNodes).some(
+                    (node) => node.nodeType === 1 && (node.matches(itemSelector) || node.querySelector(itemSelector))
+                ));
+                if (!added) return;
+                observer.disconnect();
+                clearTimeout(timer);
+                // Keep the pane at the bottom so the next page starts loading
+                target.scrollTop = target.scrollHeight;
+                resolve(state(true, started));
+            });
+            observer.observe(root, { childList: true, subtree: true });
+            timer = setTimeout(() => {
+                observer.disconnect();
+                resolve(state(false, started));
+            }, timeout);
+        });
+    }
+'''
+
+# Condition for page.wait_for_function: no "More" button left inside a claimed batch
+# Argument: {batchId, moreSelector}
+BATCH_EXPANDED = '''
+    ({ batchId, moreSelector }) => !document.querySelector(
+        moreSelector.split(',').map((selector) => `[data-sl-seen="${batchId}"] ${selector.trim()}`).join(', ')
+    )
+'''
+
+# Fast-forward a resumed place past the reviews a checkpoint already holds.
+# Scrolls the pane until `target` known review nodes were seen (or nothing new
+# arrives for maxEmptyWaits waits) and marks them as claimed, so they are
+# neither expanded nor extracted again. Unknown nodes are left for the claim loop.
+# With untilId (the review of a resume cursor) every node up to and including
+# that review is skipped instead (marked "cursor"), and the scroll ends once it was seen.
+# Argument: {containerSelectors, skipIds, target, untilId, timeout, maxEmptyWaits}
+# Returns {container, skipped, scrolls, elapsed, untilFound}
+FAST_FORWARD_REVIEWS = '''
+    async ({ containerSelectors, skipIds, target, untilId, timeout, maxEmptyWaits }) => {
+        let container = null;
+        let containerSelector = null;
+        for (const selector of containerSelectors) {
+            container = document.querySelector(selector);
+            if (container) {
+                containerSelector = selector;
+                break;
+            }
+        }
+
+        const scroller = container || document.scrollingElement || document.body;
+        const root = container || document.body;
+        const known = new Set(skipIds);
+        const started = performance.now();
+        let skipped = 0;
+        let scrolls = 0;
+        let emptyWaits = 0;
+        let untilFound = false;
+
+        const markKnown = () => {
+            let marked = 0;
+            root.querySelectorAll('div[data-review-id]:not([data-sl-seen])').forEach((node) => {
+                const id = node.getAttribute('data-review-id');
+                if (known.has(id)) {
+                    node.setAttribute('data-sl-seen', 'resumed');
+                    marked += 1;
+                } else if (untilId && !untilFound) {
+                    node.setAttribute('data-sl-seen', 'cursor');
+                    marked += 1;
+                }
+                if (untilId && id === untilId) untilFound = true;
+            });
+            return marked;
+        };
+        const done = () => untilId ? untilFound : skipped >= target;
+
+        const waitForNodes = () => new Promise((resolve) => {
+            let timer = null;
+            const observer = new MutationObserver((mutations) => {
+                if (!mutations.some((mutation) => mutation.addedNodes.length)) return;
+                observer.disconnect();
+                clearTimeout(timer);
+                resolve(true);
+            });
+            observer.observe(root, { childList: true, subtree: true });
+            timer = setTimeout(() => {
+                observer.disconnect();
+                resolve(false);
+            }, timeout);
+        });
+
+        skipped += markKnown();
+        while (!done() && emptyWaits < maxEmptyWaits) {
+            scroller.scrollTop = scroller.scrollHeight;
+            scrolls += 1;
+            const grew = await waitForNodes();
+            skipped += markKnown();
+            emptyWaits = grew ? 0 : emptyWaits + 1;
+        }
+
+        return {
+            container: containerSelector,
+            skipped: skipped,
+            scrolls: scrolls,
+            elapsed: performance.now() - started,
+            untilFound: untilFound,
+        };
+    }
+'''
+
+# Keep a place page from opening new tabs or windows (profiles, images, ...)
+ANTI_POPUP = '''
+    () => {
+        // Override window.open to prevent popups
+        window.open = function() { return null; };
+
+        // Prevent all links from opening in new tabs
+        document.addEventListener('click', function(e) {
+            const target = e.target.closest('a');
+            if (target && (target.target === '_blank' || target.hasAttribute('target'))) {
+                e.preventDefault();
+                e.stopPropagation();
+            }
+        }, true);
+    }
+'''
+
+# Stop the reviews pane from navigating away when a scroll or click lands on
+# a profile picture, contributor link or photo button
+ANTI_CLICK_STYLE = '''
+    () => {
+        // Add CSS to disable clicks on profile pictures and images
+        const style = document.createElement('style');
+        style.textContent = `
+            img[role="img"],
+            a[href*="/contrib/"],
+            a[data-item-id*="authority"],
+            div[role="img"],
+            button[aria-label*="photo"],
+            button[aria-label*="Photo"] {
+                pointer-events: none !important;
+            }
+        `;
+        document.head.appendChild(style);
+    }
+'''
+
+# Read the place header and overview of a place page in one evaluate call.
+# The review count is the labelled "(1.234)" next to the overall rating; its
+# label is matched against the review count phrases of the page language.
+# Argument: {reviewCountPhrases}
+# Returns {name, rating, reviewCount, category, address, phone, website} (raw texts)
+PLACE_METADATA = '''
+    ({ reviewCountPhrases }) => {
+        const text = (node) => node ? (node.innerText || node.textContent || '').trim() || null : null;
+        const header = document.querySelector('div.F7nice');
+
+        let reviewCount = null;
+        if (header) {
+            for (const node of header.querySelectorAll('[aria-label]')) {
+                const label = node.getAttribute('aria-label');
+                const lower = label.toLowerCase();
+                if (/\\d/.test(label) && reviewCountPhrases.some((phrase) => lower.includes(phrase))) {
+                    reviewCount = label;
+                    break;
+                }
+            }
+            if (!reviewCount) {
+                const match = (header.textContent || '').match(/\\(([\\d.,\\s\\u00a0\\u202f]+)\\)/);
+                if (match) reviewCount = match[1];
+            }
+        }
+
+        const address = document.querySelector('button[data-item-id="address"]');
+        const phone = document.querySelector('button[data-item-id^="phone:tel:"]');
+        const website = document.querySelector('a[data-item-id="authority"]');
+
+        return {
+            name: text(document.querySelector('h1.DUwDvf')) || text(document.querySelector('h1')),
+            rating: header ? text(header.querySelector('span[aria-hidden="true"]')) : null,
+            reviewCount,
+            category: text(document.querySelector('button.DkEaL, button[jsaction*="category"]')),
+            address: address ? text(address.querySelector('.Io6YTe')) || text(address) : null,
+            phone: phone ? phone.getAttribute('data-item-id').slice('phone:tel:'.length) : null,
+            website: website ? website.getAttribute('href') : null,
+        };
+    }
+'''
+
+# Name of the binding the in-page agent pushes its messages to
+AGENT_BINDING = '__sentilokaPush'
+
+# In-page scraping agent. Owns the whole scroll loop: claims new review nodes,
+# expands and serializes them (EXTRACT_REVIEWS_BATCH, RESOLVE_TRANSLATIONS),
+# pushes each batch to Python through the exposed binding, then scrolls and
+# waits for the next nodes with the same adaptive policy as ScrollScheduler.
+# A push only resolves once Python has queued the batch, which throttles the
+# agent when Python falls behind. Setting window.__slAgentStop ends the loop.
+# Argument: {binding, containerSelectors, moreSelector, ratingSelectors,
+#            translationSelectors, seeOriginalPhrases, resolveTranslations,
+#            translationTimeout, minTimeout, maxTimeout, initialTimeout,
+#            endConfirmations, minEndPatience}  (times in ms)
+# Messages: {type: 'batch', reviews: [...]}, {type: 'done', reason, stats}
+REVIEWS_AGENT = '''
+    (config) => {
+        const extractBatch = ''' + EXTRACT_REVIEWS_BATCH + ''';
+        const resolveTranslations = ''' + RESOLVE_TRANSLATIONS + ''';
+        const reviewIdentity = ''' + REVIEW_IDENTITY + ''';
+
+        const push = window[config.binding];
+        const stats = {
+            batches: 0, reviews: 0, scrolls: 0, waits: 0, timeouts: 0, waitMs: 0, workMs: 0, container: null,
+        };
+        window.__slAgentStop = false;
+
+        const findContainer = () => {
+            for (const selector of config.containerSelectors) {
+                const element = document.querySelector(selector);
+                if (element) {
+                    stats.container = selector;
+                    return element;
+                }
+            }
+            return null;
+        };
+        const nextFrame = () => new Promise((resolve) => requestAnimationFrame(resolve));
+
+        const expand = (nodes) => {
+            const clicked = new Set();
+            nodes.forEach((node) => node.querySelectorAll(config.moreSelector).forEach((btn) => {
+                if (clicked.has(btn)) return;
+                clicked.add(btn);
+                try { btn.click(); } catch (e) {}
+            }));
+            return clicked.size;
+        };
+
+        const waitForNodes = (root, itemSelector, timeout) => new Promise((resolve) => {
+            let timer = null;
+            const observer = new MutationObserver((mutations) => {
+                const added = mutations.some((mutation) => Array.from(mutation.addedNodes).some(
+                    (node) => node.nodeType === 1 && (node.matches(itemSelector) || node.querySelector(itemSelector))
+                ));
+                if (!added) return;
+                observer.disconnect();
+                clearTimeout(timer);
+                resolve(true);
+            });
+            observer.observe(root, { childList: true, subtree: true });
+            timer = setTimeout(() => {
+                observer.disconnect();
+                resolve(false);
+            }, timeout);
+        });
+
+        const serialize = async (nodes) => {
+            const raws = extractBatch({
+                elements: nodes,
+                ratingSelectors: config.ratingSelectors,
+                translationSelectors: config.translationSelectors,
+            });
+
+            const translated = [];
+            raws.forEach((raw, index) => { if (raw && raw.translation) translated.push(index); });
+            if (translated.length && config.resolveTranslations) {
+                const result = await resolveTranslations({
+                    elements: translated.map((index) => nodes[index]),
+                    translationSelectors: config.translationSelectors,
+                    seeOriginalPhrases: config.seeOriginalPhrases,
+                    timeout: config.translationTimeout,
+                });
+                translated.forEach((index, i) => { raws[index].resolved = result.reviews[i]; });
+            }
+
+            raws.forEach((raw, index) => {
+                if (!raw) return;
+                raw.id = nodes[index].getAttribute('data-review-id');
+                // The identity is only needed as a fallback for nodes without an id
+                raw.identity = raw.id ? null : reviewIdentity(nodes[index]);
+            });
+            return raws.filter(Boolean);
+        };
+
+        const run = async () => {
+            let latency = null;
+            let emptyWaits = 0;
+            let emptyMs = 0;
+
+            while (!window.__slAgentStop) {
+                const workStarted = performance.now();
+                const container = findContainer();
+                const root = container || document.body;
+                const target = container || document.scrollingElement || document.body;
+                const itemSelector = root.querySelector('div[data-review-id]') ? 'div[data-review-id]' : 'div.jftiEf';
+
+                const nodes = Array.from(root.querySelectorAll(itemSelector + ':not([data-sl-seen])'));
+                if (nodes.length) {
+                    nodes.forEach((node) => node.setAttribute('data-sl-seen', 'agent'));
+                    if (expand(nodes)) await nextFrame();
+                    const reviews = await serialize(nodes);
+                    stats.batches += 1;
+                    stats.reviews += reviews.length;
+                    stats.workMs += performance.now() - workStarted;
+                    await push({ type: 'batch', reviews: reviews });
+                    emptyWaits = 0;
+                    emptyMs = 0;
+                } else {
+                    stats.workMs += performance.now() - workStarted;
+                }
+
+                // Scroll and wait for the next nodes
+                if (emptyWaits > 0) {
+                    // Nudge the pane to re-trigger lazy loading that stalled
+                    target.scrollTop = Math.max(0, target.scrollHeight - target.clientHeight * 2);
+                    await nextFrame();
+                }
+                target.scrollTop = target.scrollHeight;
+                stats.scrolls += 1;
+
+                const base = latency === null ? config.initialTimeout : latency * 3;
+                const timeout = Math.min(config.maxTimeout, Math.max(config.minTimeout, base) * 2 ** emptyWaits);
+                const waitStarted = performance.now();
+                const found = !!root.querySelector(itemSelector + ':not([data-sl-seen])')
+                    || await waitForNodes(root, itemSelector, timeout);
+                const elapsed = performance.now() - waitStarted;
+                stats.waits += 1;
+                stats.waitMs += elapsed;
+
+                if (found) {
+                    latency = latency === null ? elapsed : 0.3 * elapsed + 0.7 * latency;
+                    continue;
+                }
+
+                stats.timeouts += 1;
+                emptyWaits += 1;
+                emptyMs += elapsed;
+                const patience = Math.min(
+                    config.maxTimeout,
+                    Math.max(config.minEndPatience, latency === null ? 0 : latency * 12)
+                );
+                const atBottom = target.scrollTop + target.clientHeight >= target.scrollHeight - 2;
+                if (atBottom && emptyWaits >= config.endConfirmations && emptyMs >= patience) {
+                    return 'end_of_list';
+                }
+            }
+            return 'stopped';
+        };
+
+        run().then(
+            (reason) => push({ type: 'done', reason: reason, stats: stats }),
+            (error) => push({ type: 'done', reason: 'error', error: String(error), stats: stats })
+        ).catch(() => {});
+        return true;
+    }
+'''
@@ -4,10 +4,328 @@
 # See: https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 
 
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+from scrapy import signals
+from scrapy.exceptions import DropItem
+
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
 
+from scraper.dedup import review_id_key, review_identity, stable_digest, synthetic_review_id
+from scraper.items import GoogleMapsPlace
+from scraper.places import place_key
+from scraper.signals import place_finished
+
 
 class GooglemapsScraperPipeline:
     def process_item(self, item, spider):
         return item
+
+
+class PlaceMetadataPipeline:
+    """
+    Keeps the GoogleMapsPlace items of the spiders out of the review feed.
+
+    Consumers of the -o/-O feed expect one review per record, so place items
+    are written to MAPS_PLACE_OUTPUT (or -a place_output=<path>) as JSON
+    lines and then dropped. With MAPS_PLACE_ITEMS_IN_FEED they are passed on
+    to the feed instead.
+
+    Stats: places/items, places/written
+    """
+
+    def __init__(self, crawler):
+        self.crawler = crawler
+        self.file = None
+        self.in_feed = False
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        pipeline = cls(crawler)
+        crawler.signals.connect(pipeline.spider_closed, signal=signals.spider_closed)
+        return pipeline
+
+    def open_spider(self, spider):
+        settings = self.crawler.settings
+        self.in_feed = settings.getbool('MAPS_PLACE_ITEMS_IN_FEED', False)
+        path = getattr(spider, 'place_output', None) or settings.get('MAPS_PLACE_OUTPUT')
+        if path:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self.file = open(path, 'a', encoding='utf-8')
+            spider.logger.info(f"Writing place metadata to {path}")
+
+    def process_item(self, item, spider):
+        if not isinstance(item, GoogleMapsPlace):
+            return item
+
+        stats = self.crawler.stats
+        stats.inc_value('places/items')
+        if self.file is not None:
+            self.file.write(json.dumps(ItemAdapter(item).asdict(), ensure_ascii=False, default=str))
+            self.file.write('\n')
+            # One line per place, written right away so a crash keeps it
+            self.file.flush()
+            stats.inc_value('places/written')
+
+        if self.in_feed:
+            return item
+        raise DropItem(f"Place metadata of {item.get('name')} kept out of the review feed", log_level='DEBUG')
+
+    def spider_closed(self, spider, reason):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def signed_digest(value):
+    """stable_digest() folded into SQLite's signed 64-bit INTEGER range"""
+    digest = stable_digest(value)
+    return digest - 2 ** 64 if digest >= 2 ** 63 else digest
+
+
+class ReviewDeltaPipeline:
+    """
+    Tags every review as 'new', 'edited' or 'unchanged' against earlier runs.
+
+    Enabled with the MAPS_DELTA_STORE setting or -a delta_store=<path>. The
+    store is a SQLite file mapping (place, review key) to a 64-bit digest of
+    DELTA_FIELDS; the tag goes into the item's change_status field. With
+    MAPS_DELTA_SKIP_UNCHANGED or -a skip_unchanged=true unchanged reviews are
+    dropped, so neither the output nor downstream analysis sees them again.
+    The review key is the review id, or without one the synthetic id of its
+    author, rating and start of the text (dedup.synthetic_review_id), so
+    reviewers sharing a display name keep apart.
+
+    Stats: delta/new, delta/edited, delta/unchanged, delta/dropped
+    """
+
+    NEW = 'new'
+    EDITED = 'edited'
+    UNCHANGED = 'unchanged'
+
+    # Fields whose change makes a review 'edited'
+    DELTA_FIELDS = ('review_text', 'rating', 'translated_text', 'response_from_owner')
+
+    SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS fingerprints (
+        place_key TEXT NOT NULL,
+        review_key INTEGER NOT NULL,
+        content INTEGER NOT NULL,
+        PRIMARY KEY (place_key, review_key)
+    ) WITHOUT ROWID;
+    '''
+
+    def __init__(self, crawler):
+        self.crawler = crawler
+        self.connection = None
+        self.skip_unchanged = False
+        # {place_key: {review_key: content}} of the places being scraped
+        self.places = {}
+        self.pending = []
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        pipeline = cls(crawler)
+        crawler.signals.connect(pipeline.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(pipeline.place_finished, signal=place_finished)
+        return pipeline
+
+    def open_spider(self, spider):
+        settings = self.crawler.settings
+        path = getattr(spider, 'delta_store', None) or settings.get('MAPS_DELTA_STORE')
+        skip_unchanged = getattr(spider, 'skip_unchanged', None)
+        if skip_unchanged is None:
+            self.skip_unchanged = settings.getbool('MAPS_DELTA_SKIP_UNCHANGED', False)
+        else:
+            self.skip_unchanged = str(skip_unchanged).lower() in ('1', 'true', 'yes')
+        self.flush_every = max(1, settings.getint('MAPS_DELTA_FLUSH_EVERY', 500))
+
+        if path:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self.connection = sqlite3.connect(path)
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.executescript(self.SCHEMA)
+            mode = 'dropping' if self.skip_unchanged else 'tagging'
+            spider.logger.info(f"Delta output: {mode} unchanged reviews against {path}")
+
+    def place_fingerprints(self, key):
+        fingerprints = self.places.get(key)
+        if fingerprints is None:
+            fingerprints = self.places[key] = dict(self.connection.execute(
+                'SELECT review_key, content FROM fingerprints WHERE place_key = ?', (key,)
+            ))
+        return fingerprints
+
+    def content_fingerprint(self, adapter):
+        # Whitespace differences are not edits
+        values = [' '.join(str(adapter.get(field) or '').split()) for field in self.DELTA_FIELDS]
+        return signed_digest(json.dumps(values, ensure_ascii=False))
+
+    def process_item(self, item, spider):
+        if self.connection is None:
+            return item
+
+        adapter = ItemAdapter(item)
+        if not adapter.get('place_url'):
+            return item
+        place = place_key(adapter['place_url'])
+        review_id = adapter.get('review_id')
+        if not review_id:
+            fields = review_identity(adapter.get('reviewer_name'), adapter.get('rating'), adapter.get('review_text'))
+            if fields is None:
+                return item
+            review_id = synthetic_review_id(fields)
+        identity = review_id_key(review_id)
+        review = signed_digest(identity)
+        content = self.content_fingerprint(adapter)
+
+        fingerprints = self.place_fingerprints(place)
+        previous = fingerprints.get(review)
+        if previous is None:
+            status = self.NEW
+        elif previous != content:
+            status = self.EDITED
+        else:
+            status = self.UNCHANGED
+
+        stats = self.crawler.stats
+        stats.inc_value(f'delta/{status}')
+        if status != self.UNCHANGED:
+            fingerprints[review] = content
+            self.pending.append((place, review, content))
+            if len(self.pending) >= self.flush_every:
+                self.flush()
+
+        if status == self.UNCHANGED and self.skip_unchanged:
+            stats.inc_value('delta/dropped')
+            raise DropItem(f"Unchanged review {identity} of {place}", log_level='DEBUG')
+
+        adapter['change_status'] = status
+        return item
+
+    def flush(self):
+        if not self.pending:
+            return
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO fingerprints (place_key, review_key, content) VALUES (?, ?, ?)',
+                self.pending,
+            )
+        self.pending = []
+
+    def place_finished(self, place_url):
+        """Write the place's fingerprints and release them from memory"""
+        if self.connection is None or not place_url:
+            return
+        self.flush()
+        self.places.pop(place_key(place_url), None)
+
+    def spider_closed(self, spider, reason):
+        if self.connection is None:
+            return
+        self.flush()
+        self.connection.close()
+        self.connection = None
+
+
+class StreamingJsonLinesPipeline:
+    """
+    Streams items as newline-delimited JSON while the crawl is still running.
+
+    Enabled with the STREAM_OUTPUT setting or -a stream_output=<path>.
+    - Single file mode: every item is appended to <path> and the file is
+      flushed every STREAM_FLUSH_EVERY items.
+    - Chunked mode (STREAM_CHUNK_SIZE > 0): items go to <path>.00000.jsonl,
+      <path>.00001.jsonl, ... Each chunk is written as .part and renamed once
+      it holds STREAM_CHUNK_SIZE items, so a visible chunk is always complete.
+
+    The last line of the stream is an end-of-stream marker:
+        {"_type": "end_of_stream", "items": <n>, "chunks": <k>, "reason": "finished", ...}
+    Consumers can stop reading once they see it.
+    """
+
+    END_OF_STREAM = 'end_of_stream'
+
+    def __init__(self, crawler):
+        self.crawler = crawler
+        self.path = None
+        self.file = None
+        self.items_written = 0
+        self.chunk_items = 0
+        self.chunk_index = 0
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        pipeline = cls(crawler)
+        crawler.signals.connect(pipeline.spider_closed, signal=signals.spider_closed)
+        return pipeline
+
+    def open_spider(self, spider):
+        settings = self.crawler.settings
+        self.path = getattr(spider, 'stream_output', None) or settings.get('STREAM_OUTPUT')
+        self.flush_every = max(1, settings.getint('STREAM_FLUSH_EVERY', 50))
+        self.chunk_size = settings.getint('STREAM_CHUNK_SIZE', 0)
+
+        if self.path:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            self.open_file()
+            spider.logger.info(f"Streaming items to {self.current_path()}")
+
+    def current_path(self):
+        if self.chunk_size > 0:
+            return f"{self.path}.{self.chunk_index:05d}.jsonl"
+        return self.path
+
+    def open_file(self):
+        suffix = '.part' if self.chunk_size > 0 else ''
+        self.file = open(self.current_path() + suffix, 'w', encoding='utf-8')
+        self.chunk_items = 0
+
+    def rotate(self):
+        """Close the current chunk, publish it under its final name and start the next one"""
+        self.file.close()
+        os.replace(self.current_path() + '.part', self.current_path())
+        self.chunk_index += 1
+        self.open_file()
+
+    def write_line(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False, default=str))
+        self.file.write('\n')
+
+    def process_item(self, item, spider):
+        if self.file is None:
+            return item
+
+        self.write_line(ItemAdapter(item).asdict())
+        self.items_written += 1
+        self.chunk_items += 1
+
+        if self.chunk_size > 0 and self.chunk_items >= self.chunk_size:
+            self.rotate()
+        elif self.items_written % self.flush_every == 0:
+            self.file.flush()
+
+        return item
+
+    def spider_closed(self, spider, reason):
+        if self.file is None:
+            return
+
+        self.write_line({
+            '_type': self.END_OF_STREAM,
+            'items': self.items_written,
+            'chunks': self.chunk_index + 1 if self.chunk_size > 0 else 1,
+            'reason': reason,
+            'finished_at': datetime.now().isoformat(),
+        })
+        self.file.close()
+        if self.chunk_size > 0:
+            os.replace(self.current_path() + '.part', self.current_path())
+        self.file = None
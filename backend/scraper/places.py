@@ -0,0 +1,67 @@
+"""
+Place identity helpers shared by the Google Maps spiders.
+"""
+
+import re
+from urllib.parse import unquote_plus, urlparse
+
+
+# Feature id of a place, e.g. "0x2e69f3e945e34b9d:0x5371bf0fdad786a2"
+FEATURE_ID_RE = re.compile(r'(0x[0-9a-fA-F]+:0x[0-9a-fA-F]+)')
+
+# Places API id, carried by some place URLs (!19sChIJ..., query_place_id=ChIJ...)
+PLACE_ID_RE = re.compile(r'(ChIJ[0-9A-Za-z_-]{10,})')
+
+# Pin of the place (!3d<lat>!4d<lng>), else the map viewport centre (@<lat>,<lng>)
+PIN_COORDINATES_RE = re.compile(r'!3d(-?\d+(?:\.\d+)?)!4d(-?\d+(?:\.\d+)?)')
+VIEWPORT_COORDINATES_RE = re.compile(r'@(-?\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?)')
+
+# First number of a label, with locale thousands separators ("1.234", "1,234", "1 234")
+COUNT_RE = re.compile(r'\d[\d.,\s\u00a0\u202f]*')
+
+
+def extract_feature_id(text):
+    """Find a place feature id in a URL or HTML page"""
+    match = FEATURE_ID_RE.search(unquote_plus(text))
+    return match.group(1) if match else None
+
+
+def extract_place_id(text):
+    """Places API id of a place URL, else its feature id"""
+    match = PLACE_ID_RE.search(unquote_plus(text))
+    return match.group(1) if match else extract_feature_id(text)
+
+
+def extract_coordinates(url):
+    """(latitude, longitude) of a place URL, or (None, None)"""
+    match = PIN_COORDINATES_RE.search(url) or VIEWPORT_COORDINATES_RE.search(url)
+    if not match:
+        return None, None
+    return float(match.group(1)), float(match.group(2))
+
+
+def parse_count(text):
+    """Integer of a count label such as "(1,234)" or "1.234 ulasan", None without digits"""
+    match = COUNT_RE.search(text or '')
+    if not match:
+        return None
+    digits = re.sub(r'\D', '', match.group(0))
+    return int(digits) if digits else None
+
+
+def parse_decimal(text):
+    """Float of a decimal label such as "4,5" or "4.5", None without digits"""
+    match = re.search(r'\d+(?:[.,]\d+)?', text or '')
+    return float(match.group(0).replace(',', '.')) if match else None
+
+
+def place_key(url):
+    """
+    Stable key for a place: its feature id when the URL carries one,
+    otherwise the URL without query string and trailing slash.
+    """
+    feature_id = extract_feature_id(url)
+    if feature_id:
+        return feature_id
+    parsed = urlparse(url)
+    return f"{parsed.netloc}{parsed.path}".rstrip('/')
@@ -0,0 +1,102 @@
+"""
+Local stand-in for the Google Maps reviews RPC endpoint.
+
+Replays reviews pages recorded with the maps_reviews_http spider's record_dir
+argument, following the same continuation tokens as the real endpoint:
+
+    python -m scraper.replay_server recordings --port 8765
+    python -m scrapy crawl maps_reviews_http -a url=<place url> \\
+        -a endpoint=http://127.0.0.1:8765/maps/rpc/listugcposts
+
+The recording directory holds one sub directory per place feature id
+(':' replaced by '_') with numbered page files (0000.txt, 0001.txt, ...).
+"""
+
+import argparse
+import os
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from scraper.rpc import decode_reviews_payload
+
+
+def load_recordings(record_dir):
+    """
+    Index recorded pages as {feature_id: {page_token: body}}.
+    The first page of every place is stored under the empty token.
+    """
+    recordings = {}
+    for place_dir in sorted(os.listdir(record_dir)):
+        place_path = os.path.join(record_dir, place_dir)
+        if not os.path.isdir(place_path):
+            continue
+
+        pages = {}
+        page_token = ''
+        for page_file in sorted(os.listdir(place_path)):
+            with open(os.path.join(place_path, page_file), 'rb') as f:
+                body = f.read()
+            pages[page_token] = body
+            _, page_token = decode_reviews_payload(body)
+            if not page_token:
+                break
+
+        recordings[place_dir.replace('_', ':')] = pages
+    return recordings
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    recordings = {}
+    latency = 0.0
+
+    def do_GET(self):
+        pb = parse_qs(urlparse(self.path).query).get('pb', [''])[0]
+        feature_match = re.search(r'!1s([^!]+)', pb)
+        token_match = re.search(r'!2s([^!]*)', pb)
+
+        pages = self.recordings.get(feature_match.group(1) if feature_match else None, {})
+        body = pages.get(token_match.group(1) if token_match else '')
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if body is None:
+            self.send_error(404, 'No recorded page for this request')
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay recorded Google Maps reviews pages')
+    parser.add_argument('record_dir', help='Directory written by the record_dir spider argument')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='Artificial delay per response in seconds')
+    args = parser.parse_args()
+
+    ReplayHandler.recordings = load_recordings(args.record_dir)
+    ReplayHandler.latency = args.latency
+
+    server = ThreadingHTTPServer((args.host, args.port), ReplayHandler)
+    pages = sum(len(pages) for pages in ReplayHandler.recordings.values())
+    print(f"Replaying {pages} pages for {len(ReplayHandler.recordings)} places on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
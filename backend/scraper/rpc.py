@@ -0,0 +1,197 @@
+"""
+Decoders for the Google Maps reviews RPC responses.
+
+While the reviews pane scrolls, Google Maps fetches reviews page by page from
+an internal endpoint that returns nested JSON arrays prefixed with an XSSI
+guard. The positions of the fields inside those arrays are not documented, so
+every lookup goes through _dig() and a missing field simply yields None.
+"""
+
+import asyncio
+import json
+
+
+XSSI_PREFIX = ")]}'"
+
+# URL fragments of the paginated reviews endpoints
+REVIEWS_RPC_PATHS = (
+    '/maps/rpc/listugcposts',
+    '/maps/preview/review/listentitiesreviews',
+)
+
+# Field positions inside one listugcposts review entry
+UGC_PATHS = {
+    'review_id': (0,),
+    'reviewer_name': (1, 4, 5, 0),
+    'timestamp': (1, 2),
+    'relative_date': (1, 6),
+    'rating': (2, 0, 0),
+    'photos': (2, 2),
+    'language': (2, 14, 0),
+    'review_text': (2, 15, 0, 0),
+    'translated_text': (2, 15, 1, 0),
+    'owner_response': (3, 14, 0, 0),
+}
+
+# Field positions inside one legacy listentitiesreviews review entry
+LEGACY_PATHS = {
+    'review_id': (10,),
+    'reviewer_name': (0, 1),
+    'timestamp': (27,),
+    'relative_date': (1,),
+    'rating': (4,),
+    'photos': (14,),
+    'language': (32,),
+    'review_text': (3,),
+    'translated_text': None,
+    'owner_response': (9, 1),
+}
+
+
+def is_reviews_rpc(url):
+    """Check whether a response URL belongs to the paginated reviews endpoint"""
+    return any(path in url for path in REVIEWS_RPC_PATHS)
+
+
+def load_payload(body):
+    """Strip the XSSI guard and parse an RPC response body"""
+    if isinstance(body, bytes):
+        body = body.decode('utf-8', errors='replace')
+    body = body.lstrip()
+    if body.startswith(XSSI_PREFIX):
+        body = body[len(XSSI_PREFIX):]
+    return json.loads(body)
+
+
+def _dig(data, path):
+    """Follow a path of list indexes, returning None when any step is missing"""
+    if path is None:
+        return None
+    for index in path:
+        if not isinstance(data, list) or index >= len(data):
+            return None
+        data = data[index]
+    return data
+
+
+def _normalize_timestamp(value):
+    """Convert a microsecond/millisecond/second epoch to a millisecond string"""
+    if not isinstance(value, (int, float)) or value <= 0:
+        return None
+    value = int(value)
+    if value > 10 ** 14:
+        # Microseconds
+        value //= 1000
+    elif value < 10 ** 11:
+        # Seconds
+        value *= 1000
+    return str(value)
+
+
+def _decode_entry(entry, paths):
+    """Decode a single review entry using the given field positions"""
+    review_id = _dig(entry, paths['review_id'])
+    review_text = _dig(entry, paths['review_text'])
+    if not isinstance(review_id, str):
+        return None
+
+    rating = _dig(entry, paths['rating'])
+    photos = _dig(entry, paths['photos'])
+    translated_text = _dig(entry, paths['translated_text'])
+    relative_date = _dig(entry, paths['relative_date'])
+    owner_response = _dig(entry, paths['owner_response'])
+    language = _dig(entry, paths['language'])
+
+    return {
+        'review_id': review_id,
+        'reviewer_name': _dig(entry, paths['reviewer_name']),
+        'rating': float(rating) if isinstance(rating, (int, float)) else None,
+        'review_text': review_text if isinstance(review_text, str) else '',
+        'translated_text': translated_text if isinstance(translated_text, str) and translated_text != review_text else None,
+        'original_language': language if isinstance(language, str) else None,
+        'timestamp': _normalize_timestamp(_dig(entry, paths['timestamp'])),
+        'relative_date': relative_date if isinstance(relative_date, str) else None,
+        'response_from_owner': owner_response if isinstance(owner_response, str) else None,
+        'number_of_photos': len(photos) if isinstance(photos, list) else 0,
+    }
+
+
+def decode_reviews_payload(body, legacy=False):
+    """
+    Decode a reviews RPC response body.
+
+    Returns (reviews, next_page_token) where reviews is a list of plain dicts
+    with the keys of _decode_entry and next_page_token is None on the last page.
+    Pass legacy=True for listentitiesreviews responses.
+    """
+    payload = load_payload(body)
+    if not isinstance(payload, list):
+        return [], None
+
+    next_page_token = _dig(payload, (1,))
+    if not isinstance(next_page_token, str) or not next_page_token:
+        next_page_token = None
+
+    entries = _dig(payload, (2,)) or []
+    reviews = []
+    for entry in entries:
+        if legacy:
+            review = _decode_entry(entry, LEGACY_PATHS)
+        else:
+            # listugcposts wraps every review in a one-element list
+            review = _decode_entry(_dig(entry, (0,)), UGC_PATHS)
+        if review:
+            reviews.append(review)
+
+    return reviews, next_page_token
+
+
+class ReviewsResponseCollector:
+    """
+    Collects decoded reviews from the reviews RPC responses of a page.
+
+    Attach with page.on('response', collector.on_response); decoded reviews
+    are buffered until the scroll loop drains them.
+    """
+
+    def __init__(self, logger):
+        self.logger = logger
+        self.pending = []
+        self.new_reviews = asyncio.Event()
+        self.responses_seen = 0
+        self.decode_errors = 0
+        self.exhausted = False
+
+    async def on_response(self, response):
+        if not is_reviews_rpc(response.url):
+            return
+
+        self.responses_seen += 1
+        try:
+            reviews, next_page_token = decode_reviews_payload(
+                await response.body(),
+                legacy=REVIEWS_RPC_PATHS[1] in response.url,
+            )
+        except Exception as e:
+            self.decode_errors += 1
+            self.logger.debug(f"Could not decode reviews response {response.url}: {e}")
+            return
+
+        self.exhausted = next_page_token is None
+        if reviews:
+            self.pending.extend(reviews)
+            self.new_reviews.set()
+
+    def drain(self):
+        """Return all reviews decoded since the last call"""
+        reviews, self.pending = self.pending, []
+        self.new_reviews.clear()
+        return reviews
+
+    async def wait_for_reviews(self, timeout):
+        """Wait until decoded reviews are buffered, or the timeout expires"""
+        try:
+            await asyncio.wait_for(self.new_reviews.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
@@ -0,0 +1,203 @@
+"""
+Adaptive wait policy for the reviews scroll loop.
+
+Instead of sleeping a fixed time after every scroll, the spider waits in the
+page until new review nodes are attached (SCROLL_AND_WAIT) with a timeout
+derived from how long reviews have been taking to arrive. Empty waits back
+off exponentially; the end of the list is only accepted after several empty
+waits at the bottom of the pane that together lasted at least the end
+patience, which also grows with the observed latency.
+
+When the place header showed a review count, ReviewProgress tracks how much
+of it was loaded: the loop stops as soon as every review is in, accepts the
+end after a single empty wait once the count is within tolerance, and the
+progress logs carry a completion percentage and an ETA.
+"""
+
+import time
+
+from scraper.dedup import stable_digest
+
+
+class ScrollScheduler:
+    """
+    Latency-aware timeouts and end-of-list confirmation for one place.
+
+    Stats (when finished with a stats collector):
+        scroll/waits, scroll/wait_timeouts, scroll/wait_seconds, scroll/work_seconds
+    """
+
+    def __init__(self, min_timeout=0.25, max_timeout=8.0, initial_timeout=1.0, latency_factor=3.0,
+                 end_confirmations=3, min_end_patience=2.0, smoothing=0.3):
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.initial_timeout = initial_timeout
+        self.latency_factor = latency_factor
+        self.end_confirmations = end_confirmations
+        self.min_end_patience = min_end_patience
+        self.smoothing = smoothing
+
+        # Exponentially weighted average of the time new reviews took to appear
+        self.latency = None
+        self.backoff = 1
+        self.empty_waits = 0
+        self.empty_wait_seconds = 0.0
+
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.work_seconds = 0.0
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(
+            min_timeout=settings.getfloat('MAPS_SCROLL_MIN_TIMEOUT', 0.25),
+            max_timeout=settings.getfloat('MAPS_SCROLL_MAX_TIMEOUT', 8.0),
+            end_confirmations=settings.getint('MAPS_SCROLL_END_CONFIRMATIONS', 3),
+            min_end_patience=settings.getfloat('MAPS_SCROLL_MIN_END_PATIENCE', 2.0),
+        )
+
+    @property
+    def timeout(self):
+        """Seconds to wait for new reviews after the next scroll"""
+        base = self.latency * self.latency_factor if self.latency is not None else self.initial_timeout
+        return min(self.max_timeout, max(self.min_timeout, base) * self.backoff)
+
+    @property
+    def end_patience(self):
+        """Total empty waiting needed before the end of the list is accepted"""
+        base = self.latency * self.latency_factor * 4 if self.latency is not None else self.min_end_patience
+        return min(self.max_timeout, max(self.min_end_patience, base))
+
+    @property
+    def nudge(self):
+        """Whether the next scroll should jiggle the pane to re-trigger lazy loading"""
+        return self.empty_waits > 0
+
+    def record_wait(self, elapsed, found_new):
+        """Record one in-page wait; elapsed is in seconds"""
+        self.waits += 1
+        self.wait_seconds += elapsed
+
+        if found_new:
+            self.latency = elapsed if self.latency is None else \
+                self.smoothing * elapsed + (1 - self.smoothing) * self.latency
+            self.record_progress()
+        else:
+            self.timeouts += 1
+            self.empty_waits += 1
+            self.empty_wait_seconds += elapsed
+            self.backoff = min(self.backoff * 2, 64)
+
+    def record_progress(self):
+        """New reviews were claimed, the end of the list is not near"""
+        self.backoff = 1
+        self.empty_waits = 0
+        self.empty_wait_seconds = 0.0
+
+    def record_work(self, elapsed):
+        self.work_seconds += elapsed
+
+    def end_confirmed(self, at_bottom, progress=None):
+        if at_bottom and self.empty_waits and progress is not None and progress.within_tolerance:
+            # Nearly every review the place header counts is in, no need for the full patience
+            return True
+        return (
+            at_bottom
+            and self.empty_waits >= self.end_confirmations
+            and self.empty_wait_seconds >= self.end_patience
+        )
+
+    def summary(self):
+        latency = f"{self.latency * 1000:.0f} ms" if self.latency is not None else 'n/a'
+        return (
+            f"waited {self.wait_seconds:.2f}s in {self.waits} waits ({self.timeouts} timed out), "
+            f"worked {self.work_seconds:.2f}s, review latency {latency}"
+        )
+
+    def finish(self, stats):
+        stats.inc_value('scroll/waits', self.waits)
+        stats.inc_value('scroll/wait_timeouts', self.timeouts)
+        stats.inc_value('scroll/wait_seconds', round(self.wait_seconds, 3))
+        stats.inc_value('scroll/work_seconds', round(self.work_seconds, 3))
+
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    if minutes:
+        return f"{minutes}m{seconds:02d}s"
+    return f"{seconds}s"
+
+
+class ReviewProgress:
+    """
+    Loaded reviews of one place against the total_reviews of its header.
+
+    loaded counts distinct review ids of loaded nodes (also those without
+    text, which are not emitted), so it can reach the total: nested nodes
+    repeat their parent's id, and pages of the same place sorted differently
+    (scraper/shards.py) load the same reviews. tolerance is the fraction of
+    the total Google may count but never list (removed or filtered reviews).
+    """
+
+    def __init__(self, total_reviews, tolerance=0.02, loaded=0):
+        self.total_reviews = total_reviews if total_reviews and total_reviews > 0 else None
+        self.tolerance = tolerance
+        self.loaded = loaded
+        # 64-bit digests of the review ids seen on any page
+        self.review_digests = set()
+        # Reviews present at the start (a resumed checkpoint) do not count towards the rate
+        self.initial = loaded
+        self.started = time.monotonic()
+
+    def update(self, loaded):
+        self.loaded = max(self.loaded, loaded)
+
+    def add(self, count):
+        self.loaded += count
+
+    def add_reviews(self, review_ids):
+        """Count loaded reviews by id, skipping ids already counted"""
+        before = len(self.review_digests)
+        self.review_digests.update(stable_digest(str(review_id)) for review_id in review_ids)
+        self.add(len(self.review_digests) - before)
+
+    def covers(self, count):
+        """Whether count reviews are all the reviews the header reports"""
+        return self.total_reviews is not None and count >= self.total_reviews
+
+    @property
+    def complete(self):
+        return self.covers(self.loaded)
+
+    @property
+    def within_tolerance(self):
+        return self.total_reviews is not None and self.loaded >= self.total_reviews * (1 - self.tolerance)
+
+    @property
+    def percent(self):
+        if self.total_reviews is None:
+            return None
+        return min(100.0, 100.0 * self.loaded / self.total_reviews)
+
+    @property
+    def eta_seconds(self):
+        """Seconds until the total is loaded at the rate so far, None when unknown"""
+        if self.total_reviews is None:
+            return None
+        remaining = self.total_reviews - self.loaded
+        if remaining <= 0:
+            return 0.0
+        rate = (self.loaded - self.initial) / max(time.monotonic() - self.started, 1e-6)
+        return remaining / rate if rate > 0 else None
+
+    def describe(self):
+        """Log suffix such as "(42.0% of 1234, ETA 1m05s)", empty without a total"""
+        if self.total_reviews is None:
+            return ''
+        eta = self.eta_seconds
+        eta_text = format_duration(eta) if eta is not None else 'unknown'
+        return f" ({self.percent:.1f}% of {self.total_reviews}, ETA {eta_text})"
@@ -0,0 +1,137 @@
+"""
+Learned selectors that survive between crawls.
+
+The spiders probe several candidate selectors for some page roles (the
+reviews tab button, the scrollable reviews pane). The winner of each role is
+stored on disk per locale and layout fingerprint, so the next crawl tries it
+first. A cached selector that misses MAPS_SELECTOR_CACHE_MAX_MISSES times in
+a row is dropped and learned again. A new Google Maps layout gets a new
+fingerprint, and therefore its own entry.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+
+from scrapy import signals
+
+from scraper.state import write_json_atomic
+
+
+# Structural probes of a place page, evaluated before any interaction. The
+# pattern of present/absent probes is the layout fingerprint.
+LAYOUT_PROBES = [
+    'div[role="main"]',
+    'div[role="tablist"]',
+    'button[role="tab"]',
+    'div.m6QErb',
+    'h1.DUwDvf',
+    'div.F7nice',
+    'button[data-item-id="address"]',
+    'button[jsaction*="pane.rating"]',
+    'button[jsaction*="pane.reviewChart"]',
+]
+
+# Returns one '1'/'0' character per probe selector
+LAYOUT_FINGERPRINT = '''
+    (probes) => probes.map((selector) => document.querySelector(selector) ? '1' : '0').join('')
+'''
+
+
+def layout_fingerprint(probe_bits):
+    """Short, stable id of a probe pattern (changes whenever LAYOUT_PROBES changes)"""
+    digest = hashlib.blake2b(digest_size=6)
+    digest.update(json.dumps([LAYOUT_PROBES, probe_bits]).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class LearnedSelectorCache:
+    """
+    JSON file of {"<locale>|<fingerprint>": {role: {selector, hits, misses, ...}}}.
+
+    Stats:
+        selectors/hits, selectors/hits/<role>
+        selectors/misses, selectors/misses/<role>
+        selectors/learned/<role>, selectors/invalidated/<role>
+        selectors/latency_ms/<role>, selectors/latency_ms_max/<role>
+    """
+
+    def __init__(self, path, crawler, max_misses=3):
+        self.path = path
+        self.crawler = crawler
+        self.max_misses = max_misses
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except ValueError:
+                # A corrupt cache only costs one round of probing
+                self.entries = {}
+        self.dirty = False
+
+    @classmethod
+    def from_crawler(cls, crawler, path):
+        cache = cls(path, crawler, max_misses=crawler.settings.getint('MAPS_SELECTOR_CACHE_MAX_MISSES', 3))
+        crawler.signals.connect(cache.spider_closed, signal=signals.spider_closed)
+        return cache
+
+    @staticmethod
+    def scope_key(locale, fingerprint):
+        return f"{locale or 'default'}|{fingerprint or 'unknown'}"
+
+    def get(self, scope, role):
+        """Cached selector of a role, or None"""
+        entry = self.entries.get(scope, {}).get(role)
+        return entry['selector'] if entry else None
+
+    def hit(self, scope, role, latency=None):
+        """The cached selector of a role worked"""
+        entry = self.entries[scope][role]
+        entry['hits'] = entry.get('hits', 0) + 1
+        entry['misses'] = 0
+        self.dirty = True
+        self.record(role, 'hits', latency)
+
+    def miss(self, scope, role, latency=None):
+        """The cached selector of a role did not match; drop it after max_misses in a row"""
+        self.record(role, 'misses', latency)
+        entry = self.entries.get(scope, {}).get(role)
+        if not entry:
+            return
+        entry['misses'] = entry.get('misses', 0) + 1
+        self.dirty = True
+        if entry['misses'] >= self.max_misses:
+            del self.entries[scope][role]
+            self.crawler.stats.inc_value(f'selectors/invalidated/{role}')
+            self.save()
+
+    def learn(self, scope, role, selector):
+        """Remember the selector that won the probe of a role"""
+        if self.get(scope, role) == selector:
+            return
+        self.entries.setdefault(scope, {})[role] = {
+            'selector': selector,
+            'hits': 0,
+            'misses': 0,
+            'learned_at': datetime.now().isoformat(),
+        }
+        self.crawler.stats.inc_value(f'selectors/learned/{role}')
+        self.save()
+
+    def record(self, role, outcome, latency=None):
+        stats = self.crawler.stats
+        stats.inc_value(f'selectors/{outcome}')
+        stats.inc_value(f'selectors/{outcome}/{role}')
+        if latency is not None:
+            stats.inc_value(f'selectors/latency_ms/{role}', round(latency * 1000))
+            stats.max_value(f'selectors/latency_ms_max/{role}', round(latency * 1000))
+
+    def save(self):
+        write_json_atomic(self.path, self.entries)
+        self.dirty = False
+
+    def spider_closed(self, spider):
+        if self.dirty:
+            self.save()
@@ -55,7 +55,10 @@ EXTENSIONS = {
 
 # Configure item pipelines
 ITEM_PIPELINES = {
+    'scraper.pipelines.PlaceMetadataPipeline': 200,
     'scraper.pipelines.GooglemapsScraperPipeline': 300,
+    'scraper.pipelines.ReviewDeltaPipeline': 800,
+    'scraper.pipelines.StreamingJsonLinesPipeline': 900,
 }
 
 # Enable and configure the AutoThrottle extension (disabled by default)
@@ -154,6 +157,13 @@ FEED_EXPORTERS = {
     'xml': 'scrapy.exporters.XmlItemExporter',
 }
 
+# Streaming JSON Lines output (StreamingJsonLinesPipeline)
+# Items are written while the crawl runs and the stream ends with an
+# {"_type": "end_of_stream", ...} marker line. Also: -a stream_output=<path>
+STREAM_OUTPUT = None  # e.g. 'temp/reviews.jsonl'
+STREAM_FLUSH_EVERY = 50  # Flush to disk every N items
+STREAM_CHUNK_SIZE = 0  # > 0: rotate to <path>.00000.jsonl, .00001.jsonl, ... every N items
+
 # CSV specific settings
 FEED_EXPORT_FIELDS = [
     'place_name',
@@ -162,7 +172,11 @@ FEED_EXPORT_FIELDS = [
     'rating',
     'review_text',
     'review_date',
+    'response_from_owner',
+    'number_of_photos',
     'scraped_at',
+    'review_id',
+    'change_status',
 ]
 
 # ============================================
@@ -175,6 +189,107 @@ FEED_EXPORT_FIELDS = [
 MAX_SCROLL_COUNT = 999999  # Effectively unlimited - will scroll until no more reviews
 SCROLL_DELAY = 1.5  # seconds
 
+# Adaptive scroll waits (maps_reviews spider, see scraper/scrolling.py)
+# After each scroll the spider waits in the page for new review nodes; the
+# timeout follows the observed review latency and backs off while nothing arrives.
+MAPS_SCROLL_MIN_TIMEOUT = 0.25  # seconds
+MAPS_SCROLL_MAX_TIMEOUT = 8.0  # seconds
+MAPS_SCROLL_END_CONFIRMATIONS = 3  # Empty waits at the bottom before the list is considered complete
+MAPS_SCROLL_MIN_END_PATIENCE = 2.0  # Minimum total empty waiting (seconds) before ending
+# Scrolling stops once the review count of the place header is loaded; within
+# this fraction of it a single empty wait at the bottom ends the list
+MAPS_TOTAL_REVIEWS_TOLERANCE = 0.02
+
+# Browserless maps_reviews_http spider: empty reviews pages that still carry a
+# next page token are followed, up to this many in a row
+MAPS_HTTP_MAX_EMPTY_PAGES = 3
+
+# Per-place bounds (see scraper/bounds.py). A place stopped by a bound ends with
+# partial results and a resume cursor (logged, in the worker's end-of-stream
+# marker and in MAPS_STATE_FILE). Also: -a max_reviews=N -a since=YYYY-MM-DD
+# -a deadline_seconds=S, continue with -a cursor=<token>
+MAPS_PLACE_DEADLINE_SECONDS = None  # e.g. 300; None = no deadline
+
+# Multi-sort sharding (maps_reviews spider, see scraper/shards.py)
+# Very large places can be scrolled on several pages at once, one per extra
+# sort order next to the newest-first page, sharing one dedup key space. Every
+# page stops once the union reaches the review count of the place header. A
+# listed sort equal to the main page's (relevant if sorting by newest failed)
+# is skipped.
+# Each shard is one more page in the place's browser context, so memory grows
+# with it. Watermarks and since stop scrolling only without shards.
+# Also: -a sort_shards=highest,lowest,relevant (or 'all')
+MAPS_SORT_SHARDS = None  # e.g. ['highest', 'lowest']; None = one page per place
+MAPS_SORT_SHARD_QUEUE_SIZE = 4  # Reviews buffered per shard before its page waits
+
+# In-page agent (-a extraction_source=agent)
+MAPS_AGENT_QUEUE_SIZE = 4  # Review batches buffered before the agent pauses
+MAPS_AGENT_IDLE_TIMEOUT = 60  # Give up when the agent sends nothing for this many seconds
+
+# Learned selectors (maps_reviews spider, see scraper/selector_cache.py)
+# Winning selectors per locale and page layout are kept between crawls.
+# Relative paths live in the project's .scrapy directory; 'off' disables it.
+# Override per run with -a selector_cache=<path>
+MAPS_SELECTOR_CACHE_FILE = 'maps_selectors.json'
+MAPS_SELECTOR_CACHE_MAX_MISSES = 3  # Consecutive misses before a cached selector is dropped
+
+# Phase metrics (see scraper/metrics.py)
+# Per-phase timings always go into the Scrapy stats (phases/<name>/...);
+# set these paths to also export them when the spider closes.
+MAPS_METRICS_PROMETHEUS_FILE = None  # e.g. 'metrics/maps_scraper.prom' (node_exporter textfile collector)
+MAPS_METRICS_JSON_FILE = None  # e.g. 'metrics/maps_scraper.json'
+
+# Concurrent places (maps_reviews spider)
+# Each in-flight place holds one slot of a bounded browser context pool.
+# Override per run with -a max_concurrent_places=N -a max_pages_per_context=M
+MAPS_MAX_CONCURRENT_PLACES = 1  # Places scraped at the same time in one process
+MAPS_MAX_PAGES_PER_CONTEXT = 1  # 1 = every place gets its own isolated context
+
+# Request interception (maps_reviews spider)
+# Aborts images, media, fonts, map tiles and telemetry the scraper never reads.
+# Profiles: 'default', 'off' - override per run with -a block_resources=off
+MAPS_BLOCK_PROFILE = 'default'
+# Uncomment to override what the profile blocks
+# MAPS_BLOCK_RESOURCE_TYPES = ['image', 'media', 'font']
+# MAPS_BLOCK_URL_PATTERNS = {'tile': r'/maps/vt[/?]', 'telemetry': r'/gen_204'}
+# MAPS_BLOCKED_BYTES_ESTIMATE = {'image': 20000}  # Bytes counted per blocked request
+
+# Incremental scraping (maps_reviews spider)
+# With a state file, every place remembers its newest review (watermark) and
+# the next run stops scrolling once it reaches it. Also: -a state_file=...,
+# -a watermark_id=... / -a watermark_date=YYYY-MM-DD
+MAPS_STATE_FILE = None  # e.g. 'scraper_state.json'
+MAPS_WATERMARK_DATE_SLACK_DAYS = 7  # Relative dates are approximate
+
+# Review deduplication (see scraper/dedup.py)
+# 'exact' keeps every key as a 64-bit digest; 'bloom' uses a fixed-size Bloom
+# filter per place for very large places. Also: -a dedup=bloom
+MAPS_DEDUP_MODE = 'exact'
+MAPS_DEDUP_BLOOM_CAPACITY = 100000  # Keys per place before the error rate is exceeded
+MAPS_DEDUP_BLOOM_ERROR_RATE = 0.001
+
+# Delta output (see ReviewDeltaPipeline in scraper/pipelines.py)
+# Tags reviews as new/edited/unchanged against the fingerprints of earlier
+# runs in a SQLite file; optionally drops the unchanged ones.
+# Also: -a delta_store=<path> -a skip_unchanged=true
+MAPS_DELTA_STORE = None  # e.g. 'review_fingerprints.sqlite3'
+MAPS_DELTA_SKIP_UNCHANGED = False
+MAPS_DELTA_FLUSH_EVERY = 500  # Fingerprints buffered between writes
+
+# Crash-resume checkpoints (maps_reviews spider, see scraper/checkpoint.py)
+# Emitted review keys are stored per place in a SQLite file; a rerun with the
+# same file skips completed places and fast-scrolls past emitted reviews.
+# Also: -a checkpoint=<path>. The file is removed once every place completed.
+MAPS_CHECKPOINT_FILE = None  # e.g. 'scraper_checkpoint.sqlite3'
+MAPS_CHECKPOINT_EVERY = 50  # Reviews between checkpoint writes
+
+# Place metadata (see PlaceMetadataPipeline in scraper/pipelines.py)
+# One GoogleMapsPlace item per place (rating, review count, category, address,
+# coordinates) is written here as JSON lines and kept out of the review feed.
+# Also: -a place_output=<path>
+MAPS_PLACE_OUTPUT = None  # e.g. 'places.jsonl'
+MAPS_PLACE_ITEMS_IN_FEED = False  # True: pass place items on to the -o/-O feed as well
+
 # ============================================
 # SCRAPY CLOUD SETTINGS
 # ============================================
@@ -0,0 +1,106 @@
+"""
+Multi-sort sharding of one place over several pages.
+
+A single reviews pane is scrolled serially. With -a sort_shards=highest,lowest
+(or MAPS_SORT_SHARDS) the maps_reviews spider opens one extra page of the place
+per listed sort order next to its own page and scrolls them all at the same
+time; a listed sort equal to the sort the own page ended up with is dropped. Every sort order lists the same reviews, but starts at a
+different end, so the union of the pages grows faster than one page does.
+The pages share the place's deduplicator and its ReviewProgress, which counts
+distinct review ids across pages; every page stops once the union reaches the
+review count of the place header, or when one page reaches the end of its list.
+"""
+
+import asyncio
+
+
+# Index of each option in the sort menu of the reviews pane
+SORT_OPTION_INDEX = {
+    'relevant': 0,
+    'newest': 1,
+    'highest': 2,
+    'lowest': 3,
+}
+
+
+def parse_sort_shards(value):
+    """
+    Sort orders of a sort_shards argument, in order and without repeats.
+    'all' means every sort order; empty means no sharding.
+    """
+    if not value:
+        return ()
+    if isinstance(value, str):
+        value = [part.strip() for part in value.split(',') if part.strip()]
+    if list(value) == ['all']:
+        value = list(SORT_OPTION_INDEX)
+
+    sorts = []
+    for sort in value:
+        if sort not in SORT_OPTION_INDEX:
+            raise ValueError(f"sort_shards must be 'all' or a list of {tuple(SORT_OPTION_INDEX)}, got '{sort}'")
+        if sort not in sorts:
+            sorts.append(sort)
+    return tuple(sorts)
+
+
+def extra_sort_shards(sorts, primary_sort):
+    """
+    Sort orders that need a page next to the main page of a place, whose
+    actual sort is primary_sort ('relevant' when changing it failed)
+    """
+    return tuple(sort for sort in sorts if sort != primary_sort)
+
+
+class ShardEnd:
+    """Marker a shard stream puts in the merge queue when it ends"""
+
+    def __init__(self, sort, error=None):
+        self.sort = sort
+        self.error = error
+
+
+async def merge_shard_streams(streams, logger, queue_size=4):
+    """
+    Interleave the review streams of (sort, stream) pairs as they produce.
+
+    Reviews are tagged with the sort of their stream in '_shard'. Ends when
+    the first stream ends, since every sort order lists every review; a
+    stream that fails is logged and the others go on. Closing the merged
+    stream cancels the remaining shards.
+    """
+    queue = asyncio.Queue(maxsize=queue_size * len(streams))
+
+    async def pump(sort, stream):
+        try:
+            async for review_data in stream:
+                if review_data:
+                    review_data['_shard'] = sort
+                await queue.put(review_data)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await queue.put(ShardEnd(sort, e))
+        else:
+            await queue.put(ShardEnd(sort))
+
+    tasks = [asyncio.ensure_future(pump(sort, stream)) for sort, stream in streams]
+    running = len(tasks)
+    try:
+        while running:
+            entry = await queue.get()
+            if not isinstance(entry, ShardEnd):
+                yield entry
+                continue
+            running -= 1
+            if entry.error is not None:
+                logger.warning(f"Sort shard '{entry.sort}' failed, continuing with the others: {entry.error}")
+                continue
+            logger.info(f"Sort shard '{entry.sort}' finished, stopping all shards")
+            break
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for _, stream in streams:
+            await stream.aclose()
@@ -0,0 +1,10 @@
+"""
+Custom signals sent by the Google Maps spiders.
+
+Connect with crawler.signals.connect(handler, signal=place_finished).
+"""
+
+# Sent when a place has been scraped (or has failed) and its page was released.
+# Arguments: request, place_url, reviews_scraped, failure (None on success),
+# cursor (resume token when a bound stopped the place early, else None)
+place_finished = object()
@@ -0,0 +1,313 @@
+"""
+Browserless Google Maps Review Spider
+Pages through the reviews RPC endpoint with plain Scrapy requests
+"""
+
+import os
+import re
+import secrets
+from urllib.parse import parse_qs, unquote_plus, urlencode, urlparse
+
+import scrapy
+from twisted.python.failure import Failure
+
+from scraper.dedup import review_id_key
+from scraper.places import extract_feature_id
+from scraper.rpc import decode_reviews_payload
+from scraper.signals import place_finished
+from scraper.src.spiders.maps_reviews_spiders import MapsReviewsSpider
+
+
+REVIEWS_ENDPOINT = 'https://www.google.com/maps/rpc/listugcposts'
+
+# Protobuf-style query for one page of reviews. Can be overridden with the
+# MAPS_REVIEWS_RPC_PB setting if Google changes the request layout.
+REVIEWS_RPC_PB = (
+    '!1m6!1s{feature_id}!6m4!4m1!1e1!4m1!1e3!2m2!1i{page_size}!2s{page_token}'
+    '!5m2!1s{session_id}!7e81!8m9!2b1!3b1!5b1!7b1!12m4!1b1!2b1!4m1!1e1'
+    '!11m4!1e3!2e1!6m1!1i2!13m1!1e{sort}'
+)
+
+# Request meta carried from one reviews page to the next
+PLACE_META_KEYS = ('place_url', 'place_name', 'hl', 'session_id')
+
+# Sort order values understood by the reviews endpoint
+SORT_ORDERS = {
+    'relevant': 1,
+    'newest': 2,
+    'highest': 3,
+    'lowest': 4,
+}
+
+
+class MapsReviewsHttpSpider(MapsReviewsSpider):
+    """
+    Fetches reviews without a browser by following the continuation tokens of
+    the reviews RPC endpoint. Produces the same review dicts as maps_reviews.
+
+    Short links and search URLs need one plain HTML fetch to resolve the
+    place's feature id; full place URLs go straight to the reviews endpoint.
+    """
+
+    name = 'maps_reviews_http'
+
+    custom_settings = {
+        'CONCURRENT_REQUESTS': 8,
+        'CONCURRENT_REQUESTS_PER_DOMAIN': 4,
+        'CONCURRENT_REQUESTS_PER_IP': 0,
+        # Plain Twisted HTTP handlers - no browser, no Playwright download handler
+        'DOWNLOAD_HANDLERS': {
+            'http': 'scrapy.core.downloader.handlers.http11.HTTP11DownloadHandler',
+            'https': 'scrapy.core.downloader.handlers.http11.HTTP11DownloadHandler',
+        },
+    }
+
+    def __init__(self, url=None, urls_file=None, max_reviews=None, endpoint=None, sort='newest',
+                 page_size=20, record_dir=None, *args, **kwargs):
+        super(MapsReviewsHttpSpider, self).__init__(url=url, urls_file=urls_file, max_reviews=max_reviews, *args, **kwargs)
+
+        if sort not in SORT_ORDERS:
+            raise ValueError(f"sort must be one of {tuple(SORT_ORDERS)}, got '{sort}'")
+        self.sort = sort
+        self.page_size = int(page_size)
+
+        # Point at a local stand-in server (see scraper/replay_server.py) for offline runs
+        self.endpoint = endpoint or REVIEWS_ENDPOINT
+        endpoint_host = urlparse(self.endpoint).hostname
+        if endpoint_host and endpoint_host not in self.allowed_domains:
+            self.allowed_domains = self.allowed_domains + [endpoint_host]
+
+        # Save raw response bodies so they can be replayed later
+        self.record_dir = record_dir
+
+        # Deduplication keys, bounds and emitted reviews per place
+        self.seen_reviews = {}
+        self.bounds = {}
+        self.place_reviews = {}
+        self.reviews_scraped = 0
+
+    def configure_context_pool(self, settings):
+        """No browser contexts - concurrency comes from custom_settings"""
+        pass
+
+    async def start(self):
+        """Generate the first reviews page request for every URL"""
+        for url in self.urls:
+            meta = {
+                'place_url': url,
+                'place_name': self.place_name_from_url(url),
+                'hl': parse_qs(urlparse(url).query).get('hl', ['id'])[0],
+            }
+
+            feature_id = extract_feature_id(url)
+            cursor = self.place_cursor(url)
+            if feature_id and cursor and 'page_token' in cursor:
+                # Continue from the reviews page the cursor's run stopped on
+                self.logger.info(f"Resuming {url} at reviews page {cursor.get('page', 0)}")
+                self.place_reviews[url] = cursor.get('emitted', 0)
+                yield self.reviews_request(
+                    feature_id, meta, cursor['page_token'], cursor.get('page', 0), resume_after=cursor.get('review_id'),
+                )
+            elif feature_id:
+                if cursor:
+                    self.logger.warning(f"Cursor of {url} has no reviews page token, starting from the top")
+                yield self.reviews_request(feature_id, meta)
+            else:
+                # Short links and search URLs need the place page to resolve the feature id
+                yield scrapy.Request(
+                    url=url,
+                    callback=self.parse_place_page,
+                    errback=self.errback,
+                    meta=meta,
+                )
+
+    def place_name_from_url(self, url):
+        """Read the place name from a /maps/place/<name>/ URL"""
+        match = re.search(r'/maps/place/([^/@?]+)', url)
+        return unquote_plus(match.group(1)) if match else 'Unknown'
+
+    def reviews_request(self, feature_id, meta, page_token='', page_number=0, resume_after=None, empty_pages=0):
+        """
+        Build the request for one page of reviews, skipping the reviews up to
+        resume_after. empty_pages counts the empty pages right before it.
+        """
+        pb = self.settings.get('MAPS_REVIEWS_RPC_PB', REVIEWS_RPC_PB).format(
+            feature_id=feature_id,
+            page_size=self.page_size,
+            page_token=page_token,
+            session_id=meta.setdefault('session_id', secrets.token_urlsafe(16)),
+            sort=SORT_ORDERS[self.sort],
+        )
+        query = urlencode({'authuser': 0, 'hl': meta['hl'], 'pb': pb}, safe='!:')
+
+        return scrapy.Request(
+            url=f"{self.endpoint}?{query}",
+            callback=self.parse_reviews_page,
+            errback=self.errback,
+            dont_filter=True,
+            meta={
+                **{key: meta[key] for key in PLACE_META_KEYS if key in meta},
+                'feature_id': feature_id,
+                'page_number': page_number,
+                'page_token': page_token,
+                'resume_after': resume_after,
+                'empty_pages': empty_pages,
+            },
+        )
+
+    def parse_place_page(self, response):
+        """Resolve the feature id (and place name) from a place HTML page"""
+        meta = dict(response.meta)
+        feature_id = extract_feature_id(response.url) or extract_feature_id(response.text)
+        if not feature_id:
+            self.logger.error(f"Could not find a place feature id for {meta['place_url']}")
+            self.finish_place(response.request, meta['place_url'], failure=Failure(ValueError('No place feature id')))
+            return
+
+        if meta['place_name'] == 'Unknown':
+            title = response.css('meta[itemprop="name"]::attr(content)').get() or response.css('title::text').get()
+            if title:
+                meta['place_name'] = title.split(' · ')[0].strip()
+
+        yield self.reviews_request(feature_id, meta)
+
+    def parse_reviews_page(self, response):
+        """Decode one page of reviews and follow the continuation token"""
+        place_url = response.meta['place_url']
+        place_name = response.meta['place_name']
+        feature_id = response.meta['feature_id']
+        page_number = response.meta['page_number']
+
+        if self.record_dir:
+            self.record_page(feature_id, page_number, response.body)
+
+        try:
+            reviews, next_page_token = decode_reviews_payload(response.body)
+        except Exception as e:
+            self.logger.error(f"Could not decode reviews page {page_number} for {place_name}: {e}")
+            self.finish_place(response.request, place_url, failure=Failure(e))
+            return
+
+        seen_reviews = self.seen_reviews.get(place_url)
+        if seen_reviews is None:
+            seen_reviews = self.seen_reviews[place_url] = self.review_deduplicator()
+        bounds = self.bounds.get(place_url)
+        if bounds is None:
+            bounds = self.bounds[place_url] = self.place_bounds()
+            # since only ends a newest-first stream, other sort orders are just filtered
+            bounds.stop_at_since = self.sort == 'newest'
+        duplicates_skipped = 0
+        last_review = None
+        resume_after = response.meta.get('resume_after')
+
+        for raw in reviews:
+            # The first page of a resumed cursor starts after its last review
+            if resume_after:
+                if raw['review_id'] == resume_after:
+                    resume_after = None
+                continue
+
+            # Skip duplicates. Reviews filtered below are marked as seen too, so a page
+            # of rating-only reviews still counts as new when the token moves on
+            review_id = raw['review_id']
+            if not seen_reviews.add(review_id_key(review_id)):
+                duplicates_skipped += 1
+                continue
+
+            review_data = self.build_rpc_review_data(raw, place_name, place_url)
+            if not review_data:
+                continue
+            review_data['review_id'] = review_id
+
+            # Reviews before the since date are never emitted
+            if bounds.too_old(review_data.get('review_date')):
+                if bounds.beyond_since(review_data.get('review_date')):
+                    break
+                continue
+
+            yield review_data
+            self.reviews_scraped += 1
+            self.place_reviews[place_url] = self.place_reviews.get(place_url, 0) + 1
+            self.record_review_attachments(review_data)
+            last_review = (review_id, review_data.get('review_date'))
+
+            # Log progress every 10 reviews
+            if self.reviews_scraped % 10 == 0:
+                self.logger.info(f"Progress: {self.reviews_scraped} reviews scraped")
+
+            if bounds.full(self.place_reviews[place_url]):
+                break
+
+        if resume_after:
+            self.logger.warning(f"Cursor review {resume_after} not found on its reviews page, continuing after it")
+
+        # A page of reviews that were all seen before means the token looped back
+        looped_back = bool(reviews) and duplicates_skipped == len(reviews)
+        # An empty page with a token is followed, unless the token stands still or pages stay empty
+        empty_pages = 0 if reviews else response.meta.get('empty_pages', 0) + 1
+        stalled = False
+        if empty_pages and next_page_token:
+            max_empty_pages = self.settings.getint('MAPS_HTTP_MAX_EMPTY_PAGES', 3)
+            if next_page_token == response.meta.get('page_token'):
+                self.logger.warning(f"Empty reviews page {page_number} of {place_name} repeats its own token, ending")
+                stalled = True
+            elif empty_pages > max_empty_pages:
+                self.logger.warning(f"{empty_pages} empty reviews pages in a row for {place_name}, ending")
+                stalled = True
+            else:
+                self.logger.info(f"Reviews page {page_number} of {place_name} is empty, following its token")
+            self.crawler.stats.inc_value('maps/http/empty_pages')
+        has_more = next_page_token and not looped_back and not stalled
+        if bounds.reason:
+            # Stopped inside this page: the next run re-reads it and skips past the last review
+            cursor = self.stopped_place_cursor(
+                place_url, bounds, self.place_reviews.get(place_url, 0), last_review,
+                sort=self.sort, page_token=response.meta.get('page_token', ''), page=page_number,
+            )
+            self.finish_place(response.request, place_url, cursor=cursor)
+        elif has_more and bounds.expired():
+            # Deadline between two pages: the next run starts at the next page
+            cursor = self.stopped_place_cursor(
+                place_url, bounds, self.place_reviews.get(place_url, 0), None,
+                sort=self.sort, page_token=next_page_token, page=page_number + 1,
+            )
+            self.finish_place(response.request, place_url, cursor=cursor)
+        elif has_more:
+            yield self.reviews_request(
+                feature_id, response.meta, next_page_token, page_number + 1, empty_pages=empty_pages,
+            )
+        else:
+            self.logger.info(
+                f"Successfully scraped {self.place_reviews.get(place_url, 0)} unique reviews from {place_name} "
+                f"in {page_number + 1} pages (skipped {duplicates_skipped} duplicates on the last page)"
+            )
+            self.finish_place(response.request, place_url)
+
+    def finish_place(self, request, place_url, failure=None, cursor=None):
+        """Release the dedup keys, bounds and review count of a place and send place_finished"""
+        seen_reviews = self.seen_reviews.pop(place_url, None)
+        if seen_reviews is not None:
+            self.logger.info(f"Dedup: {seen_reviews.summary()}")
+            seen_reviews.finish(self.crawler.stats)
+        self.bounds.pop(place_url, None)
+        reviews_scraped = self.place_reviews.pop(place_url, 0)
+        self.crawler.signals.send_catch_log(
+            signal=place_finished,
+            request=request,
+            place_url=place_url,
+            reviews_scraped=reviews_scraped,
+            failure=failure,
+            cursor=cursor,
+        )
+
+    async def errback(self, failure):
+        """Handle request errors, ending the place of the failed request"""
+        self.logger.error(f"Request failed: {failure}")
+        self.finish_place(failure.request, failure.request.meta.get('place_url'), failure=failure)
+
+    def record_page(self, feature_id, page_number, body):
+        """Write a raw reviews page to <record_dir>/<feature_id>/<page>.txt"""
+        place_dir = os.path.join(self.record_dir, feature_id.replace(':', '_'))
+        os.makedirs(place_dir, exist_ok=True)
+        with open(os.path.join(place_dir, f"{page_number:04d}.txt"), 'wb') as f:
+            f.write(body)
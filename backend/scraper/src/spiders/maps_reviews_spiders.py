@@ -4,11 +4,66 @@ Scrapes reviews from Google Maps business listings
 """
 
 import scrapy
+from scrapy.utils.project import data_path
 from scrapy_playwright.page import PageMethod
-from datetime import datetime, timedelta
+from datetime import datetime
+from urllib.parse import parse_qs, urlparse
 import json
 import re
 import asyncio
+import time
+
+from scraper.bounds import PlaceBounds, decode_cursor, encode_cursor, parse_since
+from scraper.checkpoint import CheckpointStore
+from scraper.dates import RelativeDateParser
+from scraper.dedup import DEDUP_MODES, ReviewDeduplicator, review_id_key, review_key, synthetic_review_id
+from scraper.interception import ResourceBlocker
+from scraper.har import HarArchive
+from scraper.items import GoogleMapsPlace
+from scraper.locales import profile_for_url
+from scraper.metrics import MetricsRecorder
+from scraper.places import extract_coordinates, extract_place_id, parse_count, parse_decimal, place_key
+from scraper.signals import place_finished
+from scraper.state import PlaceStateStore, WatermarkTracker
+from scraper.page_scripts import (
+    AGENT_BINDING, ANTI_CLICK_STYLE, ANTI_POPUP, BATCH_EXPANDED, CLAIM_NEW_REVIEWS, EXTRACT_REVIEWS_BATCH, FAST_FORWARD_REVIEWS,
+    PLACE_METADATA, RESOLVE_TRANSLATIONS, REVIEW_ELEMENT_FIELDS, REVIEWS_AGENT, SCROLL_AND_WAIT, SCROLL_CONTAINER,
+)
+from scraper.rpc import ReviewsResponseCollector
+from scraper.scrolling import ReviewProgress, ScrollScheduler
+from scraper.shards import SORT_OPTION_INDEX, extra_sort_shards, merge_shard_streams, parse_sort_shards
+from scraper.selector_cache import LAYOUT_FINGERPRINT, LAYOUT_PROBES, LearnedSelectorCache, layout_fingerprint
+
+
+# Scrollable reviews container, most specific first
+SCROLLABLE_SELECTORS = [
+    'div.m6QErb.DxyBCb.kA9KIf.dS8AEf.XiKgde',
+    'div.m6QErb.DxyBCb.kA9KIf.dS8AEf',
+    'div[role="main"]',
+    'div.m6QErb',
+]
+
+# "More" buttons that expand truncated review text
+MORE_BUTTON_SELECTOR = 'button[aria-label="See more"], button[aria-label*="more"], button[aria-label*="More"]'
+
+# Supported review extraction modes:
+# - 'batch': serialize all new reviews of a scroll step in one page.evaluate call
+# - 'element': legacy per-element extraction (one round trip per field)
+EXTRACTION_MODES = ('batch', 'element')
+
+# How translated reviews are resolved in 'batch' extraction mode:
+# - 'batch': toggle every translation button of a scroll step at once (RESOLVE_TRANSLATIONS)
+# - 'element': legacy per-review click-and-wait through extract_review_data
+# - 'displayed': no toggling, keep the text Google displays and only read the original language
+TRANSLATION_MODES = ('batch', 'element', 'displayed')
+
+# Where reviews are read from:
+# - 'dom': scrape the rendered reviews pane
+# - 'network': decode the paginated reviews RPC responses captured while scrolling,
+#   falling back to 'dom' when no responses can be decoded
+# - 'agent': an injected in-page agent owns the scroll loop and pushes review
+#   batches to Python through page.expose_binding (REVIEWS_AGENT)
+EXTRACTION_SOURCES = ('dom', 'network', 'agent')
 
 
 class MapsReviewsSpider(scrapy.Spider):
@@ -17,11 +72,16 @@ class MapsReviewsSpider(scrapy.Spider):
     
     custom_settings = {
         'DOWNLOAD_DELAY': 2,
-        'CONCURRENT_REQUESTS': 1,
+        # CONCURRENT_REQUESTS follows the context pool size, see configure_context_pool
         'PLAYWRIGHT_BROWSER_TYPE': 'chromium',
     }
     
-    def __init__(self, url=None, urls_file=None, max_reviews=None, *args, **kwargs):
+    def __init__(self, url=None, urls_file=None, max_reviews=None, extraction_mode='batch',
+                 extraction_source='dom', max_concurrent_places=None, max_pages_per_context=None,
+                 block_resources=None, watermark_id=None, watermark_date=None, state_file=None,
+                 worker=False, translation_mode='batch', translation_timeout_ms=1500, selector_cache=None,
+                 record_har=None, replay_har=None, checkpoint=None, dedup=None, since=None, deadline_seconds=None,
+                 cursor=None, sort_shards=None, *args, **kwargs):
         super(MapsReviewsSpider, self).__init__(*args, **kwargs)
 
         # Handle single URL or file with multiple URLs
@@ -35,23 +95,261 @@ class MapsReviewsSpider(scrapy.Spider):
             except FileNotFoundError:
                 self.logger.error(f"URL file not found: {urls_file}")
 
-        # No limit on reviews - scrape all available
-        self.max_reviews = None
+        # Per-place bounds (scraper/bounds.py), unbounded by default - scrape all available.
+        # The deadline falls back to MAPS_PLACE_DEADLINE_SECONDS.
+        self.max_reviews = int(max_reviews) if max_reviews else None
+        self.since = parse_since(since)
+        self.deadline_seconds = float(deadline_seconds) if deadline_seconds else None
 
-        if not self.urls:
+        # Cursor of a place an earlier run stopped at a bound, continued after its last review
+        self.cursor = decode_cursor(cursor) if cursor else None
+
+        # One reference clock for every relative date of the crawl
+        self.date_parser = RelativeDateParser(locale='id')
+
+        # Worker mode (scraper/worker.py): no start URLs, places are submitted as jobs
+        self.worker = str(worker).lower() in ('1', 'true', 'yes')
+
+        if not self.urls and not self.worker:
             raise ValueError("Must provide either 'url' or 'urls_file' argument")
 
-        # Cache for successful selectors (optimization)
-        self.cached_selectors = {
+        if extraction_mode not in EXTRACTION_MODES:
+            raise ValueError(f"extraction_mode must be one of {EXTRACTION_MODES}, got '{extraction_mode}'")
+        self.extraction_mode = extraction_mode
+
+        if translation_mode not in TRANSLATION_MODES:
+            raise ValueError(f"translation_mode must be one of {TRANSLATION_MODES}, got '{translation_mode}'")
+        self.translation_mode = translation_mode
+        self.translation_timeout_ms = int(translation_timeout_ms)
+
+        if extraction_source not in EXTRACTION_SOURCES:
+            raise ValueError(f"extraction_source must be one of {EXTRACTION_SOURCES}, got '{extraction_source}'")
+        self.extraction_source = extraction_source
+
+        # Browser context pool - resolved against the settings in from_crawler
+        self.max_concurrent_places = int(max_concurrent_places) if max_concurrent_places else None
+        self.max_pages_per_context = int(max_pages_per_context) if max_pages_per_context else None
+        self.context_pool = None
+
+        # Request interception profile - resolved against the settings in from_crawler
+        self.block_resources = block_resources
+        self.resource_blocker = None
+
+        # Incremental scraping: stop at the newest review of the previous run.
+        # Explicit watermark arguments win over the state store.
+        self.watermark_id = watermark_id
+        self.watermark_date = watermark_date
+        self.state_file = state_file
+        self.state_store = None
+
+        # Cache for successful selectors (optimization), one per browser context
+        # so concurrently scraped places never race on the same dict
+        self.context_selectors = {}
+
+        # Selectors learned by earlier crawls (MAPS_SELECTOR_CACHE_FILE), set in from_crawler
+        self.selector_cache_file = selector_cache
+        self.learned_selectors = None
+
+        # Per-phase timers, exported by the spider middleware at spider_closed
+        self.metrics = None
+
+        # HAR record/replay directory (scraper/har.py), set up in from_crawler
+        if record_har and replay_har:
+            raise ValueError("record_har and replay_har can not be combined")
+        self.record_har = record_har
+        self.replay_har = replay_har
+        self.har_archive = None
+        if self.record_har:
+            # One context per place, so every place gets its own archive
+            self.max_pages_per_context = 1
+
+        # Review dedup mode ('exact' or 'bloom'), defaults to MAPS_DEDUP_MODE
+        if dedup and dedup not in DEDUP_MODES:
+            raise ValueError(f"dedup must be one of {DEDUP_MODES}, got '{dedup}'")
+        self.dedup_mode = dedup
+
+        # Crash-resume checkpoint (scraper/checkpoint.py), opened in from_crawler
+        self.checkpoint_file = checkpoint
+        self.checkpoint_store = None
+
+        # Extra sort orders scraped on pages of their own (scraper/shards.py),
+        # defaults to MAPS_SORT_SHARDS in from_crawler
+        self.sort_shards = parse_sort_shards(sort_shards) if sort_shards else None
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super(MapsReviewsSpider, cls).from_crawler(crawler, *args, **kwargs)
+        spider.configure_context_pool(crawler.settings)
+        if spider.record_har:
+            spider.har_archive = HarArchive(crawler, spider.record_har, 'record')
+        elif spider.replay_har:
+            spider.har_archive = HarArchive(crawler, spider.replay_har, 'replay')
+        spider.metrics = MetricsRecorder(crawler)
+        spider.resource_blocker = ResourceBlocker.from_crawler(
+            crawler,
+            spider.block_resources or crawler.settings.get('MAPS_BLOCK_PROFILE', 'default'),
+        )
+
+        state_file = spider.state_file or crawler.settings.get('MAPS_STATE_FILE')
+        if state_file:
+            spider.state_store = PlaceStateStore(state_file)
+
+        selector_cache_file = spider.selector_cache_file or crawler.settings.get('MAPS_SELECTOR_CACHE_FILE')
+        if selector_cache_file and selector_cache_file != 'off':
+            spider.learned_selectors = LearnedSelectorCache.from_crawler(crawler, data_path(selector_cache_file))
+
+        checkpoint_file = spider.checkpoint_file or crawler.settings.get('MAPS_CHECKPOINT_FILE')
+        if checkpoint_file:
+            spider.checkpoint_store = CheckpointStore.from_crawler(crawler, checkpoint_file)
+
+        if spider.sort_shards is None:
+            spider.sort_shards = parse_sort_shards(crawler.settings.get('MAPS_SORT_SHARDS'))
+        return spider
+
+    def configure_context_pool(self, settings):
+        """
+        Size the Playwright context pool and Scrapy concurrency for N places at once.
+        Settings are still mutable here (they are frozen after the spider is created).
+        """
+        if self.max_concurrent_places is None:
+            self.max_concurrent_places = settings.getint('MAPS_MAX_CONCURRENT_PLACES', 1)
+        if self.max_pages_per_context is None:
+            self.max_pages_per_context = settings.getint('MAPS_MAX_PAGES_PER_CONTEXT', 1)
+        self.max_concurrent_places = max(1, self.max_concurrent_places)
+        self.max_pages_per_context = max(1, self.max_pages_per_context)
+
+        places = self.max_concurrent_places
+        contexts = -(-places // self.max_pages_per_context)
+
+        # Bounded pool: every in-flight place holds one slot, slots map onto browser contexts
+        self.context_pool = asyncio.Queue()
+        for pool_slot in range(places):
+            self.context_pool.put_nowait(pool_slot)
+
+        settings.set('CONCURRENT_REQUESTS', places, priority='spider')
+        settings.set('CONCURRENT_REQUESTS_PER_DOMAIN', places, priority='spider')
+        # Per-domain limits govern; a per-IP limit would collapse everything to one slot
+        settings.set('CONCURRENT_REQUESTS_PER_IP', 0, priority='spider')
+        settings.set('PLAYWRIGHT_MAX_CONTEXTS', contexts, priority='spider')
+        settings.set('PLAYWRIGHT_MAX_PAGES_PER_CONTEXT', self.max_pages_per_context, priority='spider')
+
+    def selector_cache(self, context_name):
+        """Return the cached selectors of one browser context"""
+        return self.context_selectors.setdefault(context_name, {
             'reviews_button': None,
             'scrollable_div': None,
             'rating': None,
-        }
+        })
+
+    async def selector_scope(self, page, place_url):
+        """Key of the learned selectors for this page: URL locale plus layout fingerprint"""
+        if not self.learned_selectors:
+            return None
+        try:
+            probe_bits = await page.evaluate(LAYOUT_FINGERPRINT, LAYOUT_PROBES)
+        except Exception as e:
+            self.logger.debug(f"Could not fingerprint the page layout: {e}")
+            return None
+        locale = parse_qs(urlparse(place_url).query).get('hl', [None])[0]
+        return self.learned_selectors.scope_key(locale, layout_fingerprint(probe_bits))
+
+    def learned_selector(self, scope, role):
+        if not scope:
+            return None
+        return self.learned_selectors.get(scope, role)
+
+    def review_deduplicator(self):
+        """Bounded-memory set of the review keys of one place (scraper/dedup.py)"""
+        return ReviewDeduplicator.from_settings(self.settings, mode=self.dedup_mode)
+
+    def place_bounds(self):
+        """Bounds of the next place, its deadline clock starts now"""
+        return PlaceBounds(
+            max_reviews=self.max_reviews,
+            since=self.since,
+            deadline_seconds=self.deadline_seconds or self.settings.getfloat('MAPS_PLACE_DEADLINE_SECONDS', 0),
+            slack_days=self.settings.getint('MAPS_WATERMARK_DATE_SLACK_DAYS', 7),
+        )
+
+    def place_cursor(self, place_url, token=None):
+        """The cursor of a request (worker jobs) or the -a cursor, None when it belongs to another place"""
+        cursor = decode_cursor(token) if token else self.cursor
+        if cursor and cursor['place'] == place_key(place_url):
+            return cursor
+        return None
+
+    def stopped_place_cursor(self, place_url, bounds, emitted, last_review, **fields):
+        """Log, count and store the cursor of a place stopped by a bound"""
+        review_id, review_date = last_review or (None, None)
+        cursor = encode_cursor({
+            'place': place_key(place_url),
+            'reason': bounds.reason,
+            'emitted': emitted,
+            'review_id': str(review_id) if review_id else None,
+            'review_date': review_date,
+            **fields,
+        })
+        self.logger.info(
+            f"Stopped {place_url} at {bounds.reason} ({bounds.describe()}) after {emitted} reviews, "
+            f"continue with -a cursor={cursor}"
+        )
+        stats = self.crawler.stats
+        stats.inc_value('maps/places_partial')
+        stats.inc_value(f'maps/stopped/{bounds.reason}')
+        if self.state_store:
+            self.state_store.update(place_key(place_url), cursor=cursor, cursor_reason=bounds.reason)
+        return cursor
+
+    def watermark_tracker(self, place_url):
+        """
+        Create the watermark tracker of a place. Without a watermark the tracker
+        only verifies the newest-first order, so a new watermark can be recorded.
+        """
+        if self.watermark_id or self.watermark_date:
+            watermark_id, watermark_date = self.watermark_id, self.watermark_date
+        elif self.state_store:
+            state = self.state_store.get(place_key(place_url))
+            watermark_id, watermark_date = state.get('watermark_id'), state.get('watermark_date')
+        else:
+            watermark_id = watermark_date = None
+
+        if watermark_id or watermark_date:
+            self.logger.info(f"Incremental scrape: stopping at watermark id={watermark_id} date={watermark_date}")
+
+        return WatermarkTracker(
+            watermark_id,
+            watermark_date,
+            slack_days=self.settings.getint('MAPS_WATERMARK_DATE_SLACK_DAYS', 7),
+        )
+
+    async def init_page(self, page, request):
+        """Prepare a new page before navigation (playwright_page_init_callback)"""
+        if self.har_archive:
+            # Routed before the blocker, which falls back to it for allowed requests
+            await self.har_archive.attach(page, request.meta['place_url'])
+        if self.resource_blocker:
+            # Abort images, media, fonts, map tiles and telemetry before they are downloaded
+            await self.resource_blocker.attach(page)
+
+    async def release_place(self, page, pool_slot):
+        """Close the place's page (and its context when isolated) and free the pool slot"""
+        try:
+            if page:
+                with self.metrics.phase('page_close'):
+                    if self.max_pages_per_context == 1:
+                        # One place per context: closing it drops cookies and cache for the next place
+                        await page.context.close()
+                    else:
+                        await page.close()
+        finally:
+            if pool_slot is not None and self.context_pool is not None:
+                self.context_pool.put_nowait(pool_slot)
 
     def parse_relative_date(self, relative_date_str):
         """
         Convert relative date strings to actual dates.
         Supports multiple languages including Indonesian, English, Spanish, French, German, Italian.
+        Dates are relative to the crawl start (see scraper/dates.py).
 
         Examples:
         - "6 hari lalu" (Indonesian) -> 2025-10-24
@@ -61,160 +359,134 @@ class MapsReviewsSpider(scrapy.Spider):
         if not relative_date_str or relative_date_str == 'Unknown':
             return relative_date_str
 
-        now = datetime.now()
-        date_str = relative_date_str.lower().strip()
-
-        # Remove "Diedit" (Edited) prefix if present
-        date_str = re.sub(r'^(diedit|edited)\s+', '', date_str, flags=re.IGNORECASE)
-
-        try:
-            # Extract number from string
-            number_match = re.search(r'(\d+)', date_str)
-            number = int(number_match.group(1)) if number_match else 1
-
-            # Days - hari (Indonesian), day/days (English), día/días (Spanish), jour/jours (French), tag/tage (German), giorno/giorni (Italian)
-            if any(word in date_str for word in ['hari', 'day', 'día', 'jour', 'tag', 'giorno']):
-                result_date = now - timedelta(days=number)
-                return result_date.strftime('%Y-%m-%d')
-
-            # Weeks - minggu (Indonesian), week/weeks (English), semana/semanas (Spanish), semaine/semaines (French), woche/wochen (German), settimana/settimane (Italian)
-            elif any(word in date_str for word in ['minggu', 'week', 'semana', 'semaine', 'woche', 'settimana']):
-                result_date = now - timedelta(weeks=number)
-                return result_date.strftime('%Y-%m-%d')
-
-            # Months - bulan (Indonesian), month/months (English), mes/meses (Spanish), mois (French), monat/monate (German), mese/mesi (Italian)
-            elif any(word in date_str for word in ['bulan', 'month', 'mes', 'mois', 'monat', 'mese']):
-                # Approximate: 1 month = 30 days
-                result_date = now - timedelta(days=number * 30)
-                return result_date.strftime('%Y-%m-%d')
-
-            # Years - tahun (Indonesian), year/years (English), año/años (Spanish), an/ans/année (French), jahr/jahre (German), anno/anni (Italian)
-            elif any(word in date_str for word in ['tahun', 'year', 'año', 'an', 'année', 'jahr', 'anno', 'setahun']):
-                # Approximate: 1 year = 365 days
-                # "setahun" means "a year" in Indonesian
-                result_date = now - timedelta(days=number * 365)
-                return result_date.strftime('%Y-%m-%d')
-
-            # If we can't parse it, return the original string
-            else:
-                return relative_date_str
-
-        except Exception as e:
-            self.logger.debug(f"Could not parse relative date '{relative_date_str}': {e}")
-            return relative_date_str
+        # Return the original string when it is not a relative date
+        return self.date_parser.parse(relative_date_str) or relative_date_str
 
     async def start(self):
         """Generate initial requests for all URLs (async version for Scrapy 2.13+)"""
+        started = set()
         for url in self.urls:
-            # Add Indonesian language parameter
-            if '?' in url:
-                if 'hl=' not in url:
-                    url = url + '&hl=id'
-            else:
-                url = url + '?hl=id'
-
-            # Make sure we're on the reviews tab
-            if 'reviews' not in url.lower():
-                # Add reviews filter to URL
-                url = url + '&reviews=true'
-
-            yield scrapy.Request(
-                url=url,
-                callback=self.parse,
-                errback=self.errback,
-                meta={
-                    'playwright': True,
-                    'playwright_include_page': True,
-                    'playwright_page_methods': [
-                        PageMethod('wait_for_timeout', 3000),  # Wait for page to load
-                        PageMethod('wait_for_selector', 'h1', timeout=10000),
-                    ],
-                    'place_url': url,
-                }
-            )
-    
+            # A place listed twice would hold a pool slot that is never given back
+            if place_key(url) in started:
+                self.logger.info(f"Skipping {url}, the place is already listed")
+                self.crawler.stats.inc_value('maps/places_duplicate')
+                continue
+            started.add(place_key(url))
+            if self.checkpoint_store and self.checkpoint_store.is_completed(place_key(url)):
+                self.logger.info(f"Skipping {url}, completed according to the checkpoint")
+                self.crawler.stats.inc_value('checkpoint/places_skipped')
+                continue
+            # Wait for a free slot before handing the next place to the engine
+            pool_slot = await self.context_pool.get()
+            yield self.build_request(url, pool_slot)
+
+    def build_request(self, url, pool_slot, **meta):
+        """Build the Playwright request for one place, holding the given pool slot"""
+        # Add Indonesian language parameter
+        if '?' in url:
+            if 'hl=' not in url:
+                url = url + '&hl=id'
+        else:
+            url = url + '?hl=id'
+
+        # Make sure we're on the reviews tab
+        if 'reviews' not in url.lower():
+            # Add reviews filter to URL
+            url = url + '&reviews=true'
+
+        meta = dict(meta)
+        if self.har_archive and self.har_archive.mode == 'record':
+            meta['playwright_context_kwargs'] = self.har_archive.context_kwargs(url)
+
+        return scrapy.Request(
+            url=url,
+            callback=self.parse,
+            errback=self.errback,
+            # A filtered request would never give its pool slot back; start() skips repeated places
+            dont_filter=True,
+            meta={
+                'playwright': True,
+                'playwright_include_page': True,
+                'playwright_context': f"pool-{pool_slot // self.max_pages_per_context}",
+                'playwright_page_init_callback': self.init_page,
+                'pool_slot': pool_slot,
+                'playwright_page_methods': [
+                    PageMethod('wait_for_timeout', 3000),  # Wait for page to load
+                    PageMethod('wait_for_selector', 'h1', timeout=10000),
+                ],
+                'place_url': url,
+                **meta,
+            }
+        )
+
     async def parse(self, response):
         """Parse the Google Maps page and extract reviews"""
         page = response.meta['playwright_page']
         place_url = response.meta['place_url']
+        cached_selectors = self.selector_cache(response.meta.get('playwright_context'))
+        profile = profile_for_url(place_url)
+        started_at = time.monotonic()
+        reviews_scraped = 0
+        checkpoint = self.checkpoint_store.place(place_key(place_url)) if self.checkpoint_store else None
+        completed = False
+        bounds = self.place_bounds()
+        cursor = None
+        review_stream = None
+        shard_pages = []
 
         try:
             # ANTI-POPUP: Prevent new tabs/windows from opening (profiles, images, etc.)
-            await page.evaluate('''
-                () => {
-                    // Override window.open to prevent popups
-                    window.open = function() { return null; };
-
-                    // Prevent all links from opening in new tabs
-                    document.addEventListener('click', function(e) {
-                        const target = e.target.closest('a');
-                        if (target && (target.target === '_blank' || target.hasAttribute('target'))) {
-                            e.preventDefault();
-                            e.stopPropagation();
-                        }
-                    }, true);
-                }
-            ''')
+            phase_started = time.monotonic()
+            await page.evaluate(ANTI_POPUP)
+            self.metrics.record_phase('anti_popup', time.monotonic() - phase_started, place_url)
+
+            # Selectors learned by earlier crawls for this locale and layout
+            selector_scope = await self.selector_scope(page, place_url)
+            if not cached_selectors.get('scrollable_div'):
+                cached_selectors['scrollable_div'] = self.learned_selector(selector_scope, 'scrollable_div')
+            learned_scrollable_div = cached_selectors.get('scrollable_div')
+
+            # Read the place header once: name, rating, review count and overview details
+            place = None
+            try:
+                place = await self.extract_place_metadata(page, place_url, profile)
+            except Exception as e:
+                self.logger.warning(f"Could not read the place metadata: {e}")
 
-            # Extract place name
-            place_name = await page.query_selector('h1')
-            place_name_text = await place_name.inner_text() if place_name else 'Unknown'
+            if place:
+                place_name_text = place['name']
+                yield place
+            else:
+                # Extract place name
+                place_name = await page.query_selector('h1')
+                place_name_text = await place_name.inner_text() if place_name else 'Unknown'
 
             self.logger.info(f"Scraping reviews for: {place_name_text}")
+
+            # The review count of the header tells the scroll loops when everything is loaded
+            total_reviews = place.get('total_reviews') if place else None
+            if total_reviews:
+                self.logger.info(f"Place header reports {total_reviews} reviews")
+                self.crawler.stats.inc_value('maps/total_reviews_expected', total_reviews)
+            else:
+                self.crawler.stats.inc_value('maps/total_reviews_unknown')
+
+            # Start listening before the reviews tab is opened so the first page is captured too
+            collector = None
+            if self.extraction_source == 'network':
+                collector = ReviewsResponseCollector(self.logger)
+                page.on('response', collector.on_response)
             
             # Try to find and click on the reviews tab/button
+            phase_started = time.monotonic()
             try:
-                # Look for reviews button - multiple possible selectors in multiple languages
-                # Including Indonesian ("Ulasan"), English ("Reviews"), and other languages
-                reviews_button_selectors = [
-                    'button[aria-label*="Reviews"]',
-                    'button[aria-label*="reviews"]',
-                    'button[aria-label*="Ulasan"]',  # Indonesian
-                    'button[aria-label*="ulasan"]',  # Indonesian lowercase
-                    'button[aria-label*="Reseñas"]',  # Spanish
-                    'button[aria-label*="Avis"]',  # French
-                    'button[aria-label*="Bewertungen"]',  # German
-                    'button[aria-label*="Recensioni"]',  # Italian
-                    'div[role="tab"]:has-text("Reviews")',
-                    'div[role="tab"]:has-text("Ulasan")',  # Indonesian
-                    'button:has-text("Reviews")',
-                    'button:has-text("Ulasan")',  # Indonesian
-                ]
-
-                reviews_button = None
-
-                # OPTIMIZATION 3: Try cached selector first
-                if self.cached_selectors.get('reviews_button'):
-                    try:
-                        reviews_button = await page.query_selector(self.cached_selectors['reviews_button'])
-                        if reviews_button:
-                            self.logger.info(f"Using cached reviews button selector")
-                            await reviews_button.click()
-                            # SPEED UP: Reduced wait time from 3000ms to 800ms
-                            await page.wait_for_timeout(800)
-                            self.logger.info("Clicked on reviews tab")
-                    except Exception as e:
-                        # Cached selector failed, clear it and try all
-                        self.cached_selectors['reviews_button'] = None
-
-                # If cached selector didn't work, try all selectors
-                if not reviews_button:
-                    for selector in reviews_button_selectors:
-                        try:
-                            reviews_button = await page.query_selector(selector)
-                            if reviews_button:
-                                self.logger.info(f"Found reviews button with selector: {selector}")
-                                # Cache the working selector
-                                self.cached_selectors['reviews_button'] = selector
-                                await reviews_button.click()
-                                # SPEED UP: Reduced wait time from 3000ms to 800ms
-                                await page.wait_for_timeout(800)
-                                self.logger.info("Clicked on reviews tab")
-                                break
-                        except Exception as e:
-                            continue
-
-                if not reviews_button:
+                reviews_button = await self.find_reviews_button(page, profile, cached_selectors, selector_scope)
+                if reviews_button:
+                    await reviews_button.click()
+                    # SPEED UP: Reduced wait time from 3000ms to 800ms
+                    await page.wait_for_timeout(800)
+                    self.logger.info("Clicked on reviews tab")
+                else:
                     self.logger.warning("Could not find reviews button with any selector, trying tab index approach")
                     # Try clicking the second tab (usually reviews on Google Maps)
                     try:
@@ -234,305 +506,884 @@ class MapsReviewsSpider(scrapy.Spider):
 
             # SPEED UP: Reduced wait time from 3000ms to 500ms - reviews load fast
             await page.wait_for_timeout(500)
+            self.metrics.record_phase('reviews_tab', time.monotonic() - phase_started, place_url)
 
             # Try to change sort order to "Newest" to get all reviews more reliably
+            phase_started = time.monotonic()
+            sort_applied = False
             try:
-                sort_button_selectors = [
-                    'button[data-value="Sort"]',
-                    'button[aria-label*="Sort"]',
-                    'button:has-text("Sort")',
-                ]
+                sort_button = await page.query_selector(profile.sort_button_selector)
+                if sort_button:
+                    await sort_button.click()
+                    # SPEED UP: Reduced from 1000ms to 400ms
+                    await page.wait_for_timeout(400)
 
-                for selector in sort_button_selectors:
-                    try:
-                        sort_button = await page.query_selector(selector)
-                        if sort_button:
-                            await sort_button.click()
-                            # SPEED UP: Reduced from 1000ms to 400ms
-                            await page.wait_for_timeout(400)
-
-                            # Click "Newest" option
-                            newest_option = await page.query_selector('div[data-index="1"]')
-                            if newest_option:
-                                await newest_option.click()
-                                # SPEED UP: Reduced from 2000ms to 600ms
-                                await page.wait_for_timeout(600)
-                                self.logger.info("Changed sort order to Newest")
-                                break
-                    except:
-                        continue
+                    # Click "Newest" option
+                    newest_option = await page.query_selector('div[data-index="1"]')
+                    if newest_option:
+                        await newest_option.click()
+                        # SPEED UP: Reduced from 2000ms to 600ms
+                        await page.wait_for_timeout(600)
+                        self.logger.info("Changed sort order to Newest")
+                        sort_applied = True
             except Exception as e:
                 self.logger.warning(f"Could not change sort order: {e}")
+            self.metrics.record_phase('sort', time.monotonic() - phase_started, place_url)
+            primary_sort = 'newest' if sort_applied else 'relevant'
 
             # Use optimized incremental scraping - scrape WHILE scrolling
-            seen_reviews = set()
-            reviews_scraped = 0
+            seen_reviews = self.review_deduplicator()
             duplicates_skipped = 0
+            resumed_skipped = 0
+
+            # Reviews emitted before a crash count as seen; the DOM scroll loop also skips their nodes
+            resume_checkpoint = None
+            if checkpoint and checkpoint.resumed:
+                self.logger.info(f"Resuming from checkpoint: {checkpoint.resumed} reviews already emitted")
+                seen_reviews.update(checkpoint.emitted_keys())
+                resume_checkpoint = checkpoint
+            emitted_before = checkpoint.resumed if resume_checkpoint else 0
+
+            # Continue after the last review of a place an earlier run stopped at a bound
+            resume_after = None
+            place_cursor = self.place_cursor(place_url, response.meta.get('cursor'))
+            if place_cursor and place_cursor.get('review_id'):
+                if self.extraction_source != 'dom':
+                    self.logger.warning("Cursors are only resumed with extraction_source=dom, starting from the top")
+                else:
+                    self.logger.info(
+                        f"Resuming after review {place_cursor['review_id']} "
+                        f"({place_cursor.get('emitted', 0)} reviews emitted before)"
+                    )
+                    if place_cursor.get('sort') != primary_sort:
+                        self.logger.warning("Sort order differs from the cursor's run, reviews may be missed or repeated")
+                    resume_after = place_cursor['review_id']
+                    emitted_before = max(emitted_before, place_cursor.get('emitted', 0))
+
+            # Sort shards scroll more pages of the place at once; the pages only share the
+            # dedup keys of this run, so they are not combined with a resume. A shard with the
+            # sort the main page ended up with would only scroll the same list again.
+            shard_sorts = extra_sort_shards(self.sort_shards or (), primary_sort)
+            if shard_sorts and self.extraction_source != 'dom':
+                self.logger.warning("Sort shards need extraction_source=dom, scraping a single page")
+                shard_sorts = ()
+            elif shard_sorts and (resume_checkpoint or resume_after):
+                self.logger.warning("Resumed places are not sharded, scraping a single page")
+                shard_sorts = ()
+
+            # Counts distinct review ids, also across sharded pages
+            progress = ReviewProgress(
+                total_reviews,
+                tolerance=self.settings.getfloat('MAPS_TOTAL_REVIEWS_TOLERANCE', 0.02),
+                loaded=emitted_before,
+            )
+
+            # Watermarks only make sense on a newest-first stream
+            tracker = self.watermark_tracker(place_url)
+            if not sort_applied or shard_sorts:
+                if tracker.active:
+                    self.logger.warning("Sort order is not Newest, ignoring watermark and scraping everything")
+                tracker = None
+            newest_review = None
+            last_review = None
+
+            # A since date can only end a newest-first stream; otherwise it just filters
+            if bounds.active:
+                self.logger.info(f"Bounded scrape: {bounds.describe()}")
+            if bounds.since and (not sort_applied or shard_sorts):
+                self.logger.warning("Sort order is not Newest, since only filters reviews and does not stop scrolling")
+                bounds.stop_at_since = False
+            since_skipped = 0
 
             self.logger.info("Starting incremental scraping (scrape while loading)...")
 
             # Scroll and scrape incrementally - no limit, get all available reviews
-            async for review_data in self.scroll_and_scrape_incrementally(
-                page,
-                place_name_text,
-                place_url
-            ):
+            if collector:
+                review_stream = self.scroll_and_capture_network(
+                    page, place_name_text, place_url, collector, cached_selectors,
+                    seen_reviews=seen_reviews, progress=progress, bounds=bounds,
+                )
+            elif self.extraction_source == 'agent':
+                review_stream = self.scrape_with_agent(page, place_name_text, place_url, cached_selectors, bounds=bounds)
+            else:
+                review_stream = self.scroll_and_scrape_incrementally(
+                    page, place_name_text, place_url, cached_selectors,
+                    resume_checkpoint=resume_checkpoint, seen_reviews=seen_reviews, progress=progress,
+                    bounds=bounds, resume_after=resume_after,
+                )
+                if shard_sorts:
+                    shard_pages = await self.open_sort_shards(page, response.request, shard_sorts, profile, cached_selectors)
+                if shard_pages:
+                    streams = [(primary_sort, review_stream)] + [
+                        (sort, self.scroll_and_scrape_incrementally(
+                            shard_page, place_name_text, place_url, cached_selectors,
+                            seen_reviews=seen_reviews, progress=progress, bounds=bounds,
+                        ))
+                        for sort, shard_page in shard_pages
+                    ]
+                    review_stream = merge_shard_streams(
+                        streams, self.logger, queue_size=self.settings.getint('MAPS_SORT_SHARD_QUEUE_SIZE', 4),
+                    )
+
+            async for review_data in review_stream:
                 if review_data:
                     # Create unique key for deduplication
-                    review_id = review_data.get('_review_id')
-                    reviewer_name = review_data.get('reviewer_name')
-                    review_date = review_data.get('review_date')
-
-                    review_key = None
-                    if review_id:
-                        review_key = f"id:{review_id}"
-                    elif reviewer_name and review_date:
-                        review_key = f"name_date:{reviewer_name}:{review_date}"
-
-                    # Skip duplicates
-                    if review_key and review_key in seen_reviews:
-                        duplicates_skipped += 1
+                    key = review_key(review_data)
+
+                    # Skip duplicates, marking new keys as seen
+                    if key and not seen_reviews.add(key):
+                        if resume_checkpoint and key in resume_checkpoint:
+                            resumed_skipped += 1
+                        else:
+                            duplicates_skipped += 1
                         continue
 
-                    # Mark as seen and yield
-                    if review_key:
-                        seen_reviews.add(review_key)
+                    # Replace the internal tracking field with the public review id
+                    review_id = review_data.pop('_review_id', None)
+                    review_data['review_id'] = str(review_id) if review_id else None
+                    shard = review_data.pop('_shard', None)
+                    if shard:
+                        self.crawler.stats.inc_value(f'maps/shards/reviews/{shard}')
+
+                    # Stop scrolling as soon as reviews of the previous run show up
+                    if tracker and tracker.crossed(review_id, review_data.get('review_date')):
+                        self.logger.info(f"Reached watermark after {reviews_scraped} new reviews, ending")
+                        self.crawler.stats.inc_value('maps/watermark_reached')
+                        break
+                    if newest_review is None:
+                        newest_review = (review_id, review_data.get('review_date'))
 
-                    # Remove internal tracking field before yielding
-                    review_data.pop('_review_id', None)
+                    # Reviews before the since date are never emitted
+                    if bounds.too_old(review_data.get('review_date')):
+                        since_skipped += 1
+                        if bounds.beyond_since(review_data.get('review_date')):
+                            break
+                        continue
 
                     yield review_data
                     reviews_scraped += 1
+                    # Sharded streams have no position to continue from
+                    if not shard_pages:
+                        last_review = (review_id, review_data.get('review_date'))
+                    if checkpoint and key:
+                        checkpoint.add(key)
+                    self.record_review_attachments(review_data)
+                    # The agent reports no loaded counts, emitted reviews are a lower bound
+                    progress.update(emitted_before + reviews_scraped)
 
                     # Log progress every 10 reviews
                     if reviews_scraped % 10 == 0:
-                        self.logger.info(f"Progress: {reviews_scraped} reviews scraped")
+                        self.logger.info(f"Progress: {reviews_scraped} reviews scraped{progress.describe()}")
+
+                    if progress.covers(emitted_before + reviews_scraped):
+                        self.logger.info(f"Emitted all {progress.total_reviews} reviews of the place header, ending")
+                        break
+
+                    # Bounds of the job: stop scrolling with partial results
+                    if bounds.full(reviews_scraped) or bounds.expired():
+                        break
 
             self.logger.info(f"Successfully scraped {reviews_scraped} unique reviews from {place_name_text} (skipped {duplicates_skipped} duplicates)")
+            if progress.total_reviews:
+                self.logger.info(
+                    f"Loaded {progress.loaded} of {progress.total_reviews} reviews in the place header "
+                    f"({progress.percent:.1f}%)"
+                )
+            if resumed_skipped:
+                self.logger.info(f"Skipped {resumed_skipped} reviews emitted before the restart")
+            if since_skipped:
+                self.logger.info(f"Skipped {since_skipped} reviews dated before {bounds.since}")
+            self.logger.info(f"Dedup: {seen_reviews.summary()}")
+            seen_reviews.finish(self.crawler.stats)
+
+            # Remember the scroll container that worked for later crawls
+            working_scrollable_div = cached_selectors.get('scrollable_div')
+            if selector_scope and working_scrollable_div:
+                if working_scrollable_div == learned_scrollable_div:
+                    self.learned_selectors.hit(selector_scope, 'scrollable_div')
+                else:
+                    self.learned_selectors.miss(selector_scope, 'scrollable_div')
+                    self.learned_selectors.learn(selector_scope, 'scrollable_div', working_scrollable_div)
+
+            # Record the new watermark once the run is known to be newest-first
+            if tracker and tracker.order_violated:
+                self.logger.warning("Review dates were not newest-first, watermark not updated")
+            elif tracker and self.state_store and newest_review:
+                self.state_store.update(
+                    place_key(place_url),
+                    watermark_id=newest_review[0],
+                    watermark_date=newest_review[1],
+                    reviews_scraped=reviews_scraped,
+                )
+
+            # Partial results: hand out where the next run can continue
+            if bounds.reason:
+                cursor = self.stopped_place_cursor(
+                    place_url, bounds, emitted_before + reviews_scraped, last_review,
+                    sort='sharded' if shard_pages else primary_sort,
+                )
+            completed = bounds.reason is None
         
         except Exception as e:
             self.logger.error(f"Error parsing page {place_url}: {e}")
         
         finally:
-            await page.close()
-    
-    async def scroll_and_scrape_incrementally(self, page, place_name, place_url):
+            if review_stream is not None:
+                # Stops the shard pages still scrolling when the loop ended early
+                await review_stream.aclose()
+            for _, shard_page in shard_pages:
+                await self.close_sort_shard(shard_page)
+            if checkpoint:
+                # Interrupted places keep their keys for the next run
+                if completed:
+                    checkpoint.complete()
+                else:
+                    checkpoint.flush()
+            self.record_place_throughput(place_url, reviews_scraped, time.monotonic() - started_at)
+            await self.release_place(page, response.meta.get('pool_slot'))
+            self.crawler.signals.send_catch_log(
+                signal=place_finished,
+                request=response.request,
+                place_url=place_url,
+                reviews_scraped=reviews_scraped,
+                failure=None,
+                cursor=cursor,
+            )
+
+    async def find_reviews_button(self, page, profile, cached_selectors, selector_scope):
+        """
+        Reviews tab button of the page, None when no selector matches.
+
+        Tries the cached selector first. Otherwise one query of the profile's
+        union tells whether any reviews button is there, and the matching
+        selector of the highest priority picks it, since the union itself
+        returns the first match in document order.
+        """
+        lookup_started = time.monotonic()
+        cached = cached_selectors.get('reviews_button') or self.learned_selector(selector_scope, 'reviews_button')
+        # Only one selector of the locale's list is worth caching; anything else (the union an
+        # earlier version learned, another locale's button) would just repeat the union query
+        if cached not in profile.reviews_button_selectors:
+            cached = None
+        cached_selectors['reviews_button'] = cached
+
+        # OPTIMIZATION 3: Try cached selector first
+        if cached_selectors.get('reviews_button'):
+            try:
+                reviews_button = await page.query_selector(cached_selectors['reviews_button'])
+            except Exception:
+                reviews_button = None
+            if reviews_button:
+                self.logger.info("Using cached reviews button selector")
+                if self.learned_selector(selector_scope, 'reviews_button') == cached_selectors['reviews_button']:
+                    self.learned_selectors.hit(selector_scope, 'reviews_button', time.monotonic() - lookup_started)
+                return reviews_button
+            # Cached selector failed or matches nothing on this layout, clear it and try all
+            cached_selectors['reviews_button'] = None
+
+        # Reviews button of the page language ("Ulasan", "Reviews", ...)
+        selector, reviews_button = None, None
+        try:
+            if await page.query_selector(profile.reviews_button_selector):
+                selector, reviews_button = await self.prioritized_element(page, profile.reviews_button_selectors)
+        except Exception as e:
+            self.logger.debug(f"Reviews button lookup failed: {e}")
+        if selector_scope:
+            self.learned_selectors.miss(selector_scope, 'reviews_button', time.monotonic() - lookup_started)
+        if not reviews_button:
+            return None
+
+        self.logger.info(f"Found reviews button with selector: {selector}")
+        # Cache the working selector (also for later crawls)
+        cached_selectors['reviews_button'] = selector
+        if selector_scope:
+            self.learned_selectors.learn(selector_scope, 'reviews_button', selector)
+        return reviews_button
+
+    async def prioritized_element(self, page, selectors):
+        """First selector, in list order, that matches an element: (selector, element), or (None, None)"""
+        for selector in selectors:
+            element = await page.query_selector(selector)
+            if element:
+                return selector, element
+        return None, None
+
+    async def open_sort_shards(self, page, request, sorts, profile, cached_selectors):
+        """Open one more page of the place per sort order, returns the (sort, page) pairs that opened"""
+        place_url = request.meta['place_url']
+        with self.metrics.phase('sort_shards_open', place_url):
+            results = await asyncio.gather(
+                *[self.open_sort_shard(page, request, sort, profile, cached_selectors) for sort in sorts],
+                return_exceptions=True,
+            )
+
+        shard_pages = []
+        for sort, result in zip(sorts, results):
+            if isinstance(result, Exception):
+                self.logger.warning(f"Could not open the '{sort}' sort shard: {result}")
+                self.crawler.stats.inc_value('maps/shards/failed')
+                continue
+            shard_pages.append((sort, result))
+        if shard_pages:
+            self.logger.info(f"Scraping {len(shard_pages) + 1} sort shards: {', '.join(sort for sort, _ in shard_pages)}")
+            self.crawler.stats.inc_value('maps/shards/places')
+            self.crawler.stats.inc_value('maps/shards/pages', len(shard_pages))
+        return shard_pages
+
+    async def open_sort_shard(self, page, request, sort, profile, cached_selectors):
+        """New page of the place in the same browser context, with its reviews sorted by sort"""
+        shard_page = await page.context.new_page()
+        try:
+            await self.init_page(shard_page, request)
+            await shard_page.goto(request.url, wait_until='domcontentloaded')
+            await shard_page.wait_for_selector('h1', timeout=10000)
+            await shard_page.evaluate(ANTI_POPUP)
+
+            cached_button = cached_selectors.get('reviews_button')
+            reviews_button = await shard_page.wait_for_selector(
+                cached_button or profile.reviews_button_selector, timeout=10000,
+            )
+            if not cached_button:
+                # The union waits for any reviews button, the priority list picks it
+                _, reviews_button = await self.prioritized_element(shard_page, profile.reviews_button_selectors)
+            await reviews_button.click()
+            sort_button = await shard_page.wait_for_selector(profile.sort_button_selector, timeout=10000)
+            await sort_button.click()
+            sort_option = await shard_page.wait_for_selector(
+                f'div[data-index="{SORT_OPTION_INDEX[sort]}"]', timeout=5000,
+            )
+            await sort_option.click()
+            await shard_page.wait_for_timeout(600)
+        except Exception:
+            await self.close_sort_shard(shard_page)
+            raise
+        return shard_page
+
+    async def close_sort_shard(self, shard_page):
+        try:
+            if not shard_page.is_closed():
+                await shard_page.close()
+        except Exception as e:
+            self.logger.debug(f"Could not close a sort shard page: {e}")
+
+    async def extract_place_metadata(self, page, place_url, profile):
+        """Read the place header and overview once and build its GoogleMapsPlace item"""
+        with self.metrics.phase('place_metadata', place_url):
+            raw = await page.evaluate(PLACE_METADATA, {'reviewCountPhrases': profile.review_count_phrases})
+        if not raw or not raw.get('name'):
+            return None
+
+        # The page URL carries the pin once Maps resolved the place, the requested URL may not
+        latitude, longitude = extract_coordinates(page.url)
+        if latitude is None:
+            latitude, longitude = extract_coordinates(place_url)
+
+        place = GoogleMapsPlace(
+            name=raw['name'],
+            url=place_url,
+            place_id=extract_place_id(page.url) or extract_place_id(place_url),
+            address=raw.get('address'),
+            latitude=latitude,
+            longitude=longitude,
+            phone=raw.get('phone'),
+            website=raw.get('website'),
+            category=raw.get('category'),
+            overall_rating=parse_decimal(raw.get('rating')),
+            total_reviews=parse_count(raw.get('reviewCount')),
+            scraped_at=datetime.now().isoformat(),
+        )
+        self.crawler.stats.inc_value('maps/places_metadata')
+        return place
+
+    def record_place_throughput(self, place_url, reviews_scraped, elapsed):
+        """Log per-place throughput and record it in the Scrapy stats"""
+        reviews_per_second = reviews_scraped / elapsed if elapsed > 0 else 0.0
+        self.logger.info(
+            f"Throughput: {reviews_scraped} reviews in {elapsed:.1f}s "
+            f"({reviews_per_second:.2f} reviews/sec) for {place_url}"
+        )
+
+        stats = self.crawler.stats
+        stats.inc_value('maps/places_scraped')
+        stats.inc_value('maps/place_seconds_total', elapsed)
+        stats.max_value('maps/place_reviews_per_second_max', reviews_per_second)
+        stats.min_value('maps/place_reviews_per_second_min', reviews_per_second)
+        self.metrics.observe('reviews_per_second', reviews_per_second)
+
+    async def scroll_and_scrape_incrementally(self, page, place_name, place_url, cached_selectors=None,
+                                              resume_checkpoint=None, seen_reviews=None, progress=None, bounds=None,
+                                              resume_after=None):
         """
         Optimized: Scroll and scrape reviews incrementally with parallel processing.
         No limit - scrapes ALL available reviews.
-        - Reduced wait times (150ms scroll, 100ms expansion)
-        - Smart scroll detection to avoid unnecessary scrolls
+        - No fixed sleeps: waits in the page for new review nodes (ScrollScheduler)
+        - Ends only once the end of the list is confirmed
         - Parallel review extraction using asyncio.gather
         - Cached selectors to avoid repeated selector attempts
+        - Consumed review nodes are marked in the page, so each scroll only touches new ones
         - ONLY scrapes from the specific reviews container (blue highlighted area)
         - Prevents accidental clicks on profiles/images
+        - Resumed places fast-forward past the review keys of their checkpoint (resume_checkpoint)
+        - Reviews already in seen_reviews (the caller's deduplicator) are not extracted again
+        - With a progress (ReviewProgress) the loop ends once the header's review count is loaded
+        - With bounds (PlaceBounds) the loop ends at the deadline; resume_after skips to a cursor's review
         """
-        scrollable_selectors = [
-            'div.m6QErb.DxyBCb.kA9KIf.dS8AEf.XiKgde',
-            'div.m6QErb.DxyBCb.kA9KIf.dS8AEf',
-            'div[role="main"]',
-            'div.m6QErb',
-        ]
-
-        processed_review_ids = set()
-        no_new_reviews_count = 0
-        max_no_change_attempts = 3
+        scrollable_selectors = SCROLLABLE_SELECTORS
+        if cached_selectors is None:
+            cached_selectors = {}
+
+        # Called without the caller's deduplicator, the loop keeps its own
+        owns_seen_reviews = seen_reviews is None
+        if owns_seen_reviews:
+            seen_reviews = self.review_deduplicator()
+        claim_batch_id = 0
         scroll_count = 0
         max_scrolls = 999999  # Effectively unlimited - scroll until no more reviews
+        scheduler = ScrollScheduler.from_settings(self.settings)
+        work_started = time.monotonic()
 
         # Cache the working selector after first successful use
-        working_scrollable_selector = self.cached_selectors.get('scrollable_div')
-        previous_scroll_height = 0
+        working_scrollable_selector = cached_selectors.get('scrollable_div')
 
         # ANTI-CLICK: Disable pointer events on profile images and links to prevent accidental navigation
-        await page.evaluate('''
-            () => {
-                // Add CSS to disable clicks on profile pictures and images
-                const style = document.createElement('style');
-                style.textContent = `
-                    img[role="img"],
-                    a[href*="/contrib/"],
-                    a[data-item-id*="authority"],
-                    div[role="img"],
-                    button[aria-label*="photo"],
-                    button[aria-label*="Photo"] {
-                        pointer-events: none !important;
-                    }
-                `;
-                document.head.appendChild(style);
-            }
-        ''')
-
-        while scroll_count < max_scrolls:
-            try:
-                # IMPORTANT: Only get reviews from the specific scrollable container
-                # Find the scrollable container first
-                scrollable_container = None
-                for selector in scrollable_selectors:
-                    scrollable_container = await page.query_selector(selector)
-                    if scrollable_container:
-                        working_scrollable_selector = selector
-                        break
+        await page.evaluate(ANTI_CLICK_STYLE)
 
-                # Get current reviews on page - ONLY from within the scrollable container
-                review_elements = []
-                if scrollable_container:
-                    # Query reviews ONLY within the scrollable container
-                    review_elements = await scrollable_container.query_selector_all('div[data-review-id]')
-                    if not review_elements:
-                        review_elements = await scrollable_container.query_selector_all('div.jftiEf')
-                else:
-                    # Fallback: query from page but log warning
-                    self.logger.warning("Could not find scrollable container, using page-level query")
-                    review_elements = await page.query_selector_all('div[data-review-id]')
-                    if not review_elements:
-                        review_elements = await page.query_selector_all('div.jftiEf')
-
-                # OPTIMIZATION 2 & 3: Expand "More" buttons with reduced wait time
-                # IMPORTANT: Only expand buttons within the scrollable container
-                if scrollable_container:
-                    await page.evaluate(f'''
-                        () => {{
-                            const container = document.querySelector('{working_scrollable_selector}');
-                            if (container) {{
-                                const buttons = Array.from(container.querySelectorAll('button[aria-label="See more"], button[aria-label*="more"], button[aria-label*="More"]'));
-                                buttons.forEach(btn => {{
-                                    try {{ btn.click(); }} catch (e) {{}}
-                                }});
-                            }}
-                        }}
-                    ''')
-                else:
-                    # Fallback to page-level
-                    await page.evaluate('''
-                        () => {
-                            const buttons = Array.from(document.querySelectorAll('button[aria-label="See more"], button[aria-label*="more"], button[aria-label*="More"]'));
-                            buttons.forEach(btn => {
-                                try { btn.click(); } catch (e) {}
-                            });
-                        }
-                    ''')
-                # SPEED UP: Reduced from 100ms to 50ms
-                await page.wait_for_timeout(50)
-
-                # OPTIMIZATION 4: Parallel review extraction
-                # Collect new reviews first, then process them in parallel
-                new_review_elements = []
-                for review_elem in review_elements:
-                    try:
-                        review_id = await review_elem.get_attribute('data-review-id')
-                        if not review_id:
-                            elem_text = await review_elem.inner_text()
-                            review_id = hash(elem_text[:100]) if elem_text else None
+        if resume_checkpoint or resume_after:
+            await self.fast_forward(page, resume_checkpoint, scheduler, cached_selectors, until_id=resume_after)
 
-                        if review_id and review_id not in processed_review_ids:
-                            processed_review_ids.add(review_id)
-                            new_review_elements.append((review_elem, review_id))
+        consecutive_errors = 0
+        try:
+            while scroll_count < max_scrolls:
+                if bounds is not None and bounds.expired():
+                    self.logger.info(f"Deadline of {bounds.deadline_seconds:g}s reached, ending")
+                    break
+                try:
+                    # OPTIMIZATION 7: Claim only unseen review nodes in the page itself.
+                    # Consumed nodes are tagged in the DOM, so each scroll step touches just
+                    # the newly loaded reviews and expands "More" buttons only inside them.
+                    claim_batch_id += 1
+                    iteration_started = time.monotonic()
+                    claimed = await page.evaluate(CLAIM_NEW_REVIEWS, {
+                        'containerSelectors': scrollable_selectors,
+                        'batchId': claim_batch_id,
+                        'moreSelector': MORE_BUTTON_SELECTOR,
+                    })
+
+                    if claimed['container']:
+                        working_scrollable_selector = claimed['container']
+                    else:
+                        self.logger.warning("Could not find scrollable container, using page-level query")
 
-                    except Exception as e:
-                        self.logger.debug(f"Error checking review element: {e}")
-                        continue
+                    if claimed['expanded']:
+                        # Wait until the clicked "More" buttons are gone instead of a fixed sleep
+                        wait_started = time.monotonic()
+                        try:
+                            await page.wait_for_function(
+                                BATCH_EXPANDED,
+                                arg={'batchId': claim_batch_id, 'moreSelector': MORE_BUTTON_SELECTOR},
+                                polling='raf',
+                                timeout=300,
+                            )
+                        except Exception:
+                            self.logger.debug(f"Review text of batch {claim_batch_id} still collapsed, extracting anyway")
+                        scheduler.wait_seconds += time.monotonic() - wait_started
+
+                    # OPTIMIZATION 4: Parallel review extraction
+                    # Collect new reviews first, then process them in parallel
+                    new_review_elements = []
+                    if claimed['reviews']:
+                        claimed_elements = await page.query_selector_all(f'[data-sl-seen="{claim_batch_id}"]')
+                        if len(claimed_elements) != len(claimed['reviews']):
+                            self.logger.debug(
+                                f"Claimed {len(claimed['reviews'])} reviews but found {len(claimed_elements)} nodes"
+                            )
+                            claimed_elements = claimed_elements[:len(claimed['reviews'])]
+
+                        batch_ids = set()
+                        for review_elem, claimed_review in zip(claimed_elements, claimed['reviews']):
+                            review_id = claimed_review['id']
+                            if not review_id and claimed_review['identity']:
+                                # Stable across runs: no relative date, no hash() salt
+                                review_id = synthetic_review_id(claimed_review['identity'])
+                            if not review_id or review_id in batch_ids:
+                                continue
 
-                # Process new reviews in parallel (batches of 5 for efficiency)
-                if new_review_elements:
-                    batch_size = 5
-                    for i in range(0, len(new_review_elements), batch_size):
-                        batch = new_review_elements[i:i + batch_size]
-
-                        # Extract reviews in parallel using asyncio.gather
-                        extraction_tasks = [
-                            self.extract_review_data(elem, place_name, place_url, review_id)
-                            for elem, review_id in batch
-                        ]
-                        review_results = await asyncio.gather(*extraction_tasks, return_exceptions=True)
-
-                        # Yield the successfully extracted reviews
-                        for idx, review_data in enumerate(review_results):
-                            if isinstance(review_data, Exception):
-                                self.logger.debug(f"Error extracting review: {review_data}")
+                            # Emitted reviews are added to seen_reviews by the caller
+                            key = review_id_key(review_id)
+                            if owns_seen_reviews:
+                                if not seen_reviews.add(key):
+                                    continue
+                            elif key in seen_reviews:
                                 continue
+                            batch_ids.add(review_id)
+                            new_review_elements.append((review_elem, review_id))
 
-                            if review_data:
-                                # Add internal tracking ID
-                                review_data['_review_id'] = batch[idx][1]
-                                yield review_data
-
-                # OPTIMIZATION 5: Smart scroll detection - check if we're at bottom
-                current_scroll_height = await page.evaluate(f'''
-                    () => {{
-                        const element = document.querySelector('{working_scrollable_selector or scrollable_selectors[0]}') ||
-                                        document.querySelector('{scrollable_selectors[1]}') ||
-                                        document.querySelector('{scrollable_selectors[2]}') ||
-                                        document.querySelector('{scrollable_selectors[3]}');
-                        if (element) {{
-                            return element.scrollHeight;
-                        }}
-                        return document.body.scrollHeight;
-                    }}
-                ''')
+                    # OPTIMIZATION 6: Serialize the whole batch in a single page.evaluate call
+                    if new_review_elements and self.extraction_mode == 'batch':
+                        review_results = await self.extract_reviews_batch(
+                            page, new_review_elements, place_name, place_url
+                        )
+                        for review_data in review_results:
+                            yield review_data
+
+                    # Process new reviews in parallel (batches of 5 for efficiency)
+                    elif new_review_elements:
+                        batch_size = 5
+                        for i in range(0, len(new_review_elements), batch_size):
+                            batch = new_review_elements[i:i + batch_size]
+
+                            # Extract reviews in parallel using asyncio.gather
+                            extraction_tasks = [
+                                self.extract_review_data(elem, place_name, place_url, review_id)
+                                for elem, review_id in batch
+                            ]
+                            review_results = await asyncio.gather(*extraction_tasks, return_exceptions=True)
+
+                            # Yield the successfully extracted reviews
+                            for idx, review_data in enumerate(review_results):
+                                if isinstance(review_data, Exception):
+                                    self.logger.debug(f"Error extracting review: {review_data}")
+                                    continue
+
+                                if review_data:
+                                    # Add internal tracking ID
+                                    review_data['_review_id'] = batch[idx][1]
+                                    yield review_data
+
+                    if new_review_elements:
+                        scheduler.record_progress()
+                    if progress is not None:
+                        progress.add_reviews([
+                            claimed_review['id'] or claimed_review['identity']
+                            for claimed_review in claimed['reviews'] if claimed_review['id'] or claimed_review['identity']
+                        ])
+                        if progress.complete:
+                            self.logger.info(
+                                f"Loaded all {progress.total_reviews} reviews of the place header, ending"
+                            )
+                            self.crawler.stats.inc_value('maps/places_total_reached')
+                            break
 
-                # OPTIMIZATION 3: Use cached selector or find working one
-                scroll_success = False
-                if working_scrollable_selector:
-                    # Use cached selector
-                    scroll_success = await page.evaluate(f'''
-                        () => {{
-                            const element = document.querySelector('{working_scrollable_selector}');
-                            if (element) {{
-                                element.scrollTop = element.scrollHeight;
-                                return true;
-                            }}
-                            return false;
-                        }}
-                    ''')
+                    # OPTIMIZATION 8: Scroll and wait for new review nodes in a single evaluate.
+                    # The timeout follows the observed review latency and backs off while
+                    # nothing arrives; the loop only ends once the end of the list is confirmed.
+                    scheduler.record_work(time.monotonic() - work_started)
+                    container_selectors = scrollable_selectors
+                    if working_scrollable_selector:
+                        container_selectors = [working_scrollable_selector] + scrollable_selectors
+
+                    # Never wait past the deadline
+                    timeout = scheduler.timeout
+                    remaining = bounds.remaining_seconds if bounds is not None else None
+                    if remaining is not None:
+                        timeout = max(0.05, min(timeout, remaining))
+
+                    waited = await page.evaluate(SCROLL_AND_WAIT, {
+                        'containerSelectors': container_selectors,
+                        'timeout': int(timeout * 1000),
+                        'nudge': scheduler.nudge,
+                    })
+                    work_started = time.monotonic()
+                    scheduler.record_wait(waited['elapsed'] / 1000, waited['foundNew'])
+                    self.metrics.record_phase('scroll_iteration', time.monotonic() - iteration_started, place_url)
+
+                    if waited['container'] and waited['container'] != working_scrollable_selector:
+                        working_scrollable_selector = waited['container']
+                        cached_selectors['scrollable_div'] = working_scrollable_selector
+
+                    scroll_count += 1
+                    consecutive_errors = 0
+
+                    if scheduler.end_confirmed(waited['atBottom'], progress):
+                        self.logger.info(
+                            f"End of reviews confirmed after {scheduler.empty_waits} empty waits "
+                            f"({scheduler.empty_wait_seconds:.1f}s), ending"
+                        )
+                        break
 
-                if not scroll_success:
-                    # Try selectors and cache the working one
-                    for selector in scrollable_selectors:
-                        scroll_success = await page.evaluate(f'''
-                            () => {{
-                                const element = document.querySelector('{selector}');
-                                if (element) {{
-                                    element.scrollTop = element.scrollHeight;
-                                    return true;
-                                }}
-                                return false;
-                            }}
-                        ''')
-                        if scroll_success:
-                            working_scrollable_selector = selector
-                            self.cached_selectors['scrollable_div'] = selector
-                            break
+                    # Log progress
+                    if scroll_count % 5 == 0:
+                        progress_text = progress.describe() if progress is not None else ''
+                        self.logger.info(f"Scroll {scroll_count}: Found {len(seen_reviews)} reviews so far{progress_text}")
 
-                # Fallback scroll
-                await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
+                except Exception as e:
+                    self.logger.warning(f"Error during incremental scroll {scroll_count}: {e}")
+                    consecutive_errors += 1
+                    # A crashed or closed page fails every step: give up so the checkpoint is kept
+                    if page.is_closed() or consecutive_errors >= 5:
+                        raise
+                    continue
 
-                # SPEED UP: Reduced wait time to 80ms for faster scraping
-                await page.wait_for_timeout(80)  # REDUCED: 300ms → 150ms → 80ms
+        finally:
+            # Also reached when the consumer stops early (watermark, bounds)
+            self.logger.info(f"Scroll timing for {place_name}: {scheduler.summary()}")
+            scheduler.finish(self.crawler.stats)
 
-                scroll_count += 1
+    async def fast_forward(self, page, resume_checkpoint, scheduler, cached_selectors, until_id=None):
+        """
+        Scroll a resumed place past the reviews its checkpoint already holds,
+        or past every review up to a cursor's review (until_id).
+        Their nodes are marked as claimed, so they are not expanded or extracted again.
+        """
+        skip_ids = []
+        if resume_checkpoint is not None:
+            skip_ids = [key[3:] for key in resume_checkpoint.emitted_keys() if key.startswith('id:')]
+        if not skip_ids and not until_id:
+            return
+        container_selectors = SCROLLABLE_SELECTORS
+        if cached_selectors.get('scrollable_div'):
+            container_selectors = [cached_selectors['scrollable_div']] + SCROLLABLE_SELECTORS
+
+        with self.metrics.phase('fast_forward'):
+            result = await page.evaluate(FAST_FORWARD_REVIEWS, {
+                'containerSelectors': container_selectors,
+                'skipIds': skip_ids,
+                'target': len(skip_ids),
+                'untilId': until_id,
+                'timeout': int(scheduler.max_timeout * 1000),
+                'maxEmptyWaits': scheduler.end_confirmations,
+            })
+        self.logger.info(
+            f"Fast-forwarded past {result['skipped']}/{len(skip_ids)} checkpointed reviews "
+            f"in {result['scrolls']} scrolls ({result['elapsed'] / 1000:.1f}s)"
+        )
+        self.crawler.stats.inc_value('checkpoint/reviews_fast_forwarded', result['skipped'])
+
+        if until_id and not result['untilFound']:
+            self.logger.warning(f"Cursor review {until_id} not found, scraping from the top")
+            await page.evaluate('''
+                () => document.querySelectorAll('[data-sl-seen="cursor"]')
+                    .forEach((node) => node.removeAttribute('data-sl-seen'))
+            ''')
 
-                # Check if we're still finding new reviews or at bottom
-                new_reviews_found = len(new_review_elements) > 0
-                at_bottom = (current_scroll_height == previous_scroll_height)
+    async def scrape_with_agent(self, page, place_name, place_url, cached_selectors=None, bounds=None):
+        """
+        Let an in-page agent (REVIEWS_AGENT) scroll, expand and serialize the reviews.
 
-                if not new_reviews_found or at_bottom:
-                    no_new_reviews_count += 1
-                    if no_new_reviews_count >= max_no_change_attempts:
-                        self.logger.info(f"No new reviews after {no_new_reviews_count} scroll attempts, ending")
+        The agent pushes every batch through an exposed binding into a bounded
+        queue, so Python makes no round trip per scroll step and the agent
+        pauses whenever the queue is full. With bounds (PlaceBounds) the agent
+        is stopped at the deadline, checked on every batch and while waiting.
+        """
+        if cached_selectors is None:
+            cached_selectors = {}
+
+        profile = profile_for_url(place_url)
+        queue = asyncio.Queue(maxsize=self.settings.getint('MAPS_AGENT_QUEUE_SIZE', 4))
+        idle_timeout = self.settings.getfloat('MAPS_AGENT_IDLE_TIMEOUT', 60)
+        scheduler = ScrollScheduler.from_settings(self.settings)
+
+        async def push(source, message):
+            await queue.put(message)
+
+        await page.evaluate(ANTI_CLICK_STYLE)
+        await page.expose_binding(AGENT_BINDING, push)
+
+        container_selectors = SCROLLABLE_SELECTORS
+        if cached_selectors.get('scrollable_div'):
+            container_selectors = [cached_selectors['scrollable_div']] + SCROLLABLE_SELECTORS
+
+        await page.evaluate(REVIEWS_AGENT, {
+            'binding': AGENT_BINDING,
+            'containerSelectors': container_selectors,
+            'moreSelector': MORE_BUTTON_SELECTOR,
+            'ratingSelectors': profile.rating_selectors,
+            'translationSelectors': profile.translation_selectors,
+            'seeOriginalPhrases': profile.see_original_phrases,
+            'resolveTranslations': self.translation_mode != 'displayed',
+            'translationTimeout': self.translation_timeout_ms,
+            'minTimeout': int(scheduler.min_timeout * 1000),
+            'maxTimeout': int(scheduler.max_timeout * 1000),
+            'initialTimeout': int(scheduler.initial_timeout * 1000),
+            'endConfirmations': scheduler.end_confirmations,
+            'minEndPatience': int(scheduler.min_end_patience * 1000),
+        })
+
+        reviews_received = 0
+        try:
+            while True:
+                # Never wait past the deadline
+                timeout = idle_timeout
+                remaining = bounds.remaining_seconds if bounds is not None else None
+                if remaining is not None:
+                    timeout = max(0.05, min(timeout, remaining))
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    if bounds is not None and bounds.expired():
+                        self.logger.info(f"Deadline of {bounds.deadline_seconds:g}s reached, stopping the in-page agent")
                         break
-                else:
-                    no_new_reviews_count = 0
+                    self.logger.warning(f"In-page agent sent nothing for {idle_timeout}s, ending")
+                    break
+
+                if message['type'] != 'done' and bounds is not None and bounds.expired():
+                    self.logger.info(f"Deadline of {bounds.deadline_seconds:g}s reached, stopping the in-page agent")
+                    break
+
+                if message['type'] == 'done':
+                    agent_stats = message.get('stats') or {}
+                    if message['reason'] == 'error':
+                        self.logger.warning(f"In-page agent failed: {message.get('error')}")
+                    self.logger.info(
+                        f"In-page agent finished ({message['reason']}): {agent_stats.get('reviews', 0)} reviews in "
+                        f"{agent_stats.get('batches', 0)} batches, {agent_stats.get('scrolls', 0)} scrolls, "
+                        f"waited {agent_stats.get('waitMs', 0) / 1000:.2f}s "
+                        f"({agent_stats.get('timeouts', 0)} timeouts), worked {agent_stats.get('workMs', 0) / 1000:.2f}s"
+                    )
+                    if agent_stats.get('container'):
+                        cached_selectors['scrollable_div'] = agent_stats['container']
+                    stats = self.crawler.stats
+                    stats.inc_value('scroll/waits', agent_stats.get('waits', 0))
+                    stats.inc_value('scroll/wait_timeouts', agent_stats.get('timeouts', 0))
+                    stats.inc_value('scroll/wait_seconds', round(agent_stats.get('waitMs', 0) / 1000, 3))
+                    stats.inc_value('scroll/work_seconds', round(agent_stats.get('workMs', 0) / 1000, 3))
+                    break
+
+                for raw in message['reviews']:
+                    review_id = raw.get('id') or (synthetic_review_id(raw['identity']) if raw.get('identity') else None)
+                    review_data = self.build_review_data(raw, place_name, place_url, review_id)
+                    if not review_data:
+                        continue
+                    if raw.get('translation'):
+                        review_data.update(self.translation_fields(raw, raw.get('resolved'), profile))
+                    review_data['_review_id'] = review_id
+                    reviews_received += 1
+                    yield review_data
+        finally:
+            # Stops the agent when the consumer ends early (watermark, bounds)
+            try:
+                await page.evaluate('() => { window.__slAgentStop = true; }')
+            except Exception:
+                pass
+            # Unblock a push that is waiting for queue space
+            while not queue.empty():
+                queue.get_nowait()
+
+    async def scroll_and_capture_network(self, page, place_name, place_url, collector, cached_selectors=None,
+                                         seen_reviews=None, progress=None, bounds=None):
+        """
+        Scroll the reviews pane and decode reviews from the captured RPC responses.
+        No DOM parsing, "More" expansion or translation clicking is needed because
+        the responses carry full text, translations and timestamps.
+        Falls back to DOM scraping when no response could be decoded.
+
+        Waits for decoded responses with the ScrollScheduler timeouts of the DOM
+        loop, and ends when the last response had no next page token or the
+        scheduler confirms the end of the list.
+        """
+        scroll_count = 0
+        reviews_captured = 0
+        scheduler = ScrollScheduler.from_settings(self.settings)
+        work_started = time.monotonic()
+        cached_selectors = cached_selectors if cached_selectors is not None else {}
 
-                previous_scroll_height = current_scroll_height
+        try:
+            while True:
+                if bounds is not None and bounds.expired():
+                    self.logger.info(f"Deadline of {bounds.deadline_seconds:g}s reached, ending")
+                    break
+
+                reviews = collector.drain()
+                if progress is not None:
+                    progress.add_reviews([raw['review_id'] for raw in reviews])
+                for raw in reviews:
+                    review_data = self.build_rpc_review_data(raw, place_name, place_url)
+                    if review_data:
+                        review_data['_review_id'] = raw['review_id']
+                        reviews_captured += 1
+                        yield review_data
+
+                if progress is not None and progress.complete:
+                    self.logger.info(f"Captured all {progress.total_reviews} reviews of the place header, ending")
+                    self.crawler.stats.inc_value('maps/places_total_reached')
+                    break
+
+                scheduler.record_work(time.monotonic() - work_started)
+                container_selectors = SCROLLABLE_SELECTORS
+                if cached_selectors.get('scrollable_div'):
+                    container_selectors = [cached_selectors['scrollable_div']] + SCROLLABLE_SELECTORS
+                at_bottom = True
+                try:
+                    scrolled = await page.evaluate(SCROLL_CONTAINER, {
+                        'containerSelectors': container_selectors,
+                        'nudge': scheduler.nudge,
+                    })
+                    at_bottom = scrolled['atBottom']
+                except Exception as e:
+                    self.logger.warning(f"Error during network capture scroll {scroll_count}: {e}")
+                scroll_count += 1
+
+                # Never wait past the deadline
+                timeout = scheduler.timeout
+                remaining = bounds.remaining_seconds if bounds is not None else None
+                if remaining is not None:
+                    timeout = max(0.05, min(timeout, remaining))
+
+                wait_started = time.monotonic()
+                found_new = await collector.wait_for_reviews(timeout=timeout)
+                scheduler.record_wait(time.monotonic() - wait_started, found_new)
+                work_started = time.monotonic()
+
+                if not found_new:
+                    if reviews_captured == 0 and scheduler.empty_waits >= scheduler.end_confirmations:
+                        self.logger.warning(
+                            f"No reviews decoded from {collector.responses_seen} RPC responses "
+                            f"({collector.decode_errors} decode errors), falling back to DOM extraction"
+                        )
+                        async for review_data in self.scroll_and_scrape_incrementally(
+                            page, place_name, place_url, cached_selectors, seen_reviews=seen_reviews,
+                            progress=progress, bounds=bounds,
+                        ):
+                            yield review_data
+                        return
+
+                    # The last response had no next page token, nothing more to load
+                    if collector.exhausted:
+                        self.logger.info("Last reviews response had no next page token, ending")
+                        break
+                    if scheduler.end_confirmed(at_bottom, progress):
+                        self.logger.info(
+                            f"End of reviews confirmed after {scheduler.empty_waits} empty waits "
+                            f"({scheduler.empty_wait_seconds:.1f}s), ending"
+                        )
+                        break
 
                 # Log progress
                 if scroll_count % 5 == 0:
-                    self.logger.info(f"Scroll {scroll_count}: Found {len(processed_review_ids)} reviews so far")
+                    progress_text = progress.describe() if progress is not None else ''
+                    self.logger.info(f"Scroll {scroll_count}: Captured {reviews_captured} reviews so far{progress_text}")
+        finally:
+            self.logger.info(f"Scroll timing for {place_name}: {scheduler.summary()}")
+            scheduler.finish(self.crawler.stats)
 
-            except Exception as e:
-                self.logger.warning(f"Error during incremental scroll {scroll_count}: {e}")
-                continue
+    def build_rpc_review_data(self, raw, place_name, place_url):
+        """Build a review dict from a review decoded out of a reviews RPC response"""
+        reviewer_name = raw.get('reviewer_name') or 'Anonymous'
+        review_text = raw.get('review_text') or ''
+
+        # If review text is empty or just whitespace, skip this review
+        if not review_text.strip():
+            self.logger.debug(f"Skipping review with empty text by {reviewer_name}")
+            return None
+
+        translated_text = raw.get('translated_text')
+        review_id = raw.get('review_id')
+
+        return {
+            'place_name': place_name,
+            'place_url': place_url,
+            'data_review_id': review_id if review_id and str(review_id).isdigit() else None,
+            'reviewer_name': reviewer_name.strip(),
+            'rating': raw.get('rating'),
+            'review_text': review_text.strip(),
+            'translated_text': translated_text.strip() if translated_text else None,
+            'review_date': self.resolve_review_date(raw.get('timestamp'), raw.get('relative_date')),
+            'original_language': raw.get('original_language') or 'Same as interface language',
+            'is_translated': translated_text is not None,
+            'response_from_owner': self.clean_owner_response(raw.get('response_from_owner')),
+            'number_of_photos': raw.get('number_of_photos') or 0,
+            'scraped_at': datetime.now().isoformat(),
+        }
 
     async def expand_all_reviews(self, page):
         """Batch expand all 'More' buttons to get full review text"""
@@ -680,8 +1531,226 @@ class MapsReviewsSpider(scrapy.Spider):
         except Exception as e:
             self.logger.error(f"Error in scroll_reviews: {e}")
     
+    async def extract_reviews_batch(self, page, review_elements, place_name, place_url):
+        """
+        Extract a batch of reviews with a single page.evaluate round trip.
+
+        Args:
+            review_elements: list of (element_handle, review_id) tuples
+
+        Returns a list of review dicts (same schema as extract_review_data)
+        with the internal '_review_id' tracking field set.
+        """
+        profile = profile_for_url(place_url)
+        batch_started = time.monotonic()
+        try:
+            raw_reviews = await page.evaluate(EXTRACT_REVIEWS_BATCH, {
+                'elements': [elem for elem, _ in review_elements],
+                'ratingSelectors': profile.rating_selectors,
+                'translationSelectors': profile.translation_selectors,
+            })
+        except Exception as e:
+            self.logger.warning(f"Batch extraction failed, falling back to per-element extraction: {e}")
+            raw_reviews = [None] * len(review_elements)
+
+        # Normalize the relative dates of the whole batch in one call,
+        # build_review_data() then reads them from the parser cache
+        self.date_parser.parse_many([raw['date_text'] for raw in raw_reviews if raw and not raw.get('timestamp')])
+
+        # Translated reviews: resolve all of them in one evaluate, or leave them to the element path
+        translated = [
+            index for index, raw in enumerate(raw_reviews)
+            if raw and raw.get('translation')
+        ]
+        translations = {}
+        if translated and self.translation_mode == 'batch':
+            with self.metrics.phase('translation', place_url):
+                translations = await self.resolve_translations_batch(
+                    page, [review_elements[index][0] for index in translated], translated, profile
+                )
+
+        reviews = []
+        fallback_elements = []
+        for index, ((elem, review_id), raw) in enumerate(zip(review_elements, raw_reviews)):
+            if raw is None or (raw.get('translation') and self.translation_mode == 'element'):
+                fallback_elements.append((elem, review_id))
+                continue
+            if raw.get('translation') and self.translation_mode == 'batch' and index not in translations:
+                # The batch toggle did not resolve this review, retry it on its own
+                fallback_elements.append((elem, review_id))
+                continue
+
+            review_data = self.build_review_data(raw, place_name, place_url, review_id)
+            if review_data:
+                if raw.get('translation'):
+                    review_data.update(self.translation_fields(raw, translations.get(index), profile))
+                review_data['_review_id'] = review_id
+                reviews.append(review_data)
+
+        batch_size = 5
+        for i in range(0, len(fallback_elements), batch_size):
+            batch = fallback_elements[i:i + batch_size]
+            review_results = await asyncio.gather(
+                *[self.extract_review_data(elem, place_name, place_url, review_id) for elem, review_id in batch],
+                return_exceptions=True
+            )
+            for (_, review_id), review_data in zip(batch, review_results):
+                if isinstance(review_data, Exception):
+                    self.logger.debug(f"Error extracting review: {review_data}")
+                    continue
+                if review_data:
+                    review_data['_review_id'] = review_id
+                    reviews.append(review_data)
+
+        batch_seconds = time.monotonic() - batch_started
+        self.metrics.record_phase('extraction_batch', batch_seconds, place_url)
+        self.metrics.observe('extraction_batch_seconds', batch_seconds)
+        return reviews
+
+    async def resolve_translations_batch(self, page, elements, indexes, profile):
+        """
+        Toggle the translation buttons of several reviews at once and read both texts.
+
+        Returns {index: resolved translation} for the reviews whose toggle could
+        be read; the others are left out so the caller can fall back.
+        """
+        try:
+            result = await page.evaluate(RESOLVE_TRANSLATIONS, {
+                'elements': elements,
+                'translationSelectors': profile.translation_selectors,
+                'seeOriginalPhrases': profile.see_original_phrases,
+                'timeout': self.translation_timeout_ms,
+            })
+        except Exception as e:
+            self.logger.warning(f"Batch translation failed, falling back to per-element extraction: {e}")
+            return {}
+
+        if not result['settled']:
+            self.logger.debug(f"Translation toggle of {len(elements)} reviews timed out, using the state reached")
+        return {
+            index: resolved
+            for index, resolved in zip(indexes, result['reviews'])
+            if resolved and resolved.get('after') is not None
+        }
+
+    def translation_fields(self, raw, resolved, profile):
+        """
+        Original/translated text of a review with a translation button.
+
+        resolved is one entry of RESOLVE_TRANSLATIONS; without it (translation_mode
+        'displayed') the displayed text is kept and only the language is read.
+        """
+        label = (resolved or raw['translation']).get('label')
+        lang_match = profile.original_language_re.search(label) if label else None
+        fields = {'original_language': lang_match.group(1) if lang_match else None}
+        if not resolved:
+            return fields
+
+        before = resolved['before']
+        after = resolved['after']
+        label_after = (resolved.get('label_after') or '').lower()
+
+        if any(phrase in label_after for phrase in profile.see_original_phrases):
+            # Toggled to the translation (and back again to read the original)
+            fields.update(review_text=(resolved.get('final') or before).strip(), translated_text=after, is_translated=True)
+        elif any(phrase in label_after for phrase in profile.translated_phrases):
+            # Toggled from the translation to the original
+            fields.update(review_text=after.strip(), translated_text=before, is_translated=True)
+        else:
+            # Unable to determine, keep the displayed text
+            translated_text = after if after != before else None
+            fields.update(translated_text=translated_text, is_translated=translated_text is not None)
+
+        if fields['translated_text']:
+            fields['translated_text'] = fields['translated_text'].strip()
+        return fields
+
+    def build_review_data(self, raw, place_name, place_url, data_review_id=None):
+        """Build a review dict from the plain object serialized by EXTRACT_REVIEWS_BATCH"""
+        reviewer_name = raw.get('reviewer_name') or 'Anonymous'
+        review_text = raw.get('review_text') or ''
+
+        # If review text is empty or just whitespace, skip this review
+        if not review_text.strip():
+            self.logger.debug(f"Skipping review with empty text by {reviewer_name}")
+            return None
+
+        rating = self.parse_rating(raw.get('rating_labels'), raw.get('img_labels'))
+        if rating is None:
+            self.logger.debug(f"Could not extract rating for review by {reviewer_name}")
+
+        return {
+            'place_name': place_name,
+            'place_url': place_url,
+            'data_review_id': data_review_id if data_review_id and str(data_review_id).isdigit() else None,
+            'reviewer_name': reviewer_name.strip(),
+            'rating': rating,
+            'review_text': review_text.strip(),
+            'translated_text': None,
+            'review_date': self.resolve_review_date(raw.get('timestamp'), raw.get('date_text')),
+            # No translation button means the review is in the interface language
+            'original_language': 'Same as interface language',
+            'is_translated': False,
+            'response_from_owner': self.clean_owner_response(raw.get('owner_response')),
+            'number_of_photos': raw.get('photo_count') or 0,
+            'scraped_at': datetime.now().isoformat(),
+        }
+
+    def clean_owner_response(self, owner_response):
+        owner_response = (owner_response or '').strip()
+        return owner_response or None
+
+    def record_review_attachments(self, review_data):
+        """Count owner responses and photos of emitted reviews in the Scrapy stats"""
+        stats = self.crawler.stats
+        if review_data.get('response_from_owner'):
+            stats.inc_value('maps/owner_responses')
+        if review_data.get('number_of_photos'):
+            stats.inc_value('maps/reviews_with_photos')
+            stats.inc_value('maps/review_photos', review_data['number_of_photos'])
+
+    def parse_rating(self, rating_labels, img_labels=None):
+        """
+        Parse a star rating from aria-labels such as "5 stars" or "4 bintang".
+
+        rating_labels come from the language-specific rating selectors and are
+        trusted as-is; img_labels are any span[role="img"] labels and are only
+        accepted when they hold a reasonable rating (1-5).
+        """
+        for aria_label in rating_labels or []:
+            rating_match = re.search(r'(\d+(?:[.,]\d+)?)', aria_label)
+            if rating_match:
+                # Replace comma with dot for float conversion (some locales use comma)
+                return float(rating_match.group(1).replace(',', '.'))
+
+        for aria_label in img_labels or []:
+            rating_match = re.search(r'(\d+(?:[.,]\d+)?)', aria_label)
+            if rating_match:
+                rating = float(rating_match.group(1).replace(',', '.'))
+                if 1 <= rating <= 5:
+                    return rating
+
+        return None
+
+    def resolve_review_date(self, review_timestamp, review_date_raw):
+        """Convert a DOM timestamp to a date string, falling back to the relative date text"""
+        if review_timestamp:
+            try:
+                timestamp_str = str(review_timestamp).strip()
+                if not timestamp_str.isdigit():
+                    # Not a unix timestamp, might be ISO format
+                    return timestamp_str
+                # Unix timestamp in milliseconds or seconds
+                timestamp_int = int(timestamp_str) / 1000 if len(timestamp_str) > 10 else int(timestamp_str)
+                return datetime.fromtimestamp(timestamp_int).strftime('%Y-%m-%d %H:%M:%S')
+            except Exception as e:
+                self.logger.debug(f"Could not convert timestamp '{review_timestamp}': {e}")
+
+        return self.parse_relative_date(review_date_raw or 'Unknown')
+
     async def extract_review_data(self, review_elem, place_name, place_url, data_review_id=None):
         """Extract data from a single review element"""
+        profile = profile_for_url(place_url)
         try:
             # Reviewer name
             reviewer_name_elem = await review_elem.query_selector('div.d4r55')
@@ -690,16 +1759,7 @@ class MapsReviewsSpider(scrapy.Spider):
             # Rating (star rating) - support multiple languages
             rating = None
             # Try multiple selectors for different languages
-            rating_selectors = [
-                'span[role="img"][aria-label*="star"]',      # English
-                'span[role="img"][aria-label*="bintang"]',   # Indonesian
-                'span[role="img"][aria-label*="estrella"]',  # Spanish
-                'span[role="img"][aria-label*="étoile"]',    # French
-                'span[role="img"][aria-label*="Stern"]',     # German
-                'span[role="img"][aria-label*="stella"]',    # Italian
-            ]
-
-            for selector in rating_selectors:
+            for selector in profile.rating_selectors:
                 rating_elem = await review_elem.query_selector(selector)
                 if rating_elem:
                     aria_label = await rating_elem.get_attribute('aria-label')
@@ -754,27 +1814,9 @@ class MapsReviewsSpider(scrapy.Spider):
             try:
                 # Look for translation toggle button
                 # Google Maps shows these when a review can be translated
-                translation_button_selectors = [
-                    'button[aria-label*="Translated"]',  # English - "Translated by Google"
-                    'button[aria-label*="See original"]',  # English
-                    'button[aria-label*="Lihat terjemahan"]',  # Indonesian - "See translation"
-                    'button[aria-label*="Lihat versi asli"]',  # Indonesian - "See original"
-                    'button[aria-label*="Lihat asli"]',  # Indonesian (alternative)
-                    'button[aria-label*="Diterjemahkan"]',  # Indonesian - "Translated"
-                    'button[aria-label*="Ver traducción"]',  # Spanish - "See translation"
-                    'button[aria-label*="Ver original"]',  # Spanish - "See original"
-                    'button[aria-label*="Voir la traduction"]',  # French
-                    'button[aria-label*="Voir l\'original"]',  # French
-                    'button[aria-label*="Übersetzung ansehen"]',  # German
-                    'button[aria-label*="Original ansehen"]',  # German
-                    'button[aria-label*="Vedi traduzione"]',  # Italian
-                    'button[aria-label*="Vedi originale"]',  # Italian
-                    'button.kyuRq.fontTitleSmall',  # Class-based selector
-                ]
-
                 translation_button = None
                 # Check if there's a translation button
-                for selector in translation_button_selectors:
+                for selector in profile.translation_selectors:
                     translation_button = await review_elem.query_selector(selector)
                     if translation_button:
                         # Get the button's aria-label to understand current state
@@ -786,7 +1828,7 @@ class MapsReviewsSpider(scrapy.Spider):
                         # Try to extract the original language from aria-label
                         if aria_label:
                             # Examples: "Translated by Google (Original in Japanese)", "Lihat asli (Jepang)"
-                            lang_match = re.search(r'\((?:Original in |Asli dalam )?([^)]+)\)', aria_label)
+                            lang_match = profile.original_language_re.search(aria_label)
                             if lang_match:
                                 original_language = lang_match.group(1)
 
@@ -812,7 +1854,7 @@ class MapsReviewsSpider(scrapy.Spider):
                                 aria_label_after = await translation_button.get_attribute('aria-label')
 
                                 # If button now says "See original", we're viewing translation
-                                if aria_label_after and any(phrase in aria_label_after.lower() for phrase in ['see original', 'lihat asli', 'lihat versi asli', 'ver original', 'voir l\'original']):
+                                if aria_label_after and any(phrase in aria_label_after.lower() for phrase in profile.see_original_phrases):
                                     # Current view is translated
                                     translated_text = toggled_text
                                     is_translated = True
@@ -824,7 +1866,7 @@ class MapsReviewsSpider(scrapy.Spider):
                                     if review_text_elem_final:
                                         review_text = await review_text_elem_final.inner_text()
                                 # If button now says "See translation", we're viewing original
-                                elif aria_label_after and any(phrase in aria_label_after.lower() for phrase in ['translated', 'diterjemahkan', 'traducido', 'traduit']):
+                                elif aria_label_after and any(phrase in aria_label_after.lower() for phrase in profile.translated_phrases):
                                     # Current view is original, previous was translated
                                     translated_text = current_text
                                     review_text = toggled_text
@@ -849,6 +1891,13 @@ class MapsReviewsSpider(scrapy.Spider):
                 original_language = 'Unknown'
                 is_translated = False
 
+            # Timestamp attributes, owner response and photos in one round trip
+            try:
+                element_fields = await review_elem.evaluate(REVIEW_ELEMENT_FIELDS)
+            except Exception as e:
+                self.logger.debug(f"Could not read the review element fields: {e}")
+                element_fields = {}
+
             # Review date - extract actual timestamp from DOM
             review_date = 'Unknown'
             review_timestamp = None
@@ -859,13 +1908,13 @@ class MapsReviewsSpider(scrapy.Spider):
                 # Google Maps stores timestamps in data-review-id or other attributes
 
                 # Method 1: Check review element's data-sort-time attribute
-                timestamp_value = await review_elem.get_attribute('data-sort-time')
+                timestamp_value = element_fields.get('sort_time')
                 if timestamp_value:
                     review_timestamp = timestamp_value
 
                 # Method 2: Check for jslog attribute which may contain timestamp
                 if not review_timestamp:
-                    jslog = await review_elem.get_attribute('jslog')
+                    jslog = element_fields.get('jslog')
                     if jslog:
                         # Try to extract timestamp from jslog string
                         timestamp_match = re.search(r'(\d{10,13})', jslog)
@@ -971,6 +2020,8 @@ class MapsReviewsSpider(scrapy.Spider):
                 'review_date': review_date,
                 'original_language': original_language,
                 'is_translated': is_translated,
+                'response_from_owner': self.clean_owner_response(element_fields.get('owner_response')),
+                'number_of_photos': element_fields.get('photo_count') or 0,
                 'scraped_at': datetime.now().isoformat(),
             }
 
@@ -984,5 +2035,11 @@ class MapsReviewsSpider(scrapy.Spider):
         """Handle request errors"""
         self.logger.error(f"Request failed: {failure}")
         page = failure.request.meta.get('playwright_page')
-        if page:
-            await page.close()
\ No newline at end of file
+        await self.release_place(page, failure.request.meta.get('pool_slot'))
+        self.crawler.signals.send_catch_log(
+            signal=place_finished,
+            request=failure.request,
+            place_url=failure.request.meta.get('place_url'),
+            reviews_scraped=0,
+            failure=failure,
+        )
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""
+Per-place scrape state for incremental runs.
+
+A PlaceStateStore keeps one JSON document with the watermark (newest review
+id and date) of every place; a WatermarkTracker decides when a newest-first
+review stream has reached reviews that an earlier run already collected.
+"""
+
+import json
+import os
+import re
+import tempfile
+from datetime import datetime, timedelta
+
+
+DATE_PREFIX_RE = re.compile(r'^(\d{4}-\d{2}-\d{2})')
+
+
+def write_json_atomic(path, data):
+    """Write JSON through a temporary file so readers never see a partial document"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+class PlaceStateStore:
+    """JSON file of {place_key: state dict}, rewritten atomically on every update"""
+
+    def __init__(self, path):
+        self.path = path
+        self.places = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.places = json.load(f)
+
+    def get(self, place_key):
+        return self.places.get(place_key, {})
+
+    def update(self, place_key, **fields):
+        state = dict(self.get(place_key), **fields)
+        state['updated_at'] = datetime.now().isoformat()
+        self.places[place_key] = state
+        self.save()
+        return state
+
+    def save(self):
+        write_json_atomic(self.path, self.places)
+
+
+class WatermarkTracker:
+    """
+    Watches a newest-first review stream for the watermark of a previous run.
+
+    The stream has crossed the watermark when it reaches the watermark review
+    id, or a review dated more than slack_days before the watermark date
+    (relative dates such as "2 bulan lalu" are approximate). Review dates must
+    never increase along the stream; if they do, the sort order is not
+    newest-first and the tracker stops reporting crossings.
+    """
+
+    def __init__(self, review_id=None, review_date=None, slack_days=0):
+        self.review_id = review_id
+        self.cutoff_date = None
+        if review_date:
+            match = DATE_PREFIX_RE.match(str(review_date))
+            if not match:
+                raise ValueError(f"watermark_date must start with YYYY-MM-DD, got '{review_date}'")
+            cutoff = datetime.strptime(match.group(1), '%Y-%m-%d') - timedelta(days=slack_days)
+            self.cutoff_date = cutoff.strftime('%Y-%m-%d')
+
+        self.order_violated = False
+        self.previous_date = None
+
+    @property
+    def active(self):
+        return bool(self.review_id or self.cutoff_date) and not self.order_violated
+
+    def crossed(self, review_id, review_date):
+        """Observe the next review of the stream, return True once the watermark is reached"""
+        match = DATE_PREFIX_RE.match(str(review_date or ''))
+        date = match.group(1) if match else None
+
+        if date:
+            if self.previous_date and date > self.previous_date:
+                self.order_violated = True
+            self.previous_date = date
+
+        if not self.active:
+            return False
+        if self.review_id and review_id == self.review_id:
+            return True
+        return bool(self.cutoff_date and date and date < self.cutoff_date)
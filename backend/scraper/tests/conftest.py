@@ -0,0 +1,81 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from scraper.replay_server import ReplayHandler, load_recordings
+
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FEATURE_ID = '0x1:0x2'
+PLACE_URL = f'https://www.google.com/maps/place/Foo+Cafe/data=!4m2!3m1!1s{FEATURE_ID}'
+
+
+class HttpCrawl:
+    """Result of one maps_reviews_http crawl: the exported items and the log"""
+
+    def __init__(self, items, log, returncode):
+        self.items = items
+        self.log = log
+        self.returncode = returncode
+
+    @property
+    def review_ids(self):
+        return [item['review_id'] for item in self.items]
+
+
+@pytest.fixture
+def replay_crawl(tmp_path):
+    """
+    Run the maps_reviews_http spider against scraper/replay_server.py serving
+    the given page bodies of one place, in order.
+    """
+    servers = []
+
+    def crawl(pages, *spider_args, settings=None):
+        place_dir = tmp_path / 'recordings' / FEATURE_ID.replace(':', '_')
+        place_dir.mkdir(parents=True, exist_ok=True)
+        for number, body in enumerate(pages):
+            (place_dir / f'{number:04d}.txt').write_bytes(body)
+
+        handler = type('Handler', (ReplayHandler,), {'recordings': load_recordings(str(place_dir.parent))})
+        server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        servers.append(server)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        items_file = tmp_path / 'items.jsonl'
+        command = [
+            sys.executable, '-m', 'scrapy', 'crawl', 'maps_reviews_http',
+            '-a', f'url={PLACE_URL}',
+            '-a', f'endpoint=http://127.0.0.1:{server.server_port}/maps/rpc/listugcposts',
+            '-O', f'{items_file}:jsonlines',
+        ]
+        for arg in spider_args:
+            command += ['-a', arg]
+        crawl_settings = {
+            'DOWNLOAD_DELAY': '0',
+            'AUTOTHROTTLE_ENABLED': '0',
+            'LOG_LEVEL': 'INFO',
+            'MAPS_SELECTOR_CACHE_FILE': 'off',
+            **(settings or {}),
+        }
+        for name, value in crawl_settings.items():
+            command += ['-s', f'{name}={value}']
+
+        process = subprocess.run(command, cwd=PROJECT_DIR, capture_output=True, text=True, timeout=120)
+        items = []
+        if items_file.exists():
+            with open(items_file, 'r', encoding='utf-8') as f:
+                items = [json.loads(line) for line in f if line.strip()]
+        return HttpCrawl(items, process.stderr, process.returncode)
+
+    yield crawl
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,30 @@
+"""
+Builders of listugcposts reviews RPC response bodies, in the field layout
+decoded by scraper/rpc.py (UGC_PATHS).
+"""
+
+import json
+
+from scraper.rpc import XSSI_PREFIX
+
+
+def rpc_review(review_id, text='', reviewer='user', rating=5, timestamp=1700000000000, relative_date='2 hari lalu',
+               photos=0, owner_response=None, translated_text=None, language=None):
+    """One review entry, wrapped in the one-element list of listugcposts"""
+    texts = [[text]] if text else None
+    if texts and translated_text:
+        texts.append([translated_text])
+    details = [[rating], None, [None] * photos] + [None] * 11 + [[language] if language else None, texts]
+    entry = [
+        review_id,
+        [None, None, timestamp, None, [None, None, None, None, None, [reviewer]], None, relative_date],
+        details,
+    ]
+    if owner_response:
+        entry.append([None] * 14 + [[[owner_response]]])
+    return [entry]
+
+
+def rpc_page(reviews, next_page_token=None):
+    """Response body of one reviews page"""
+    return (XSSI_PREFIX + '\n' + json.dumps([None, next_page_token, reviews])).encode('utf-8')
@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+from scrapy.utils.test import get_crawler
+
+from scraper.bounds import PlaceBounds
+from scraper.page_scripts import REVIEWS_AGENT
+from scraper.src.spiders.maps_reviews_spiders import MapsReviewsSpider
+
+
+PLACE_URL = 'https://www.google.com/maps/place/Foo'
+
+
+class FakeAgentPage:
+    """Page whose in-page agent pushes the given batches, then goes quiet"""
+
+    def __init__(self, batches, delay=0.0):
+        self.batches = batches
+        self.delay = delay
+        self.push = None
+        self.stopped = False
+        self.task = None
+
+    async def expose_binding(self, name, callback):
+        self.push = callback
+
+    async def evaluate(self, script, arg=None):
+        if script == REVIEWS_AGENT:
+            self.task = asyncio.ensure_future(self.run())
+        elif '__slAgentStop = true' in script:
+            self.stopped = True
+
+    async def run(self):
+        for batch in self.batches:
+            await asyncio.sleep(self.delay)
+            await self.push(None, {'type': 'batch', 'reviews': batch})
+
+
+def agent_spider():
+    crawler = get_crawler(MapsReviewsSpider, {'MAPS_AGENT_IDLE_TIMEOUT': 30})
+    spider = MapsReviewsSpider(url=PLACE_URL, extraction_source='agent')
+    spider._set_crawler(crawler)
+    return spider
+
+
+def raw_review(review_id):
+    return {'id': review_id, 'reviewer_name': 'Budi', 'rating_labels': ['5 bintang'], 'review_text': 'Enak',
+            'date_text': '2 hari lalu'}
+
+
+async def collect(spider, page, bounds):
+    return [review async for review in spider.scrape_with_agent(page, 'Foo', PLACE_URL, bounds=bounds)]
+
+
+def test_deadline_stops_an_idle_agent():
+    spider = agent_spider()
+    page = FakeAgentPage([[raw_review('a')]])
+    bounds = PlaceBounds(deadline_seconds=0.3)
+
+    started = time.monotonic()
+    reviews = asyncio.run(collect(spider, page, bounds))
+
+    assert time.monotonic() - started < 5
+    assert [review['_review_id'] for review in reviews] == ['a']
+    assert bounds.reason == 'deadline'
+    assert page.stopped
+
+
+def test_batches_after_the_deadline_are_not_emitted():
+    spider = agent_spider()
+    page = FakeAgentPage([[raw_review('a')], [raw_review('b')]], delay=0.2)
+    bounds = PlaceBounds(deadline_seconds=0.3)
+
+    reviews = asyncio.run(collect(spider, page, bounds))
+
+    assert [review['_review_id'] for review in reviews] == ['a']
+    assert bounds.reason == 'deadline'
@@ -0,0 +1,85 @@
+import base64
+import json
+import time
+
+import pytest
+
+from scraper.bounds import PlaceBounds, decode_cursor, encode_cursor, parse_since
+
+
+def test_cursor_round_trip():
+    cursor = {'place': '0x1:0x2', 'review_id': 'ChZDSUhN', 'emitted': 120, 'sort': 'newest', 'token': 'CAE='}
+    token = encode_cursor(cursor)
+    assert '=' not in token
+    assert decode_cursor(token) == dict(cursor, v=1)
+
+
+def test_cursor_round_trip_keeps_non_ascii_text():
+    cursor = {'place': 'https://www.google.com/maps/place/Kopi+Kenangan', 'review_id': 'x', 'name': 'Café Sénja'}
+    assert decode_cursor(encode_cursor(cursor))['name'] == 'Café Sénja'
+
+
+@pytest.mark.parametrize('token', [
+    'not a cursor!',
+    encode_cursor({'place': ''}),
+    base64.urlsafe_b64encode(b'[1, 2]').decode('ascii'),
+    # A cursor of another version
+    base64.urlsafe_b64encode(json.dumps({'place': '0x1:0x2', 'v': 2}).encode('utf-8')).decode('ascii'),
+])
+def test_invalid_cursors_are_rejected(token):
+    with pytest.raises(ValueError):
+        decode_cursor(token)
+
+
+@pytest.mark.parametrize('value, expected', [
+    (None, None),
+    ('', None),
+    ('2025-01-31', '2025-01-31'),
+    ('2025-01-31T10:00:00', '2025-01-31'),
+])
+def test_parse_since(value, expected):
+    assert parse_since(value) == expected
+
+
+def test_parse_since_rejects_other_formats():
+    with pytest.raises(ValueError):
+        parse_since('31/01/2025')
+
+
+def test_bounds_record_the_first_stop_reason():
+    bounds = PlaceBounds(max_reviews=2, since='2025-01-31', slack_days=30)
+    assert bounds.active
+    assert not bounds.full(1)
+    assert bounds.full(2)
+    assert bounds.beyond_since('2024-11-01')
+    assert bounds.reason == 'max_reviews'
+
+
+def test_bounds_since_filters_before_it_stops():
+    bounds = PlaceBounds(since='2025-01-31', slack_days=30)
+    assert bounds.too_old('2025-01-15')
+    assert not bounds.beyond_since('2025-01-15')
+    assert bounds.beyond_since('2024-12-15')
+    assert bounds.reason == 'since'
+
+    bounds = PlaceBounds(since='2025-01-31')
+    bounds.stop_at_since = False
+    assert not bounds.beyond_since('2020-01-01')
+
+
+def test_bounds_deadline():
+    assert PlaceBounds().remaining_seconds is None
+    assert not PlaceBounds(deadline_seconds=60).expired()
+
+    bounds = PlaceBounds(deadline_seconds=60)
+    bounds.started = time.monotonic() - 61
+    assert bounds.remaining_seconds == 0
+    assert bounds.expired()
+    assert bounds.reason == 'deadline'
+
+
+def test_inactive_bounds():
+    bounds = PlaceBounds(max_reviews=0, deadline_seconds=-1)
+    assert not bounds.active
+    assert not bounds.full(10 ** 6)
+    assert bounds.describe() == ''
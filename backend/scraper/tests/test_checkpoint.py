@@ -0,0 +1,44 @@
+import os
+
+from scraper.checkpoint import CheckpointStore
+
+
+def test_resumed_place_reads_its_keys_from_the_file(tmp_path):
+    path = str(tmp_path / 'checkpoint.sqlite3')
+    store = CheckpointStore(path, flush_every=2)
+    checkpoint = store.place('place-1')
+    for key in ('id:a', 'id:b', 'name_date:x:2024-01-01'):
+        checkpoint.add(key)
+    # Written keys leave memory, the last one waits for the next flush
+    assert checkpoint.pending == ['name_date:x:2024-01-01']
+    assert 'id:a' in checkpoint and 'name_date:x:2024-01-01' in checkpoint and 'id:c' not in checkpoint
+    store.close()
+
+    store = CheckpointStore(path)
+    resumed = store.place('place-1')
+    assert resumed.resumed == 2
+    assert sorted(resumed.emitted_keys()) == ['id:a', 'id:b']
+    assert 'id:b' in resumed and 'name_date:x:2024-01-01' not in resumed
+    assert not store.is_completed('place-1')
+    store.close()
+
+
+def test_completed_places_are_skipped_and_the_file_removed(tmp_path):
+    path = str(tmp_path / 'checkpoint.sqlite3')
+    store = CheckpointStore(path)
+    checkpoint = store.place('place-1')
+    checkpoint.add('id:a')
+    checkpoint.complete()
+    assert store.is_completed('place-1')
+    assert list(checkpoint.emitted_keys()) == []
+    assert store.close(finished=True)
+    assert not os.path.exists(path)
+
+
+def test_incomplete_places_keep_the_file(tmp_path):
+    path = str(tmp_path / 'checkpoint.sqlite3')
+    store = CheckpointStore(path)
+    store.place('place-1').flush()
+    assert store.incomplete_places() == ['place-1']
+    assert not store.close(finished=True)
+    assert os.path.exists(path)
@@ -0,0 +1,54 @@
+from datetime import datetime
+
+import pytest
+
+from scraper.dates import RelativeDateParser
+
+
+NOW = datetime(2025, 10, 30, 12, 0)
+
+
+@pytest.mark.parametrize('locale, text, expected', [
+    ('id', '6 hari lalu', '2025-10-24'),
+    ('id', 'sebulan lalu', '2025-09-30'),
+    ('id', 'setahun lalu', '2024-10-30'),
+    ('id', 'Diedit 2 minggu lalu', '2025-10-16'),
+    ('id', '3 minggu lalu di Google', '2025-10-09'),
+    ('id', 'Diedit 2 hari lalu ·', '2025-10-28'),
+    ('id', 'baru saja', '2025-10-30'),
+    ('en', '2 months ago', '2025-08-31'),
+    ('en', 'an hour ago', '2025-10-30'),
+    ('en', 'Edited 3 weeks ago', '2025-10-09'),
+    ('en', 'a year ago on Google', '2024-10-30'),
+    ('es', 'hace 4 días', '2025-10-26'),
+    ('es', 'Editado hace una semana', '2025-10-23'),
+    ('es', 'hace un año en Google', '2024-10-30'),
+    ('fr', 'il y a 2 mois', '2025-08-31'),
+    ('fr', 'il y a un an', '2024-10-30'),
+    ('fr', 'Modifié il y a une semaine · Google', '2025-10-23'),
+    ('de', 'vor 4 Tagen', '2025-10-26'),
+    ('de', 'Bearbeitet: vor einer Woche', '2025-10-23'),
+    ('de', 'vor 3 Jahren auf Google', '2022-10-31'),
+    ('it', '4 giorni fa', '2025-10-26'),
+    ('it', 'Modificato una settimana fa', '2025-10-23'),
+    ('it', 'un anno fa su Google', '2024-10-30'),
+])
+def test_relative_dates(locale, text, expected):
+    assert RelativeDateParser(now=NOW, locale=locale).parse(text) == expected
+
+
+@pytest.mark.parametrize('text', [
+    '2 minggu',  # no "lalu"
+    'di Google 3 minggu lalu',  # the date must come first
+    '2 harian lalu',  # units only match whole words
+    'Unknown',
+    '',
+])
+def test_unparseable_dates(text):
+    assert RelativeDateParser(now=NOW, locale='id').parse(text) is None
+
+
+def test_parse_many_uses_one_clock_and_caches():
+    parser = RelativeDateParser(now=NOW, locale='id')
+    assert parser.parse_many(['6 hari lalu', 'nope', '6 hari lalu']) == ['2025-10-24', None, '2025-10-24']
+    assert parser.hits == 1 and parser.misses == 2
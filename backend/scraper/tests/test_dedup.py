@@ -0,0 +1,82 @@
+import pytest
+
+from scraper.dedup import (
+    BloomFilter, ReviewDeduplicator, review_id_key, review_identity, review_key, stable_digest, synthetic_review_id,
+)
+from scraper.src.spiders.maps_reviews_spiders import MapsReviewsSpider
+
+
+def test_synthetic_review_ids_are_stable_and_not_numeric():
+    identity = 'Budi\x1f5\x1fTempatnya nyaman, kopinya enak'
+    review_id = synthetic_review_id(identity)
+    assert review_id == synthetic_review_id(identity)
+    assert review_id != synthetic_review_id('Budi\x1f4\x1fTempatnya nyaman, kopinya enak')
+    assert review_id.startswith('fp:') and not review_id.isdigit()
+
+
+def test_synthetic_review_ids_are_not_published_as_data_review_id():
+    spider = MapsReviewsSpider(url='https://www.google.com/maps/place/Foo')
+    raw = {'reviewer_name': 'Budi', 'rating_labels': ['5 bintang'], 'review_text': 'Enak', 'date_text': '2 hari lalu'}
+
+    synthetic = spider.build_review_data(raw, 'Foo', 'https://www.google.com/maps/place/Foo', synthetic_review_id('x'))
+    numeric = spider.build_review_data(raw, 'Foo', 'https://www.google.com/maps/place/Foo', '1234567890')
+    assert synthetic['data_review_id'] is None
+    assert numeric['data_review_id'] == '1234567890'
+
+
+def test_review_identity_matches_the_page_script_format():
+    assert review_identity(' Budi ', 5.0, ' Tempatnya  nyaman,\nkopinya enak ') == \
+        'Budi\x1f5\x1fTempatnya nyaman, kopinya enak'
+    assert review_identity('Budi', None, 'x' * 100) == 'Budi\x1f\x1f' + 'x' * 60
+    assert review_identity('', 4.0, '') is None
+
+
+def test_review_key_prefers_the_review_id():
+    review = {'_review_id': 'ChZDSUhN', 'reviewer_name': 'Budi', 'review_date': '2025-10-28'}
+    assert review_key(review) == review_id_key('ChZDSUhN') == 'id:ChZDSUhN'
+
+
+def test_review_key_falls_back_to_name_and_date():
+    assert review_key({'reviewer_name': 'Budi', 'review_date': '2025-10-28'}) == 'name_date:Budi:2025-10-28'
+    assert review_key({'reviewer_name': 'Budi'}) is None
+    assert review_key({}) is None
+
+
+def test_stable_digest_is_a_64_bit_int_and_treats_ints_as_strings():
+    digest = stable_digest('id:1')
+    assert digest == stable_digest('id:1')
+    assert 0 <= digest < 2 ** 64
+    assert stable_digest(42) == stable_digest('42')
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    added = [stable_digest(f'id:{number}') for number in range(5000)]
+    for digest in added:
+        bloom.add(digest)
+
+    assert all(digest in bloom for digest in added)
+    false_positives = sum(stable_digest(f'other:{number}') in bloom for number in range(5000))
+    assert false_positives / 5000 < 0.03
+    assert bloom.count == 5000
+    assert 0.005 < bloom.false_positive_rate() < 0.02
+    assert bloom.memory_bytes() == len(bloom.bits)
+
+
+@pytest.mark.parametrize('mode', ['exact', 'bloom'])
+def test_review_deduplicator_counts_keys_and_duplicates(mode):
+    seen = ReviewDeduplicator(mode=mode, capacity=1000)
+    assert seen.add('id:1')
+    assert not seen.add('id:1')
+    seen.update(['id:2', 'id:3', 'id:2'])
+
+    assert 'id:3' in seen
+    assert 'id:4' not in seen
+    assert len(seen) == 3
+    assert seen.duplicates == 2
+    assert '3 keys, 2 duplicates' in seen.summary()
+
+
+def test_review_deduplicator_rejects_unknown_modes():
+    with pytest.raises(ValueError):
+        ReviewDeduplicator(mode='fuzzy')
@@ -0,0 +1,133 @@
+import pytest
+from scrapy.http import TextResponse
+from scrapy.utils.test import get_crawler
+
+from scraper.bounds import decode_cursor
+from scraper.signals import place_finished
+from scraper.src.spiders.maps_reviews_http_spiders import MapsReviewsHttpSpider
+from scraper.tests.conftest import PLACE_URL
+from scraper.tests.rpc_pages import rpc_page, rpc_review
+
+
+def text_reviews(start, count):
+    return [rpc_review(f'rev{i}', f'text {i}', reviewer=f'user{i}') for i in range(start, start + count)]
+
+
+def rating_only_reviews(start, count):
+    return [rpc_review(f'rev{i}', reviewer=f'user{i}') for i in range(start, start + count)]
+
+
+def test_pages_through_all_reviews(replay_crawl):
+    crawl = replay_crawl([
+        rpc_page(text_reviews(0, 5), 'tok1'),
+        rpc_page(text_reviews(5, 5), 'tok2'),
+        rpc_page(text_reviews(10, 5)),
+    ])
+    assert crawl.returncode == 0, crawl.log
+    assert crawl.review_ids == [f'rev{i}' for i in range(15)]
+
+
+def test_page_without_emitted_reviews_does_not_end_paging(replay_crawl):
+    crawl = replay_crawl([
+        rpc_page(text_reviews(0, 5), 'tok1'),
+        rpc_page(rating_only_reviews(5, 5), 'tok2'),
+        rpc_page(text_reviews(10, 5)),
+    ])
+    assert crawl.review_ids == [f'rev{i}' for i in range(5)] + [f'rev{i}' for i in range(10, 15)]
+    assert 'in 3 pages' in crawl.log
+
+
+def test_page_filtered_by_since_does_not_end_paging(replay_crawl):
+    old = 1500000000000
+    crawl = replay_crawl([
+        rpc_page(text_reviews(0, 2), 'tok1'),
+        rpc_page([rpc_review(f'rev{i}', f'text {i}', timestamp=old) for i in range(2, 4)], 'tok2'),
+        rpc_page(text_reviews(4, 2)),
+    ], 'sort=highest', 'since=2020-01-01')
+    assert crawl.review_ids == ['rev0', 'rev1', 'rev4', 'rev5']
+
+
+def test_token_looping_back_ends_paging(replay_crawl):
+    first_page = text_reviews(0, 5)
+    crawl = replay_crawl([
+        rpc_page(first_page, 'tok1'),
+        rpc_page(first_page, 'tok1'),
+    ])
+    assert crawl.returncode == 0, crawl.log
+    assert crawl.review_ids == [f'rev{i}' for i in range(5)]
+    assert 'in 2 pages' in crawl.log
+
+
+def reviews_response(spider, body, page_number=0, page_token=''):
+    request = spider.reviews_request('0x1:0x2', {'place_url': PLACE_URL, 'place_name': 'Foo Cafe', 'hl': 'id'},
+                                     page_token, page_number)
+    return TextResponse(request.url, body=body, request=request)
+
+
+@pytest.fixture
+def http_spider():
+    def create(**kwargs):
+        crawler = get_crawler(MapsReviewsHttpSpider, {'MAPS_SELECTOR_CACHE_FILE': 'off'})
+        spider = MapsReviewsHttpSpider.from_crawler(crawler, url=PLACE_URL, **kwargs)
+        finished = []
+        crawler.signals.connect(lambda **kwargs: finished.append(kwargs), signal=place_finished, weak=False)
+        return spider, finished
+    return create
+
+
+def test_last_page_finishes_the_place_and_releases_its_state(http_spider):
+    spider, finished = http_spider()
+    output = list(spider.parse_reviews_page(reviews_response(spider, rpc_page(text_reviews(0, 3)))))
+
+    assert len(output) == 3
+    assert [event['reviews_scraped'] for event in finished] == [3]
+    assert finished[0]['place_url'] == PLACE_URL and finished[0]['cursor'] is None
+    assert not spider.seen_reviews and not spider.bounds and not spider.place_reviews
+
+
+def test_bounded_place_finishes_with_a_cursor(http_spider):
+    spider, finished = http_spider(max_reviews='2')
+    output = list(spider.parse_reviews_page(reviews_response(spider, rpc_page(text_reviews(0, 3), 'tok1'))))
+
+    assert [item['review_id'] for item in output] == ['rev0', 'rev1']
+    assert len(finished) == 1 and finished[0]['cursor']
+    assert decode_cursor(finished[0]['cursor'])['review_id'] == 'rev1'
+    assert not spider.seen_reviews and not spider.bounds and not spider.place_reviews
+
+
+def test_undecodable_page_finishes_the_place_as_failed(http_spider):
+    spider, finished = http_spider()
+    assert list(spider.parse_reviews_page(reviews_response(spider, b'not json'))) == []
+    assert len(finished) == 1 and finished[0]['failure'] is not None
+
+
+def test_empty_page_with_a_token_does_not_end_paging(replay_crawl):
+    crawl = replay_crawl([
+        rpc_page(text_reviews(0, 5), 'tok1'),
+        rpc_page([], 'tok2'),
+        rpc_page(text_reviews(5, 5)),
+    ])
+    assert crawl.returncode == 0, crawl.log
+    assert crawl.review_ids == [f'rev{i}' for i in range(10)]
+
+
+def test_empty_pages_end_paging_when_the_token_stands_still(http_spider):
+    spider, finished = http_spider()
+    response = reviews_response(spider, rpc_page([], 'tok1'), page_number=3, page_token='tok1')
+
+    assert list(spider.parse_reviews_page(response)) == []
+    assert len(finished) == 1 and finished[0]['failure'] is None
+
+
+def test_empty_pages_in_a_row_end_paging(http_spider):
+    spider, finished = http_spider()
+    for page_number in range(4):
+        response = reviews_response(spider, rpc_page([], f'tok{page_number + 1}'), page_number, f'tok{page_number}')
+        response.meta['empty_pages'] = page_number
+        output = list(spider.parse_reviews_page(response))
+        if page_number < 3:
+            [request] = output
+            assert request.meta['empty_pages'] == page_number + 1
+        else:
+            assert output == []
+    assert len(finished) == 1
@@ -0,0 +1,104 @@
+import asyncio
+
+from scrapy.utils.test import get_crawler
+
+from scraper.rpc import decode_reviews_payload
+from scraper.scrolling import ReviewProgress
+from scraper.src.spiders.maps_reviews_spiders import MapsReviewsSpider
+
+from .rpc_pages import rpc_page, rpc_review
+
+
+PLACE_URL = 'https://www.google.com/maps/place/Foo?hl=id'
+
+FAST_SCROLL = {
+    'MAPS_SCROLL_MIN_TIMEOUT': 0.01,
+    'MAPS_SCROLL_MAX_TIMEOUT': 0.05,
+    'MAPS_SCROLL_MIN_END_PATIENCE': 0.05,
+}
+
+
+class FakeCollector:
+    """ReviewsResponseCollector fed with the given response bodies, one per wait"""
+
+    def __init__(self, bodies, exhausted_at_end=False):
+        self.bodies = list(bodies)
+        self.exhausted_at_end = exhausted_at_end
+        self.pending = []
+        self.responses_seen = 0
+        self.decode_errors = 0
+        self.exhausted = False
+        self.timeouts = []
+
+    def drain(self):
+        reviews, self.pending = self.pending, []
+        return reviews
+
+    async def wait_for_reviews(self, timeout):
+        self.timeouts.append(timeout)
+        if not self.bodies:
+            self.exhausted = self.exhausted_at_end
+            await asyncio.sleep(timeout)
+            return False
+        reviews, _ = decode_reviews_payload(self.bodies.pop(0))
+        self.responses_seen += 1
+        self.pending.extend(reviews)
+        return True
+
+
+class FakeScrollPage:
+    def __init__(self):
+        self.scrolls = []
+
+    async def evaluate(self, script, arg=None):
+        self.scrolls.append(arg)
+        return {'container': arg['containerSelectors'][0], 'atBottom': True, 'scrollHeight': 1000}
+
+
+def capture(collector, progress=None):
+    spider = MapsReviewsSpider(url=PLACE_URL, extraction_source='network')
+    spider._set_crawler(get_crawler(MapsReviewsSpider, FAST_SCROLL))
+    page = FakeScrollPage()
+
+    async def run():
+        return [review async for review in spider.scroll_and_capture_network(
+            page, 'Foo', PLACE_URL, collector, {}, progress=progress,
+        )]
+
+    return asyncio.run(asyncio.wait_for(run(), timeout=10)), page, spider.crawler.stats
+
+
+def test_progress_counts_distinct_decoded_reviews():
+    # Google resends the last review of a page at the top of the next one
+    collector = FakeCollector([
+        rpc_page([rpc_review('r1', 'Enak'), rpc_review('r2', 'Mantap')], 'CAE='),
+        rpc_page([rpc_review('r2', 'Mantap'), rpc_review('r3')], 'CAI='),
+    ])
+    progress = ReviewProgress(10)
+
+    reviews, _, _ = capture(collector, progress)
+
+    assert [review['_review_id'] for review in reviews] == ['r1', 'r2', 'r2']
+    # r3 has no text and is not emitted, but it was loaded
+    assert progress.loaded == 3
+
+
+def test_end_of_list_is_confirmed_by_the_scheduler():
+    collector = FakeCollector([rpc_page([rpc_review('r1', 'Enak')], 'CAE=')])
+
+    reviews, page, stats = capture(collector)
+
+    assert len(reviews) == 1
+    # Empty waits back off until the end is confirmed, and nudge the pane
+    assert collector.timeouts[1] < collector.timeouts[-1]
+    assert [scroll['nudge'] for scroll in page.scrolls[:3]] == [False, False, True]
+    assert stats.get_value('scroll/wait_timeouts') >= 3
+
+
+def test_last_page_ends_after_one_empty_wait():
+    collector = FakeCollector([rpc_page([rpc_review('r1', 'Enak')])], exhausted_at_end=True)
+
+    reviews, _, stats = capture(collector)
+
+    assert len(reviews) == 1
+    assert stats.get_value('scroll/wait_timeouts') == 1
@@ -0,0 +1,128 @@
+import json
+
+import pytest
+from scrapy import Spider
+from scrapy.exceptions import DropItem
+from scrapy.utils.test import get_crawler
+
+from scraper.pipelines import ReviewDeltaPipeline, StreamingJsonLinesPipeline
+
+
+PLACE_URL = 'https://www.google.com/maps/place/Foo+Cafe/data=!4m2!3m1!1s0x1:0x2'
+
+
+def review(review_id='r1', text='Kopinya enak', **fields):
+    return {'place_url': PLACE_URL, 'review_id': review_id, 'reviewer_name': 'Budi', 'review_text': text,
+            'rating': 5.0, **fields}
+
+
+def open_pipeline(pipeline_class, settings):
+    crawler = get_crawler(Spider, settings)
+    spider = Spider('test')
+    pipeline = pipeline_class.from_crawler(crawler)
+    pipeline.open_spider(spider)
+    return pipeline, spider, crawler
+
+
+def delta_run(store, items, **settings):
+    """Statuses of the items in one crawl against the store, None for dropped items"""
+    pipeline, spider, crawler = open_pipeline(ReviewDeltaPipeline, {'MAPS_DELTA_STORE': str(store), **settings})
+    statuses = []
+    for item in items:
+        try:
+            statuses.append(pipeline.process_item(item, spider)['change_status'])
+        except DropItem:
+            statuses.append(None)
+    pipeline.spider_closed(spider, 'finished')
+    return statuses, crawler.stats
+
+
+def test_delta_tags_new_edited_and_unchanged_across_runs(tmp_path):
+    store = tmp_path / 'fingerprints.sqlite3'
+
+    statuses, stats = delta_run(store, [review('r1'), review('r2')])
+    assert statuses == ['new', 'new']
+    assert stats.get_value('delta/new') == 2
+
+    statuses, stats = delta_run(store, [
+        review('r1', text='Kopinya  enak'),
+        review('r2', text='Kopinya enak', response_from_owner='Terima kasih'),
+        review('r3'),
+    ])
+    assert statuses == ['unchanged', 'edited', 'new']
+    assert stats.get_value('delta/unchanged') == 1
+
+    statuses, _ = delta_run(store, [review('r2', response_from_owner='Terima kasih')])
+    assert statuses == ['unchanged']
+
+
+def test_delta_drops_unchanged_reviews_when_asked(tmp_path):
+    store = tmp_path / 'fingerprints.sqlite3'
+    delta_run(store, [review('r1')])
+
+    statuses, stats = delta_run(store, [review('r1'), review('r2')], MAPS_DELTA_SKIP_UNCHANGED=True)
+    assert statuses == [None, 'new']
+    assert stats.get_value('delta/dropped') == 1
+
+
+def test_delta_place_finished_writes_and_releases_the_place(tmp_path):
+    pipeline, spider, _ = open_pipeline(ReviewDeltaPipeline, {'MAPS_DELTA_STORE': str(tmp_path / 'f.sqlite3')})
+    pipeline.process_item(review('r1'), spider)
+    assert pipeline.pending and pipeline.places
+
+    pipeline.place_finished(PLACE_URL)
+    assert not pipeline.pending and not pipeline.places
+    assert pipeline.connection.execute('SELECT COUNT(*) FROM fingerprints').fetchone()[0] == 1
+    pipeline.spider_closed(spider, 'finished')
+
+
+def test_delta_is_off_without_a_store():
+    pipeline, spider, _ = open_pipeline(ReviewDeltaPipeline, {})
+    item = review('r1')
+    assert pipeline.process_item(item, spider) is item
+    assert 'change_status' not in item
+
+
+def read_lines(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_stream_single_file_ends_with_a_marker(tmp_path):
+    path = tmp_path / 'out' / 'reviews.jsonl'
+    pipeline, spider, _ = open_pipeline(StreamingJsonLinesPipeline, {'STREAM_OUTPUT': str(path), 'STREAM_FLUSH_EVERY': 1})
+    pipeline.process_item(review('r1', text='Café'), spider)
+    assert read_lines(path) == [review('r1', text='Café')]
+
+    pipeline.process_item(review('r2'), spider)
+    pipeline.spider_closed(spider, 'finished')
+
+    lines = read_lines(path)
+    assert [line.get('review_id') for line in lines[:2]] == ['r1', 'r2']
+    assert lines[2]['_type'] == 'end_of_stream'
+    assert (lines[2]['items'], lines[2]['chunks'], lines[2]['reason']) == (2, 1, 'finished')
+
+
+@pytest.mark.parametrize('items, chunks', [(5, 3), (4, 3)])
+def test_stream_chunks_are_published_when_complete(tmp_path, items, chunks):
+    path = tmp_path / 'reviews'
+    pipeline, spider, _ = open_pipeline(StreamingJsonLinesPipeline, {'STREAM_OUTPUT': str(path), 'STREAM_CHUNK_SIZE': 2})
+    for number in range(items):
+        pipeline.process_item(review(f'r{number}'), spider)
+    assert sorted(p.name for p in tmp_path.iterdir())[-1] == f'reviews.{chunks - 1:05d}.jsonl.part'
+
+    pipeline.spider_closed(spider, 'shutdown')
+
+    names = sorted(p.name for p in tmp_path.iterdir())
+    assert names == [f'reviews.{index:05d}.jsonl' for index in range(chunks)]
+    lines = [line for name in names for line in read_lines(tmp_path / name)]
+    assert [line['review_id'] for line in lines[:-1]] == [f'r{number}' for number in range(items)]
+    assert lines[-1]['chunks'] == chunks and lines[-1]['reason'] == 'shutdown'
+
+
+def test_delta_keeps_reviewers_with_the_same_name_apart(tmp_path):
+    store = tmp_path / 'fingerprints.sqlite3'
+    items = [review(None, text='Kopinya enak'), review(None, text='Tempatnya sempit', rating=2.0)]
+
+    assert delta_run(store, items)[0] == ['new', 'new']
+    assert delta_run(store, [dict(item) for item in items])[0] == ['unchanged', 'unchanged']
@@ -0,0 +1,34 @@
+import asyncio
+
+from scrapy.settings import Settings
+from scrapy.utils.test import get_crawler
+
+from scraper.src.spiders.maps_reviews_spiders import MapsReviewsSpider
+
+
+async def start_requests(spider):
+    return [request async for request in spider.start()]
+
+
+def test_places_listed_twice_are_started_once(tmp_path):
+    urls_file = tmp_path / 'urls.txt'
+    urls_file.write_text(
+        'https://www.google.com/maps/place/Foo\n'
+        'https://www.google.com/maps/place/Bar\n'
+        'https://www.google.com/maps/place/Foo/\n',
+        encoding='utf-8',
+    )
+    spider = MapsReviewsSpider(urls_file=str(urls_file))
+    spider._set_crawler(get_crawler(MapsReviewsSpider))
+    spider.configure_context_pool(Settings({'MAPS_MAX_CONCURRENT_PLACES': 3}))
+
+    requests = asyncio.run(asyncio.wait_for(start_requests(spider), timeout=5))
+
+    assert [request.meta['place_url'] for request in requests] == [
+        'https://www.google.com/maps/place/Foo?hl=id&reviews=true',
+        'https://www.google.com/maps/place/Bar?hl=id&reviews=true',
+    ]
+    assert all(request.dont_filter for request in requests)
+    # The slot the repeated place would have taken is still free
+    assert spider.context_pool.qsize() == 1
+    assert spider.crawler.stats.get_value('maps/places_duplicate') == 1
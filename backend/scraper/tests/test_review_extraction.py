@@ -0,0 +1,70 @@
+import asyncio
+
+from scraper.locales import profile_for_url
+from scraper.page_scripts import REVIEW_ELEMENT_FIELDS
+from scraper.src.spiders.maps_reviews_spiders import MapsReviewsSpider
+
+
+PLACE_URL = 'https://www.google.com/maps/place/Foo?hl=id'
+
+
+class FakeNode:
+    def __init__(self, text=None, attributes=None):
+        self.text = text
+        self.attributes = attributes or {}
+
+    async def inner_text(self):
+        return self.text
+
+    async def get_attribute(self, name):
+        return self.attributes.get(name)
+
+
+class FakeReviewElement:
+    """Review element of the element extraction mode that counts its round trips"""
+
+    def __init__(self, children, element_fields):
+        self.children = children
+        self.element_fields = element_fields
+        self.calls = []
+
+    async def query_selector(self, selector):
+        self.calls.append(('query_selector', selector))
+        return self.children.get(selector)
+
+    async def query_selector_all(self, selector):
+        self.calls.append(('query_selector_all', selector))
+        return []
+
+    async def get_attribute(self, name):
+        self.calls.append(('get_attribute', name))
+        return None
+
+    async def evaluate(self, script, arg=None):
+        self.calls.append(('evaluate', script))
+        return self.element_fields
+
+
+def test_element_mode_reads_timestamp_and_attachments_in_one_evaluate():
+    spider = MapsReviewsSpider(url=PLACE_URL, extraction_mode='element')
+    profile_rating_selector = profile_for_url(PLACE_URL).rating_selectors[0]
+    element = FakeReviewElement(
+        children={
+            'div.d4r55': FakeNode('Budi'),
+            profile_rating_selector: FakeNode(attributes={'aria-label': '4 bintang'}),
+            'span.wiI7pd': FakeNode('Kopinya enak'),
+        },
+        element_fields={'sort_time': '1700000000000', 'jslog': None, 'owner_response': 'Terima kasih',
+                        'photo_count': 3},
+    )
+
+    review = asyncio.run(spider.extract_review_data(element, 'Foo', PLACE_URL))
+
+    assert review['rating'] == 4.0
+    assert review['review_text'] == 'Kopinya enak'
+    assert review['response_from_owner'] == 'Terima kasih'
+    assert review['number_of_photos'] == 3
+    assert review['review_date'].startswith('2023-11-1')
+    evaluates = [call for call in element.calls if call[0] == 'evaluate']
+    assert evaluates == [('evaluate', REVIEW_ELEMENT_FIELDS)]
+    assert not [call for call in element.calls if call[0] == 'get_attribute']
@@ -0,0 +1,94 @@
+import asyncio
+
+from scrapy.utils.test import get_crawler
+
+from scraper.locales import profile_for_url
+from scraper.selector_cache import LearnedSelectorCache
+from scraper.src.spiders.maps_reviews_spiders import MapsReviewsSpider
+
+
+PLACE_URL = 'https://www.google.com/maps/place/Foo?hl=id'
+SCOPE = 'id|abc'
+
+PROFILE = profile_for_url(PLACE_URL)
+SPECIFIC, *_, BROAD = PROFILE.reviews_button_selectors
+
+
+class FakePage:
+    """Page whose union query returns the first match in document order"""
+
+    def __init__(self, elements, document_order):
+        self.elements = elements
+        self.document_order = document_order
+        self.queries = []
+
+    async def query_selector(self, selector):
+        self.queries.append(selector)
+        if selector == PROFILE.reviews_button_selector:
+            return next((self.elements[member] for member in self.document_order if member in self.elements), None)
+        return self.elements.get(selector)
+
+
+def button_spider(tmp_path):
+    spider = MapsReviewsSpider(url=PLACE_URL)
+    crawler = get_crawler(MapsReviewsSpider)
+    spider._set_crawler(crawler)
+    spider.learned_selectors = LearnedSelectorCache(str(tmp_path / 'selectors.json'), crawler)
+    return spider
+
+
+def find_reviews_button(spider, page, cached_selectors):
+    return asyncio.run(spider.find_reviews_button(page, PROFILE, cached_selectors, SCOPE))
+
+
+def test_reviews_button_is_picked_in_priority_order(tmp_path):
+    spider = button_spider(tmp_path)
+    # A broader match ("Tulis ulasan") comes first in the document
+    page = FakePage({SPECIFIC: 'reviews tab', BROAD: 'write a review'}, document_order=[BROAD, SPECIFIC])
+    cached_selectors = spider.selector_cache('pool-0')
+
+    assert find_reviews_button(spider, page, cached_selectors) == 'reviews tab'
+    assert cached_selectors['reviews_button'] == SPECIFIC
+
+
+def test_cached_selector_that_matches_nothing_is_cleared(tmp_path):
+    spider = button_spider(tmp_path)
+    page = FakePage({SPECIFIC: 'reviews tab'}, document_order=[SPECIFIC])
+    cached_selectors = spider.selector_cache('pool-0')
+    cached_selectors['reviews_button'] = 'button.gone'
+
+    assert find_reviews_button(spider, page, cached_selectors) == 'reviews tab'
+    assert cached_selectors['reviews_button'] == SPECIFIC
+
+
+def test_no_reviews_button(tmp_path):
+    spider = button_spider(tmp_path)
+    page = FakePage({}, document_order=[])
+    cached_selectors = spider.selector_cache('pool-0')
+
+    assert find_reviews_button(spider, page, cached_selectors) is None
+    assert cached_selectors['reviews_button'] is None
+    # One union query tells there is none
+    assert page.queries == [PROFILE.reviews_button_selector]
+
+
+def test_the_matching_selector_is_learned_and_hit_next_time(tmp_path):
+    spider = button_spider(tmp_path)
+    page = FakePage({SPECIFIC: 'reviews tab', BROAD: 'write a review'}, document_order=[BROAD, SPECIFIC])
+    find_reviews_button(spider, page, spider.selector_cache('pool-0'))
+    assert spider.learned_selectors.get(SCOPE, 'reviews_button') == SPECIFIC
+
+    page.queries = []
+    assert find_reviews_button(spider, page, spider.selector_cache('pool-1')) == 'reviews tab'
+    assert page.queries == [SPECIFIC]
+    assert spider.crawler.stats.get_value('selectors/hits/reviews_button') == 1
+
+
+def test_a_learned_union_is_replaced_by_the_matching_selector(tmp_path):
+    spider = button_spider(tmp_path)
+    spider.learned_selectors.learn(SCOPE, 'reviews_button', PROFILE.reviews_button_selector)
+    page = FakePage({SPECIFIC: 'reviews tab', BROAD: 'write a review'}, document_order=[BROAD, SPECIFIC])
+
+    assert find_reviews_button(spider, page, spider.selector_cache('pool-0')) == 'reviews tab'
+    assert page.queries.count(PROFILE.reviews_button_selector) == 1
+    assert spider.learned_selectors.get(SCOPE, 'reviews_button') == SPECIFIC
@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from scraper.rpc import XSSI_PREFIX, decode_reviews_payload, is_reviews_rpc
+
+from .rpc_pages import rpc_page, rpc_review
+
+
+def test_decode_listugcposts_page():
+    body = rpc_page([
+        rpc_review('r1', text='Kopinya enak', reviewer='Budi', rating=4, photos=2, owner_response='Terima kasih',
+                   translated_text='The coffee is good', language='id'),
+        rpc_review('r2', rating=5, timestamp=1700000000),
+    ], next_page_token='CAE=')
+
+    reviews, next_page_token = decode_reviews_payload(body)
+
+    assert next_page_token == 'CAE='
+    assert reviews[0] == {
+        'review_id': 'r1',
+        'reviewer_name': 'Budi',
+        'rating': 4.0,
+        'review_text': 'Kopinya enak',
+        'translated_text': 'The coffee is good',
+        'original_language': 'id',
+        'timestamp': '1700000000000',
+        'relative_date': '2 hari lalu',
+        'response_from_owner': 'Terima kasih',
+        'number_of_photos': 2,
+    }
+    # A rating-only review; the timestamp was in seconds
+    assert reviews[1]['review_text'] == ''
+    assert reviews[1]['translated_text'] is None
+    assert reviews[1]['timestamp'] == '1700000000000'
+
+
+def test_decode_last_page_and_broken_entries():
+    body = rpc_page([rpc_review('r1'), [[None]], [], 'garbage'], next_page_token='')
+    reviews, next_page_token = decode_reviews_payload(body)
+    assert [review['review_id'] for review in reviews] == ['r1']
+    assert next_page_token is None
+
+
+def test_decode_microsecond_timestamps():
+    reviews, _ = decode_reviews_payload(rpc_page([rpc_review('r1', timestamp=1700000000000000)]))
+    assert reviews[0]['timestamp'] == '1700000000000'
+
+
+def test_decode_legacy_listentitiesreviews_page():
+    entry = [None] * 33
+    entry[0] = [None, 'Siti']
+    entry[1] = 'seminggu lalu'
+    entry[3] = 'Pelayanan cepat'
+    entry[4] = 3
+    entry[9] = [None, 'Maaf atas ketidaknyamanannya']
+    entry[10] = 'legacy-1'
+    entry[14] = [['photo']]
+    entry[27] = 1700000000000
+    entry[32] = 'id'
+    body = XSSI_PREFIX + json.dumps([None, None, [entry]])
+
+    reviews, next_page_token = decode_reviews_payload(body, legacy=True)
+
+    assert next_page_token is None
+    assert reviews == [{
+        'review_id': 'legacy-1',
+        'reviewer_name': 'Siti',
+        'rating': 3.0,
+        'review_text': 'Pelayanan cepat',
+        'translated_text': None,
+        'original_language': 'id',
+        'timestamp': '1700000000000',
+        'relative_date': 'seminggu lalu',
+        'response_from_owner': 'Maaf atas ketidaknyamanannya',
+        'number_of_photos': 1,
+    }]
+
+
+def test_decode_unexpected_payloads():
+    assert decode_reviews_payload(XSSI_PREFIX + '{"error": 1}') == ([], None)
+    with pytest.raises(ValueError):
+        decode_reviews_payload(XSSI_PREFIX + '<html>')
+
+
+def test_is_reviews_rpc():
+    assert is_reviews_rpc('https://www.google.com/maps/rpc/listugcposts?authuser=0&pb=!1m7')
+    assert is_reviews_rpc('https://www.google.com/maps/preview/review/listentitiesreviews?pb=!1m2')
+    assert not is_reviews_rpc('https://www.google.com/maps/place/Foo')
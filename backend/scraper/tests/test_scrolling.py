@@ -0,0 +1,47 @@
+from html.parser import HTMLParser
+
+from scraper.fixture_server import INTERFACE_TEXTS, PAGE_SIZE, FixtureConfig, generate_reviews, render_review
+from scraper.scrolling import ReviewProgress
+
+
+class ReviewNodeIds(HTMLParser):
+    """data-review-id of every div[data-review-id], in document order like CLAIM_NEW_REVIEWS"""
+
+    def __init__(self):
+        super().__init__()
+        self.ids = []
+
+    def handle_starttag(self, tag, attrs):
+        review_id = dict(attrs).get('data-review-id')
+        if tag == 'div' and review_id:
+            self.ids.append(review_id)
+
+
+def loaded_node_ids(reviews):
+    parser = ReviewNodeIds()
+    parser.feed(''.join(render_review(review, INTERFACE_TEXTS['id']) for review in reviews))
+    return parser.ids
+
+
+def test_progress_counts_nested_review_nodes_once():
+    total = 3 * PAGE_SIZE
+    reviews = generate_reviews('Fixture Cafe', total, 'id', FixtureConfig().key())
+    progress = ReviewProgress(total, tolerance=0.02)
+
+    for start in range(0, total, PAGE_SIZE):
+        node_ids = loaded_node_ids(reviews[start:start + PAGE_SIZE])
+        # Every review has an outer node and a nested node with the same id
+        assert len(node_ids) == 2 * PAGE_SIZE
+        assert not progress.within_tolerance
+        progress.add_reviews(node_ids)
+        assert progress.loaded == start + PAGE_SIZE
+
+    assert progress.complete
+
+
+def test_progress_counts_reviews_of_several_pages_once():
+    progress = ReviewProgress(4, loaded=1)
+    progress.add_reviews(['a', 'b'])
+    progress.add_reviews(['b', 'c', 'a'])
+    assert progress.loaded == 4
+    assert progress.complete
@@ -0,0 +1,29 @@
+import pytest
+
+from scraper.shards import extra_sort_shards, parse_sort_shards
+
+
+@pytest.mark.parametrize('value, expected', [
+    (None, ()),
+    ('', ()),
+    ('highest,lowest', ('highest', 'lowest')),
+    (' lowest , highest,lowest ', ('lowest', 'highest')),
+    (['newest', 'relevant'], ('newest', 'relevant')),
+    ('all', ('relevant', 'newest', 'highest', 'lowest')),
+])
+def test_parse_sort_shards(value, expected):
+    assert parse_sort_shards(value) == expected
+
+
+def test_parse_sort_shards_rejects_unknown_sorts():
+    with pytest.raises(ValueError):
+        parse_sort_shards('highest,oldest')
+
+
+@pytest.mark.parametrize('primary_sort, expected', [
+    ('newest', ('relevant', 'highest', 'lowest')),
+    # Sorting the main page by newest failed, so it lists the reviews by relevance
+    ('relevant', ('newest', 'highest', 'lowest')),
+])
+def test_extra_sort_shards_drop_the_main_page_sort(primary_sort, expected):
+    assert extra_sort_shards(parse_sort_shards('all'), primary_sort) == expected
@@ -0,0 +1,232 @@
+"""
+Long-lived scraper worker.
+
+Keeps one Twisted reactor, one maps_reviews crawler and its Playwright browser
+alive between scrape jobs, so a job only pays for opening a page instead of
+starting Python, Scrapy and Chromium. Jobs are submitted over a local HTTP
+interface and reviews are streamed back as newline-delimited JSON:
+
+    python -m scraper.worker --port 8790 [-a max_reviews=200] [-a deadline_seconds=120] [-s KEY=VALUE]
+
+    POST /jobs   {"url": "<google maps place url>"}
+                 -> one review per line, then the end-of-stream marker
+                    {"_type": "end_of_stream", "job_id": ..., "items": <n>, ...}
+                 A job stopped by a bound ends with reason "partial" and a
+                 "cursor" to pass back as {"url": ..., "cursor": ...}
+    GET /health  -> {"status": "ready", "active_jobs": <n>, "free_slots": <n>, ...}
+
+Jobs share the spider's bounded context pool (MAPS_MAX_CONCURRENT_PLACES);
+extra jobs wait for a free slot. The browser is launched by the first job and
+stays up until the worker exits.
+"""
+
+import argparse
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+
+from scrapy import signals
+from scrapy.exceptions import DontCloseSpider
+from scrapy.utils.defer import deferred_from_coro
+from scrapy.utils.log import configure_logging
+from scrapy.utils.project import get_project_settings
+from scrapy.utils.reactor import install_reactor
+
+from scraper.bounds import decode_cursor
+from scraper.pipelines import StreamingJsonLinesPipeline
+from scraper.signals import place_finished
+
+
+ASYNCIO_REACTOR = 'twisted.internet.asyncioreactor.AsyncioSelectorReactor'
+
+
+class ScrapeJob:
+    """One submitted place and the HTTP request its reviews are streamed to"""
+
+    def __init__(self, url, http_request, cursor=None):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.url = url
+        self.cursor = cursor
+        self.http_request = http_request
+        self.items = 0
+        self.started_at = time.monotonic()
+        self.disconnected = False
+
+    def write(self, data):
+        if self.disconnected:
+            return
+        line = json.dumps(data, ensure_ascii=False, default=str) + '\n'
+        self.http_request.write(line.encode('utf-8'))
+
+    def finish(self, reason, cursor=None):
+        marker = {
+            '_type': StreamingJsonLinesPipeline.END_OF_STREAM,
+            'job_id': self.job_id,
+            'items': self.items,
+            'reason': reason,
+            'elapsed_seconds': round(time.monotonic() - self.started_at, 3),
+            'finished_at': datetime.now().isoformat(),
+        }
+        if cursor:
+            marker['cursor'] = cursor
+        self.write(marker)
+        if not self.disconnected:
+            self.http_request.finish()
+
+
+class ScrapeWorker:
+    """Runs one idle-proof crawler and feeds it place requests as jobs arrive"""
+
+    def __init__(self, runner, spider_name='maps_reviews', spider_kwargs=None):
+        self.runner = runner
+        self.spider_name = spider_name
+        self.spider_kwargs = spider_kwargs or {}
+        self.crawler = None
+        self.jobs = {}
+        self.jobs_completed = 0
+
+    @property
+    def spider(self):
+        return self.crawler.spider if self.crawler else None
+
+    def start(self):
+        self.crawler = self.runner.create_crawler(self.spider_name)
+        self.crawler.signals.connect(self.spider_idle, signal=signals.spider_idle)
+        self.crawler.signals.connect(self.item_scraped, signal=signals.item_scraped)
+        self.crawler.signals.connect(self.place_finished, signal=place_finished)
+        return self.runner.crawl(self.crawler, worker=True, **self.spider_kwargs)
+
+    def spider_idle(self, spider):
+        # Keep the spider (and its browser) open between jobs
+        raise DontCloseSpider
+
+    def item_scraped(self, item, response, spider):
+        job = self.jobs.get(response.meta.get('job_id'))
+        if job:
+            job.items += 1
+            job.write(dict(item))
+
+    def place_finished(self, request, place_url, reviews_scraped, failure=None, cursor=None):
+        job = self.jobs.pop(request.meta.get('job_id'), None)
+        if job:
+            self.jobs_completed += 1
+            if failure:
+                job.finish('failed')
+            else:
+                job.finish('partial' if cursor else 'finished', cursor)
+
+    def submit(self, url, http_request, cursor=None):
+        job = ScrapeJob(url, http_request, cursor)
+        self.jobs[job.job_id] = job
+        http_request.notifyFinish().addErrback(lambda _: setattr(job, 'disconnected', True))
+        deferred_from_coro(self.schedule(job))
+        return job
+
+    async def schedule(self, job):
+        # Wait for a free slot of the context pool, exactly like start() does
+        pool_slot = await self.spider.context_pool.get()
+        meta = {'job_id': job.job_id}
+        if job.cursor:
+            meta['cursor'] = job.cursor
+        self.crawler.engine.crawl(self.spider.build_request(job.url, pool_slot, **meta))
+
+    def health(self):
+        spider = self.spider
+        return {
+            'status': 'ready' if spider and self.crawler.engine and self.crawler.engine.running else 'starting',
+            'spider': self.spider_name,
+            'active_jobs': len(self.jobs),
+            'completed_jobs': self.jobs_completed,
+            'free_slots': spider.context_pool.qsize() if spider and spider.context_pool else 0,
+        }
+
+
+def build_site(worker):
+    from twisted.web.resource import Resource
+    from twisted.web.server import NOT_DONE_YET, Site
+
+    def write_json(request, code, data):
+        request.setResponseCode(code)
+        request.setHeader(b'content-type', b'application/json')
+        return json.dumps(data).encode('utf-8')
+
+    class JobsResource(Resource):
+        isLeaf = True
+
+        def render_POST(self, request):
+            try:
+                body = json.loads(request.content.read() or b'{}')
+                url, cursor = body.get('url'), body.get('cursor')
+            except (ValueError, AttributeError):
+                url = cursor = None
+            if not url:
+                return write_json(request, 400, {'error': "JSON body with a 'url' is required"})
+            if cursor:
+                try:
+                    decode_cursor(cursor)
+                except ValueError as e:
+                    return write_json(request, 400, {'error': str(e)})
+            if worker.spider is None:
+                return write_json(request, 503, {'error': 'worker is still starting'})
+
+            request.setHeader(b'content-type', b'application/x-ndjson')
+            job = worker.submit(url, request, cursor)
+            request.setHeader(b'x-job-id', job.job_id.encode('ascii'))
+            return NOT_DONE_YET
+
+    class HealthResource(Resource):
+        isLeaf = True
+
+        def render_GET(self, request):
+            return write_json(request, 200, worker.health())
+
+    root = Resource()
+    root.putChild(b'jobs', JobsResource())
+    root.putChild(b'health', HealthResource())
+    return Site(root)
+
+
+def parse_pairs(pairs, option):
+    values = {}
+    for pair in pairs:
+        if '=' not in pair:
+            raise SystemExit(f"{option} expects KEY=VALUE, got '{pair}'")
+        key, value = pair.split('=', 1)
+        values[key] = value
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve Google Maps scrape jobs from a warm browser')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8790)
+    # Jobs need the browser spider's context pool and its place_finished signal
+    parser.add_argument('--spider', default='maps_reviews', choices=['maps_reviews'])
+    parser.add_argument('-a', dest='spider_args', action='append', default=[], help='spider argument KEY=VALUE')
+    parser.add_argument('-s', dest='settings', action='append', default=[], help='setting KEY=VALUE')
+    args = parser.parse_args()
+
+    os.environ.setdefault('SCRAPY_SETTINGS_MODULE', 'scraper.settings')
+    settings = get_project_settings()
+    settings.setdict(parse_pairs(args.settings, '-s'), priority='cmdline')
+    configure_logging(settings)
+
+    install_reactor(ASYNCIO_REACTOR)
+    from scrapy.crawler import CrawlerRunner
+    from twisted.internet import reactor
+
+    runner = CrawlerRunner(settings)
+    worker = ScrapeWorker(runner, args.spider, parse_pairs(args.spider_args, '-a'))
+    crawl = worker.start()
+    crawl.addBoth(lambda _: reactor.stop() if reactor.running else None)
+
+    reactor.listenTCP(args.port, build_site(worker), interface=args.host)
+    # Close the spider (and the browser) cleanly on Ctrl+C / SIGTERM
+    reactor.addSystemEventTrigger('before', 'shutdown', runner.stop)
+    reactor.run()
+
+
+if __name__ == '__main__':
+    main()